@@ -0,0 +1,79 @@
+"""
+Runs the microbenchmark suite, and compares results against a baseline.
+
+    python -m benchmarks run -o results.json               # all benchmarks
+    python -m benchmarks run -b pong.update -o results.json  # only some of them
+    python -m benchmarks run --baseline baseline.json        # run, then compare
+    python -m benchmarks compare baseline.json results.json --threshold 0.15
+
+Comparisons exit with status 1 if any benchmark got slower than the threshold allows.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.suite import BENCHMARKS, run, compare, key_of
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def _print_result(result: dict):
+    print(f"{key_of(result):<70} {_format_time(result['seconds_per_call'])}", flush=True)
+
+
+def _report_comparison(comparison: list[dict], threshold: float) -> int:
+    regressions = [entry for entry in comparison if entry["regression"]]
+    for entry in comparison:
+        flag = "REGRESSION" if entry["regression"] else ""
+        print(f"{entry['key']:<70} {_format_time(entry['baseline'])} -> {_format_time(entry['current'])} "
+              f"({entry['ratio']:5.2f}x) {flag}")
+    print(f"{len(comparison)} benchmark(s) compared, {len(regressions)} slower by more than {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def _load(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def arg_parser():
+    ap = argparse.ArgumentParser(prog="python -m benchmarks", description="dpongpy microbenchmarks")
+    commands = ap.add_subparsers(dest="command", required=True)
+    run_command = commands.add_parser("run", help="Run benchmarks")
+    run_command.add_argument("--benchmark", "-b", choices=list(BENCHMARKS.keys()), action="append",
+                             help="Benchmark to run (can be repeated, default: all)")
+    run_command.add_argument("--output", "-o", help="File where to write JSON results")
+    run_command.add_argument("--repeat", "-r", type=int, default=5, help="Rounds per case (the best one counts)")
+    run_command.add_argument("--min-time", type=float, default=0.05, help="Minimum duration of a round, in seconds")
+    run_command.add_argument("--baseline", help="JSON results to compare against, once done")
+    run_command.add_argument("--threshold", "-t", type=float, default=0.1,
+                             help="Tolerated slowdown w.r.t. the baseline (default: 0.1, i.e. 10%%)")
+    compare_command = commands.add_parser("compare", help="Compare two JSON results")
+    compare_command.add_argument("baseline")
+    compare_command.add_argument("current")
+    compare_command.add_argument("--threshold", "-t", type=float, default=0.1,
+                                 help="Tolerated slowdown w.r.t. the baseline (default: 0.1, i.e. 10%%)")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = arg_parser().parse_args(argv)
+    if args.command == "compare":
+        return _report_comparison(compare(_load(args.baseline), _load(args.current), args.threshold), args.threshold)
+    report = run(args.benchmark, args.repeat, args.min_time, progress=_print_result)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        return _report_comparison(compare(_load(args.baseline), report, args.threshold), args.threshold)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Collision-detection throughput, before and after bounding-box caching and the scalar `collide` kernel.
+
+Run with `python -m benchmarks.collisions`.
+"""
+
+import timeit
+from dpongpy.model import *
+
+
+def _legacy_bounding_box(obj: GameObject) -> Rectangle:
+    half_size = obj.size / 2
+    return Rectangle(obj.position - half_size, obj.position + half_size)
+
+
+def legacy_hits(subject: GameObject, other: GameObject) -> dict[Direction, float]:
+    '''How `GameObject.hits` used to work: fresh bounding boxes, then `Rectangle.hits`.'''
+    return Rectangle.hits(_legacy_bounding_box(subject), _legacy_bounding_box(other))
+
+
+def cached_hits(subject: GameObject, other: GameObject) -> tuple:
+    return collide(*subject.bounds, *other.bounds)
+
+
+def scenario():
+    pong = Pong(size=(800, 600))
+    paddle = pong.paddle(Direction.LEFT)
+    ball = pong.ball
+    ball.position = paddle.position + Vector2((paddle.width + ball.width) / 2 - 2, 0)
+    return ball, [paddle, pong.paddle(Direction.RIGHT)] + list(pong.table.borders.values())
+
+
+def measure(function, subject, objects, number=20000) -> float:
+    '''Returns the amount of collision checks per second.'''
+    def run():
+        for obj in objects:
+            function(subject, obj)
+    seconds = min(timeit.repeat(run, number=number, repeat=3))
+    return number * len(objects) / seconds
+
+
+def main():
+    subject, objects = scenario()
+    before = measure(legacy_hits, subject, objects)
+    after = measure(cached_hits, subject, objects)
+    print(f"before: {before:,.0f} collision checks/s")
+    print(f"after:  {after:,.0f} collision checks/s ({after / before:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Offline training of preset compression dictionaries (see `dpongpy.remote.compression`), out of traffic recorded
+from headless matches (see `dpongpy.remote.traffic`).
+
+    python -m benchmarks.dictionary -o dpongpy/remote/dictionaries/2.zdict
+
+Dictionaries are shipped as static resources, since both ends of a connection need the very same bytes:
+a new dictionary gets a new id (and file) in `compression._DICTIONARIES`, rather than replacing an existing one.
+"""
+
+import argparse
+import re
+import sys
+import zlib
+from collections import Counter
+from typing import Iterable
+
+
+DICTIONARY_SIZE = 4096
+'''Bytes of a dictionary: the longest messages (keyframes with four paddles) are about 1.5KB of JSON.'''
+
+_NUMBERS = re.compile(rb"(?<![\w.])-?\d+(\.\d+)?([eE][-+]?\d+)?")
+
+
+def train(samples: Iterable[str | bytes], size: int = DICTIONARY_SIZE) -> bytes:
+    '''
+    Builds a preset dictionary out of sample messages: numbers vary from message to message, hence samples are reduced
+    to their skeletons (numbers replaced by `0`), and the most frequent skeletons are concatenated, most frequent last
+    (DEFLATE encodes closer matches with fewer bits), until `size` bytes.
+    '''
+    skeletons = Counter(_NUMBERS.sub(b"0", sample.encode() if isinstance(sample, str) else bytes(sample))
+                        for sample in samples)
+    chosen, length = [], 0
+    for skeleton, _ in skeletons.most_common():
+        if length + len(skeleton) > size:
+            continue
+        chosen.append(skeleton)
+        length += len(skeleton)
+    return b"".join(reversed(chosen))
+
+
+def record_samples(seed: int = 0, duration: float = 2.0) -> list[str | bytes]:
+    '''The recordings of two- and four-paddle matches which dictionary 1 was trained from (with the defaults).'''
+    from dpongpy import SimulationSettings
+    from dpongpy.model import Direction
+    from dpongpy.remote.traffic import record_payloads
+    samples: list[str | bytes] = []
+    for paddles in [(Direction.LEFT, Direction.RIGHT), (Direction.LEFT, Direction.UP, Direction.RIGHT, Direction.DOWN)]:
+        settings = SimulationSettings(physics="lockstep", seed=seed, duration=duration, paddles=paddles)
+        samples.extend(record_payloads(settings))
+    return samples
+
+
+def arg_parser():
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.dictionary",
+                                 description="Trains a preset compression dictionary from recorded traffic")
+    ap.add_argument("--output", "-o", required=True, help="File where to write the dictionary")
+    ap.add_argument("--size", "-s", type=int, default=DICTIONARY_SIZE, help="Bytes of the dictionary (at most)")
+    ap.add_argument("--seed", type=int, default=0, help="Seed of the recorded matches")
+    ap.add_argument("--duration", "-d", type=float, default=2.0, help="Duration of each recorded match, in seconds")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = arg_parser().parse_args(argv)
+    dictionary = train(record_samples(args.seed, args.duration), args.size)
+    with open(args.output, "wb") as file:
+        file.write(dictionary)
+    print(f"{len(dictionary)} bytes written to {args.output}, fingerprint {zlib.crc32(dictionary):#010x}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
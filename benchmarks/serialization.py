@@ -0,0 +1,245 @@
+"""
+Serialization throughput, message sizes and allocations of every codec, over a corpus of realistic messages
+recorded from headless matches (see `dpongpy.remote.traffic`) with 2 to 4 paddles, streaming either deltas or
+full statuses.
+
+    python -m benchmarks.serialization record -o corpus.jsonl         # records the corpus on disk
+    python -m benchmarks.serialization run --corpus corpus.jsonl      # measures every codec on it
+    python -m benchmarks.serialization check --corpus corpus.jsonl    # round-trip conformance only
+
+Without `--corpus`, a fresh corpus is recorded in memory. The corpus is stored as JSON lines, one message per line,
+in the format of `presentation.serialize`: it is the reference each codec must round-trip exactly
+(`check` exits with status 1 otherwise).
+"""
+
+import argparse
+import dataclasses
+import json
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from pygame.event import Event
+
+from dpongpy import SimulationSettings
+from dpongpy.controller import ControlEvent
+from dpongpy.model import Direction, Pong, PongDiff
+from dpongpy.remote.presentation import CODECS, serialize, deserialize, encode, decode
+
+
+PADDLES = {
+    2: (Direction.LEFT, Direction.RIGHT),
+    3: (Direction.LEFT, Direction.UP, Direction.RIGHT),
+    4: (Direction.LEFT, Direction.UP, Direction.RIGHT, Direction.DOWN),
+}
+
+VARIANTS = [(codec, compressed) for codec in CODECS for compressed in (False, True)]
+'''Every available codec, with and without the compression stage.'''
+
+
+def record_corpus(duration: float = 2.0, seed: int = 0) -> list[str]:
+    '''One match per amount of paddles and per status streaming mode, as JSON lines.'''
+    from dpongpy.remote.traffic import record
+    corpus: list[str] = []
+    for sides in PADDLES.values():
+        for deltas in (True, False):
+            settings = SimulationSettings(physics="lockstep", seed=seed, duration=duration, paddles=sides)
+            corpus.extend(serialize(event) for event in record(settings, deltas=deltas))
+    return corpus
+
+
+def save(corpus: Iterable[str], path: str):
+    with open(path, "w") as file:
+        for line in corpus:
+            file.write(line + "\n")
+
+
+def load(path: str) -> list[str]:
+    with open(path) as file:
+        return [line for line in file.read().splitlines() if line]
+
+
+def kind_of(event: Event) -> str:
+    name = ControlEvent(event.type).name
+    if ControlEvent.TIME_ELAPSED.matches(event):
+        if "status" in event.dict:
+            return f"{name}/status/{len(event.status.paddles)}p"
+        return f"{name}/delta"
+    return name
+
+
+def _same(expected, actual) -> bool:
+    if isinstance(expected, Pong):
+        return isinstance(actual, Pong) and (expected.size, expected.config) == (actual.size, actual.config) and \
+            expected.snapshot()._replace(random=None) == actual.snapshot()._replace(random=None)
+    if isinstance(expected, PongDiff):
+        # the extent is only transmitted along with quantized values
+        return isinstance(actual, PongDiff) and \
+            dataclasses.replace(expected, extent=None) == dataclasses.replace(actual, extent=None)
+    return expected == actual
+
+
+def conforms(expected: Event, actual: Event) -> bool:
+    '''Whether `actual` is the same message as `expected`, as far as the wire is concerned.'''
+    return expected.type == actual.type and expected.dict.keys() == actual.dict.keys() and \
+        all(_same(value, actual.dict[name]) for name, value in expected.dict.items())
+
+
+def _payloads(events: list[Event], codec: str, compressor=None) -> list[bytes]:
+    payloads = []
+    for event in events:
+        payload = encode(event, codec)
+        if compressor is not None:
+            payload = compressor.compress(payload)
+        payloads.append(payload.encode() if isinstance(payload, str) else payload)  # as received from the network
+    return payloads
+
+
+def check(events: list[Event], variants=VARIANTS) -> list[dict]:
+    '''Round-trips every message with every variant; returns the failures.'''
+    from dpongpy.remote.compression import Compressor
+    failures = []
+    for codec, compressed in variants:
+        payloads = _payloads(events, codec, Compressor() if compressed else None)
+        for index, (event, payload) in enumerate(zip(events, payloads)):
+            try:
+                ok = conforms(event, decode(payload))
+            except Exception:
+                ok = False
+            if not ok:
+                failures.append({"codec": codec, "compressed": compressed, "index": index, "kind": kind_of(event)})
+    return failures
+
+
+def _best_time(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_allocation(function, items: list) -> float:
+    '''Mean peak of memory allocated (and not necessarily retained) while calling `function` on each item, in bytes.'''
+    tracemalloc.start()
+    try:
+        total = 0
+        for item in items:
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            function(item)
+            total += tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return total / len(items)
+
+
+def measure(events: list[Event], codec: str, compressed: bool = False, repeat: int = 3) -> dict:
+    '''Throughput (messages per second), bytes per message (overall and by kind) and allocations of one variant.'''
+    from dpongpy.remote.compression import Compressor
+    compressor = Compressor() if compressed else None
+    payloads = _payloads(events, codec, compressor)
+
+    def encode_one(event):
+        payload = encode(event, codec)
+        return payload if compressor is None else compressor.compress(payload)
+
+    def encode_all():
+        for event in events:
+            encode_one(event)
+
+    def decode_all(snapshots=False):
+        for payload in payloads:
+            decode(payload, snapshots)
+
+    sizes = defaultdict(list)
+    for event, payload in zip(events, payloads):
+        sizes[kind_of(event)].append(len(payload))
+    total_bytes = sum(len(payload) for payload in payloads)
+    encode_time = _best_time(encode_all, repeat)
+    decode_time = _best_time(decode_all, repeat)
+    snapshot_time = _best_time(lambda: decode_all(snapshots=True), repeat)
+    return {
+        "codec": codec,
+        "compressed": compressed,
+        "messages": len(events),
+        "encode_per_second": len(events) / encode_time,
+        "decode_per_second": len(events) / decode_time,
+        "decode_snapshots_per_second": len(events) / snapshot_time,
+        "encode_mb_per_second": total_bytes / encode_time / 1e6,
+        "bytes_per_message": total_bytes / len(events),
+        "bytes_by_kind": {kind: sum(values) / len(values) for kind, values in sorted(sizes.items())},
+        "encode_peak_bytes": _peak_allocation(encode_one, events),
+        "decode_peak_bytes": _peak_allocation(decode, payloads),
+    }
+
+
+def run(events: list[Event], variants=VARIANTS, repeat: int = 3, progress=None) -> list[dict]:
+    results = []
+    for codec, compressed in variants:
+        result = measure(events, codec, compressed, repeat)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return results
+
+
+def _print_result(result: dict):
+    name = result["codec"] + ("+zlib" if result["compressed"] else "")
+    print(f"{name:<12} encode {result['encode_per_second']:9.0f}/s  decode {result['decode_per_second']:9.0f}/s  "
+          f"(snapshots {result['decode_snapshots_per_second']:9.0f}/s)  {result['bytes_per_message']:7.1f} B/msg  "
+          f"peak {result['encode_peak_bytes'] / 1024:5.1f}/{result['decode_peak_bytes'] / 1024:5.1f} KiB", flush=True)
+    for kind, size in result["bytes_by_kind"].items():
+        print(f"    {kind:<28} {size:8.1f} B")
+
+
+def _events(path: Optional[str], duration: float) -> list[Event]:
+    corpus = load(path) if path else record_corpus(duration)
+    return [deserialize(line) for line in corpus]
+
+
+def arg_parser():
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.serialization",
+                                 description="dpongpy serialization benchmark")
+    commands = ap.add_subparsers(dest="command", required=True)
+    record_command = commands.add_parser("record", help="Record a corpus of messages from headless matches")
+    record_command.add_argument("--output", "-o", required=True, help="File where to write the corpus (JSON lines)")
+    for command in [record_command] + [commands.add_parser(name, help=help) for name, help in
+                                       [("run", "Measure every codec on a corpus"),
+                                        ("check", "Check that every codec round-trips a corpus")]]:
+        command.add_argument("--duration", "-d", type=float, default=2.0,
+                             help="Duration of each recorded match, in seconds (default: 2)")
+        if command is not record_command:
+            command.add_argument("--corpus", "-c", help="Corpus to use (default: a fresh one)")
+        if command.prog.endswith("run"):
+            command.add_argument("--repeat", "-r", type=int, default=3, help="Rounds per variant (the best one counts)")
+            command.add_argument("--output", "-o", help="File where to write JSON results")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = arg_parser().parse_args(argv)
+    if args.command == "record":
+        corpus = record_corpus(args.duration)
+        save(corpus, args.output)
+        print(f"{len(corpus)} messages written to {args.output}")
+        return 0
+    events = _events(args.corpus, args.duration)
+    failures = check(events)
+    for failure in failures:
+        print(f"Round-trip failure: {failure}")
+    if args.command == "check":
+        print(f"{len(events)} messages, {len(VARIANTS)} variants, {len(failures)} failure(s)")
+        return 1 if failures else 0
+    results = run(events, repeat=args.repeat, progress=_print_result)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"messages": len(events), "failures": failures, "results": results}, file, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
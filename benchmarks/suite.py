@@ -0,0 +1,263 @@
+"""
+Microbenchmarks of the model, collision and presentation hot paths, over parameter grids.
+
+Each benchmark is a function taking the parameters of one grid point and returning the callable to be timed.
+"""
+
+import itertools
+import platform
+import sys
+import time
+import timeit
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from dpongpy.model import *
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[..., Callable[[], object]]
+    grid: dict[str, list] = field(default_factory=dict)
+
+    def cases(self) -> Iterable[dict]:
+        names = list(self.grid.keys())
+        for values in itertools.product(*self.grid.values()):
+            yield dict(zip(names, values))
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, **grid):
+    '''Registers the decorated setup function as a benchmark named `name`, run over all combinations in `grid`.'''
+    def decorator(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, grid)
+        return setup
+    return decorator
+
+
+ALL_SIDES = [Direction.LEFT, Direction.RIGHT, Direction.UP, Direction.DOWN]
+SIZES = ["800x600", "1920x1080"]
+
+
+def _size(size: str) -> tuple[int, int]:
+    width, height = size.split("x")
+    return int(width), int(height)
+
+
+def _pong(paddles: int, size: str) -> Pong:
+    pong = Pong(size=_size(size), paddles=ALL_SIDES[:paddles], random=Random(0))
+    for paddle in pong.paddles:
+        pong.move_paddle(paddle.side, Direction.UP if paddle.side.is_horizontal else Direction.LEFT)
+    return pong
+
+
+@benchmark("pong.update", paddles=[2, 4], size=SIZES, fps=[30, 60, 120])
+def pong_update(paddles: int, size: str, fps: int):
+    pong = _pong(paddles, size)
+    dt = 1 / fps
+    snapshot = pong.snapshot()
+    def run():
+        # rewind every now and then, so that all cases time the same (and sound) portion of a match
+        if pong.updates >= 1000:
+            pong.restore(snapshot)
+        pong.update(dt)
+    return run
+
+
+def _rectangles(case: str) -> tuple[Rectangle, Rectangle]:
+    subject = Rectangle(Vector2(0, 0), Vector2(10, 10))
+    offsets = {"apart": (20, 20), "side": (8, 0), "corner": (8, 8)}
+    dx, dy = offsets[case]
+    return subject, Rectangle(Vector2(dx, dy), Vector2(dx + 10, dy + 10))
+
+
+@benchmark("rectangle.hits", case=["apart", "side", "corner"])
+def rectangle_hits(case: str):
+    subject, other = _rectangles(case)
+    return lambda: subject.hits(other)
+
+
+@benchmark("collide", case=["apart", "side", "corner"])
+def collide_bounds(case: str):
+    subject, other = _rectangles(case)
+    bounds = (subject.left, subject.top, subject.right, subject.bottom, other.left, other.top, other.right, other.bottom)
+    return lambda: collide(*bounds)
+
+
+@benchmark("gameobject.bounding_box", moving=[False, True])
+def bounding_box(moving: bool):
+    obj = Ball(size=(30, 30), position=(400, 300), speed=(100, 50))
+    if moving:
+        def run():
+            obj.update(0.001)
+            return obj.bounding_box
+        return run
+    return lambda: obj.bounding_box
+
+
+MESSAGES = ["pong", "time_elapsed", "paddle_move"]
+CODECS = ["json", "binary"]
+
+
+def _message(paddles: int, message: str):
+    from dpongpy.controller import ControlEvent, create_event
+    pong = _pong(paddles, SIZES[0])
+    if message == "pong":
+        return pong
+    elif message == "time_elapsed":
+        return create_event(ControlEvent.TIME_ELAPSED, dt=1 / 60, status=pong)
+    return create_event(ControlEvent.PADDLE_MOVE, paddle_index=Direction.LEFT, direction=Direction.UP)
+
+
+@benchmark("presentation.serialize", paddles=[2, 4], message=MESSAGES)
+def serialize(paddles: int, message: str):
+    from dpongpy.remote.presentation import serialize
+    obj = _message(paddles, message)
+    return lambda: serialize(obj)
+
+
+@benchmark("presentation.encode", codec=CODECS, paddles=[2, 4], message=MESSAGES)
+def encode(codec: str, paddles: int, message: str):
+    from dpongpy.remote.presentation import encode
+    obj = _message(paddles, message)
+    return lambda: encode(obj, codec)
+
+
+@benchmark("presentation.decode", codec=CODECS, paddles=[2, 4], message=MESSAGES)
+def decode(codec: str, paddles: int, message: str):
+    from dpongpy.remote.presentation import encode, decode
+    payload = encode(_message(paddles, message), codec)
+    if isinstance(payload, str):
+        payload = payload.encode()  # as received from the network
+    return lambda: decode(payload)
+
+
+@benchmark("terminal.receive_status", codec=CODECS, paddles=[2, 4], decoding=["pong", "snapshot"])
+def receive_status(codec: str, paddles: int, decoding: str):
+    from dpongpy.remote.presentation import encode, decode
+    payload = encode(_message(paddles, "time_elapsed"), codec)
+    if isinstance(payload, str):
+        payload = payload.encode()
+    pong = _pong(paddles, SIZES[0])
+    if decoding == "pong":
+        return lambda: pong.override(decode(payload).status)
+    return lambda: pong.restore(decode(payload, snapshots=True).status)
+
+
+@benchmark("compression.compress", codec=CODECS, paddles=[2, 4], message=MESSAGES)
+def compress(codec: str, paddles: int, message: str):
+    from dpongpy.remote.compression import Compressor
+    from dpongpy.remote.presentation import encode
+    compressor, payload = Compressor(), encode(_message(paddles, message), codec)
+    return lambda: compressor.compress(payload)
+
+
+@benchmark("direction.queries")
+def direction_queries():
+    directions = Direction.values()
+    def run():
+        for direction in directions:
+            direction.is_vertical
+            direction.is_horizontal
+    return run
+
+
+def _input_handler(paddles: int):
+    from dpongpy.controller.local import PongInputHandler
+    class InputHandler(PongInputHandler):
+        def post_event(self, event, **kwargs):
+            return self.create_event(event, **kwargs)
+    return InputHandler(_pong(paddles, SIZES[0]))
+
+
+@benchmark("controller.key_pressed", paddles=[2, 4], key=["move", "unmapped"])
+def key_pressed(paddles: int, key: str):
+    import pygame
+    handler = _input_handler(paddles)
+    code = pygame.K_w if key == "move" else pygame.K_z
+    def run():
+        handler.key_pressed(code)
+        handler.key_released(code)
+    return run
+
+
+@benchmark("controller.normalize_commands", paddles=[2, 4])
+def normalize_commands(paddles: int):
+    from dpongpy.controller.local import _normalize_commands
+    pong = _pong(paddles, SIZES[0])
+    return lambda: _normalize_commands(pong, None)
+
+
+def measure(function: Callable[[], object], repeat: int = 5, min_time: float = 0.05) -> dict:
+    '''
+    Times `function`, calibrating the amount of calls per round so that each round lasts at least `min_time`.
+    Returns the best (i.e. least perturbed) time per call, in seconds, among `repeat` rounds.
+    '''
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    rounds = timer.repeat(repeat=repeat, number=number)
+    return {
+        "seconds_per_call": min(rounds) / number,
+        "mean_seconds_per_call": sum(rounds) / len(rounds) / number,
+        "calls": number,
+        "rounds": repeat,
+    }
+
+
+def key_of(result: dict) -> str:
+    params = ",".join(f"{name}={value}" for name, value in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]"
+
+
+def run(names: Optional[Iterable[str]] = None, repeat: int = 5, min_time: float = 0.05, progress=None) -> dict:
+    '''
+    Runs the selected benchmarks (all of them by default) on every point of their grids.
+    Returns a JSON-serializable report.
+    '''
+    selected = [BENCHMARKS[name] for name in (names or BENCHMARKS.keys())]
+    results = []
+    for bench in selected:
+        for params in bench.cases():
+            result = {"name": bench.name, "params": params}
+            result.update(measure(bench.setup(**params), repeat, min_time))
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> list[dict]:
+    '''
+    Matches the results of two reports by benchmark and parameters.
+    Returns one entry per common result, telling the ratio of current to baseline time per call,
+    and whether it is a regression, i.e. a slowdown beyond `threshold` (0.1 meaning 10%).
+    '''
+    before = {key_of(result): result for result in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        key = key_of(result)
+        if key not in before:
+            continue
+        ratio = result["seconds_per_call"] / before[key]["seconds_per_call"]
+        comparison.append({
+            "key": key,
+            "baseline": before[key]["seconds_per_call"],
+            "current": result["seconds_per_call"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return comparison
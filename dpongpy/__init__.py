@@ -1,6 +1,8 @@
 from typing import Optional
+from random import Random
 from dpongpy.model import Pong, Config, Direction
 from dpongpy.controller.local import ActionMap
+from dpongpy.log import logger
 import pygame
 from dataclasses import dataclass, field
 
@@ -14,6 +16,10 @@ class BaseSettings:
     fps: int = 60
     num_players: int = 2
     size: tuple = (800, 600)
+    physics: str = "step"
+    physics_fps: Optional[int] = None
+    max_physics_steps: int = 5
+    seed: Optional[int] = None
 
 @dataclass 
 class DistributedSettings(BaseSettings):
@@ -21,6 +27,12 @@ class DistributedSettings(BaseSettings):
     host: Optional[str] = None
     port: Optional[int] = None
     comm_technology: str = "udp"
+    codec: Optional[str] = None  # preferred codec, otherwise negotiated per peer (see `dpongpy.remote.negotiation`)
+    delta_states: bool = True
+    quantization_bits: Optional[int] = None
+    state_history: int = 64
+    compression: bool = False
+    batching: bool = True  # send the messages of each tick together, if the other end supports it (see `dpongpy.remote.batching`)
     initial_paddles: tuple[Direction, Direction] = (Direction.LEFT, Direction.RIGHT)
 
 @dataclass
@@ -31,20 +43,76 @@ class EtcdSettings(BaseSettings):
     game_id: str = "default-game"
     player_id: Optional[str] = None
 
+@dataclass
+class SimulationSettings(BaseSettings):
+    """Settings for headless simulations"""
+    matches: int = 1
+    duration: float = 60.0
+    paddles: tuple[Direction, ...] = (Direction.LEFT, Direction.RIGHT)
+    bot: str = "tracking"
+
 class PongGame:
     def __init__(self, settings: DistributedSettings = None):
         self.settings = settings or DistributedSettings()
-        self.pong = Pong(
-            size=self.settings.size,
-            config=self.settings.config,
-            paddles=self.settings.initial_paddles
-        )
+        self.pong = self.create_model()
         self.dt = None
+        self._accumulator = 0.0
         self.view = self.create_view()
         self.clock = pygame.time.Clock()
         self.running = True
         self.controller = self.create_controller(settings.initial_paddles)
 
+    @staticmethod
+    def model_class(physics: str) -> type[Pong]:
+        '''
+        Selects the model class implementing the given physics mode.
+        '''
+        if physics == "step":
+            return Pong
+        elif physics == "event":
+            from dpongpy.model.event_driven import EventDrivenPong
+            return EventDrivenPong
+        elif physics == "lockstep":
+            from dpongpy.model.lockstep import LockstepPong
+            return LockstepPong
+        raise ValueError(f"Unknown physics mode: {physics}")
+
+    @staticmethod
+    def step_for(settings: BaseSettings) -> Optional[float]:
+        '''
+        The fixed duration of physics steps implied by settings, or None if physics advances by the duration of each frame.
+        '''
+        if settings.physics_fps:
+            return 1 / settings.physics_fps
+        if settings.physics == "lockstep":
+            from dpongpy.model.lockstep import DEFAULT_FPS
+            return 1 / DEFAULT_FPS
+        return None
+
+    @staticmethod
+    def model_options(settings: BaseSettings) -> dict:
+        '''
+        Keyword arguments for the model class selected by settings, other than size, config and paddles.
+        '''
+        options: dict[str, object] = {}
+        if settings.seed is not None:
+            options["random"] = Random(settings.seed)
+        if settings.physics == "lockstep":
+            options["step"] = PongGame.step_for(settings)
+        return options
+
+    def create_model(self):
+        '''
+        Creates the model for the game, according to the physics mode in settings.
+        '''
+        model = self.model_class(self.settings.physics)
+        return model(
+            size=self.settings.size,
+            config=self.settings.config,
+            paddles=self.settings.initial_paddles,
+            **self.model_options(self.settings)
+        )
+
     def create_view(self):
         '''
         Creates the view for the game.
@@ -73,14 +141,49 @@ class PongGame:
     def at_each_run(self):
         pygame.display.flip()
 
+    @property
+    def physics_step(self) -> Optional[float]:
+        '''
+        The fixed duration of physics steps, or None if physics advances by the duration of each frame.
+        '''
+        return self.step_for(self.settings)
+
+    def simulate(self, frame_time: float) -> float:
+        '''
+        Advances the game by frame_time seconds, in fixed physics steps if settings.physics_fps is set.
+        Inputs are handled on every frame, even if no physics step is due.
+        At most settings.max_physics_steps are performed per frame, and any remaining backlog is dropped.
+        Returns the interpolation factor between the last two physics states, to be used for rendering.
+        '''
+        step = self.physics_step
+        if step is None:
+            self.view.capture()
+            self.controller.handle_inputs(frame_time)
+            self.controller.handle_events()
+            return 1.0
+        self.controller.handle_inputs()
+        self.controller.handle_events()
+        self._accumulator += frame_time
+        steps = 0
+        while self._accumulator >= step and steps < self.settings.max_physics_steps:
+            self.view.capture()
+            self.controller.time_elapsed(step)
+            self.controller.handle_events()
+            self._accumulator -= step
+            steps += 1
+        if self._accumulator >= step:
+            logger.debug("Physics is %.3fs behind, dropping it", self._accumulator)
+            self._accumulator %= step
+        return self._accumulator / step
+
     def run(self):
         try:
             self.dt = 0
+            self._accumulator = 0.0
             self.before_run()
             while self.running:
-                self.controller.handle_inputs(self.dt)
-                self.controller.handle_events()
-                self.view.render()
+                interpolation = self.simulate(self.dt)
+                self.view.render(interpolation)
                 self.at_each_run()
                 self.dt = self.clock.tick(self.settings.fps) / 1000
         finally:
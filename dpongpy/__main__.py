@@ -1,7 +1,10 @@
+import atexit
 import threading
 import time
 import uuid
 import dpongpy.model
+import dpongpy.trace
+import dpongpy.profiling
 import dpongpy.controller
 import argparse
 
@@ -31,8 +34,8 @@ def arg_parser():
     mode.add_argument(
         "--mode",
         "-m",
-        choices=["local", "centralised"],
-        help="Run the game in local or centralised mode",
+        choices=["local", "centralised", "headless"],
+        help="Run the game in local or centralised mode, or simulate matches headlessly",
     )
     mode.add_argument(
         "--role",
@@ -52,9 +55,47 @@ def arg_parser():
     networking.add_argument(
         "--comm-type",
         "-c",
-        choices=["udp", "zmq", "web_sockets"],
+        choices=["udp", "async_udp", "zmq", "web_sockets"],
         required=False,
-        help="Specify the communication type (UDP or ZeroMQ) for centralised mode",
+        help="Specify the communication type (UDP, UDP on asyncio, ZeroMQ or WebSockets) for centralised mode",
+    )
+    networking.add_argument(
+        "--codec",
+        choices=["json", "binary"],
+        default=None,
+        help="Preferred wire format of outgoing messages: coordinators fall back to the most compact one each peer "
+             "supports (the default), terminals to JSON. Incoming messages are decoded whatever their format",
+    )
+    networking.add_argument(
+        "--quantize",
+        type=int,
+        default=None,
+        metavar="BITS",
+        help="Make the coordinator send positions and speeds as BITS-wide integers relative to the table size "
+             "(e.g. 16), rather than as floats",
+    )
+    networking.add_argument(
+        "--full-states",
+        action="store_true",
+        help="Make the coordinator send the whole game status every frame, rather than deltas against what peers acknowledged",
+    )
+    networking.add_argument(
+        "--compress",
+        action="store_true",
+        help="Compress messages with a preset zlib dictionary, towards peers which support it too "
+             "(the achieved ratio and CPU cost are logged at exit)",
+    )
+    networking.add_argument(
+        "--no-batching",
+        action="store_true",
+        help="Send each message on its own, rather than the messages of each tick together "
+             "(which is only done towards peers supporting it)",
+    )
+    networking.add_argument(
+        "--state-history",
+        type=int,
+        default=64,
+        help="Frames the coordinator keeps as baselines for deltas: older acknowledgements get full keyframes",
     )
     networking.add_argument(
         "--host", "-H", help="Host to connect to", type=str, default="localhost"
@@ -103,6 +144,56 @@ def arg_parser():
         default=[900, 600],
     )
     game.add_argument("--fps", "-f", help="Frames per second", type=int, default=60)
+    game.add_argument(
+        "--physics",
+        choices=["step", "event", "lockstep"],
+        help="Physics simulation: fixed steps with overlap resolution, exact time-of-impact events, "
+             "or deterministic fixed steps on a quantized grid (--physics-fps must then be a power of two, default: 64)",
+        default="step",
+    )
+    game.add_argument(
+        "--physics-fps",
+        help="Run physics in fixed steps at this rate, independently of --fps (default: one step per frame)",
+        type=int,
+        default=None,
+    )
+    game.add_argument("--seed", help="Seed for the random generator (default: random)", type=int, default=None)
+    simulation = ap.add_argument_group("simulation")
+    simulation.add_argument(
+        "--matches", help="Number of matches to simulate (only used in headless mode)", type=int, default=1
+    )
+    simulation.add_argument(
+        "--duration", help="Simulated seconds per match (only used in headless mode)", type=float, default=60.0
+    )
+    simulation.add_argument(
+        "--bot", help="Bot driving the paddles (only used in headless mode)", choices=["idle", "tracking", "predictive", "random"],
+        default="tracking",
+    )
+    diagnostics = ap.add_argument_group("diagnostics")
+    diagnostics.add_argument(
+        "--trace",
+        choices=list(dpongpy.trace.TRACER.categories.keys()),
+        help="Enable tracing for a category (can be repeated)",
+        action="append",
+        default=[],
+    )
+    diagnostics.add_argument(
+        "--trace-file",
+        help="File where to dump the trace buffer at exit (pretty-print it via `python -m dpongpy.trace <file>`)",
+        type=str,
+        default="dpongpy-trace.bin",
+    )
+    diagnostics.add_argument(
+        "--profile",
+        help="Time the phases of each model update, and log the breakdown at exit",
+        action="store_true",
+    )
+    diagnostics.add_argument(
+        "--profile-file",
+        help="File where to export the profiling breakdown as JSON at exit (implies --profile)",
+        type=str,
+        default=None,
+    )
     return ap
 
 
@@ -113,8 +204,17 @@ def args_to_settings(args):
     settings.debug = args.debug
     settings.size = tuple(args.size)
     settings.comm_technology = args.comm_type
+    settings.codec = args.codec
+    settings.delta_states = not args.full_states
+    settings.quantization_bits = args.quantize
+    settings.state_history = args.state_history
+    settings.compression = args.compress
+    settings.batching = not args.no_batching
     settings.num_players = args.num_players
     settings.fps = args.fps
+    settings.physics = args.physics
+    settings.physics_fps = args.physics_fps
+    settings.seed = args.seed
     if args.keys is None:
         args.keys = list(dpongpy.controller.ActionMap.all_mappings().keys())[
             : len(args.sides)
@@ -129,12 +229,42 @@ def args_to_settings(args):
     return settings
 
 
+def args_to_simulation_settings(args):
+    settings = dpongpy.SimulationSettings()
+    settings.size = tuple(args.size)
+    settings.fps = args.fps
+    settings.physics = args.physics
+    settings.physics_fps = args.physics_fps
+    settings.matches = args.matches
+    settings.duration = args.duration
+    settings.bot = args.bot
+    settings.seed = args.seed
+    if args.sides:
+        settings.paddles = tuple(dpongpy.model.Direction[side.upper()] for side in args.sides)
+    return settings
+
+
 parser = arg_parser()
 args = parser.parse_args()
 settings = args_to_settings(args)
+if args.trace:
+    dpongpy.trace.enable(*args.trace)
+    atexit.register(dpongpy.trace.dump, args.trace_file)
+if args.profile or args.profile_file:
+    dpongpy.profiling.install()
+    atexit.register(dpongpy.profiling.shutdown_report, args.profile_file)
+if args.compress:
+    import dpongpy.remote.compression
+
+    atexit.register(dpongpy.remote.compression.shutdown_report)
 # if args.help:
 #     parser.print_help()
 #     exit(0)
+if args.mode == "headless":
+    import dpongpy.sim
+
+    dpongpy.sim.main(args_to_simulation_settings(args))
+    exit(0)
 if args.mode == "local":
     if not settings.initial_paddles:
         settings.initial_paddles = (
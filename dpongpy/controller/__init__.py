@@ -11,25 +11,28 @@ class ControlEvent(Enum):
     GAME_OVER = pygame.QUIT
     PADDLE_MOVE = pygame.event.custom_type()
     TIME_ELAPSED = pygame.event.custom_type()
+    STATE_ACK = pygame.event.custom_type()
 
     @classmethod
-    def all(cls) -> set['ControlEvent']:
-        return set(cls.__members__.values())
+    def all(cls) -> frozenset['ControlEvent']:
+        return _CONTROL_EVENTS
 
     @classmethod
-    def all_types(cls) -> set['ControlEvent']:
-        return {event.value for event in cls.all()}
+    def all_types(cls) -> frozenset[int]:
+        return _CONTROL_EVENT_TYPES
 
     @classmethod
     def is_control_event(cls, event: pygame.event.Event) -> bool:
+        if isinstance(event, pygame.event.Event):
+            return event.type in _CONTROL_EVENTS_BY_TYPE
         return any(control_event.matches(event) for control_event in cls.all())
 
     @classmethod
     def by_value(cls, value: int) -> 'ControlEvent':
-        for control_event in cls.all():
-            if control_event.value == value:
-                return control_event
-        raise KeyError(f"{cls.__name__} with value {value} not found")
+        try:
+            return _CONTROL_EVENTS_BY_TYPE[value]
+        except KeyError:
+            raise KeyError(f"{cls.__name__} with value {value} not found") from None
 
     def matches(self, event) -> bool:
         if isinstance(event, pygame.event.Event):
@@ -50,19 +53,28 @@ class PlayerAction(Enum):
     QUIT = 5
 
     @classmethod
-    def all(cls) -> set['PlayerAction']:
-        return set(cls.__members__.values())
+    def all(cls) -> frozenset['PlayerAction']:
+        return _PLAYER_ACTIONS
 
     @classmethod
-    def all_moves(cls) -> set['PlayerAction']:
-        return {action for action in cls.all() if 'MOVE_' in action.name}
+    def all_moves(cls) -> frozenset['PlayerAction']:
+        return _MOVES
 
     def to_direction(self):
-        if 'MOVE_' in self.name:
-            return Direction[self.name.split('_')[1]]
-        elif self == PlayerAction.STOP:
-            return Direction.NONE
-        return None
+        return _ACTION_DIRECTIONS[self]
+
+
+# lookup tables backing `ControlEvent` and `PlayerAction` queries, computed once at import time
+_CONTROL_EVENTS = frozenset(ControlEvent.__members__.values())
+_CONTROL_EVENTS_BY_TYPE = {event.value: event for event in _CONTROL_EVENTS}
+_CONTROL_EVENT_TYPES = frozenset(_CONTROL_EVENTS_BY_TYPE.keys())
+_PLAYER_ACTIONS = frozenset(PlayerAction.__members__.values())
+_MOVES = frozenset(action for action in _PLAYER_ACTIONS if 'MOVE_' in action.name)
+_ACTION_DIRECTIONS: dict[PlayerAction, Direction | None] = {
+    action: Direction[action.name.split('_')[1]] for action in _MOVES
+}
+_ACTION_DIRECTIONS.update({action: None for action in _PLAYER_ACTIONS - _MOVES})
+_ACTION_DIRECTIONS[PlayerAction.STOP] = Direction.NONE
 
 
 @dataclass(frozen=True)
@@ -155,13 +167,15 @@ class EventHandler:
             elif ControlEvent.PLAYER_LEAVE.matches(event):
                 self.on_player_leave(self._pong, **event.dict)
             elif ControlEvent.GAME_START.matches(event):
-                self.on_game_start(self._pong)
+                self.on_game_start(self._pong, **event.dict)
             elif ControlEvent.GAME_OVER.matches(event):
                 self.on_game_over(self._pong)
             elif ControlEvent.PADDLE_MOVE.matches(event):
                 self.on_paddle_move(self._pong, **event.dict)
             elif ControlEvent.TIME_ELAPSED.matches(event):
                 self.on_time_elapsed(self._pong, **event.dict)
+            elif ControlEvent.STATE_ACK.matches(event):
+                self.on_state_ack(self._pong, **event.dict)
 
     def on_player_join(self, pong: Pong, paddle_index: int | Direction):
         pass
@@ -169,7 +183,7 @@ class EventHandler:
     def on_player_leave(self, pong: Pong, paddle_index: int):
         pass
 
-    def on_game_start(self, pong: Pong):
+    def on_game_start(self, pong: Pong, seed: int | None = None):
         pass
 
     def on_game_over(self, pong: Pong):
@@ -180,3 +194,6 @@ class EventHandler:
 
     def on_time_elapsed(self, pong: Pong, dt: float):
         pass
+
+    def on_state_ack(self, pong: Pong, frame: int):
+        pass
@@ -24,14 +24,14 @@ class PongInputHandler(InputHandler):
     def __init__(self, pong: Pong, paddles_commands: dict[Direction, ActionMap] = None):
         self._pong = pong
         self._paddles_commands = _normalize_commands(pong, paddles_commands)
+        self._key_maps = {side: commands.to_key_map() for side, commands in self._paddles_commands.items()}
         assert len(self._pong.paddles) == len(self._paddles_commands), "Number of paddles and commands must match"
         for side, keymap in self._paddles_commands.items():
             logger.info(f"Player {side.name} controls: {keymap.name}")
 
     def _get_paddle_actions(self, key: int) -> dict[Direction, PlayerAction]:
         result = dict()
-        for side, paddle_commands in self._paddles_commands.items():
-            key_map = paddle_commands.to_key_map()
+        for side, key_map in self._key_maps.items():
             if key in key_map:
                 result[side] = key_map[key]
         return result
@@ -108,8 +108,10 @@ class PongEventHandler(EventHandler):
     def on_player_leave(self, pong: Pong, paddle_index: int):
         self.on_game_over(pong)
 
-    def on_game_start(self, pong: Pong):
-        pass
+    def on_game_start(self, pong: Pong, seed: int | None = None):
+        if seed is not None:
+            pong.reseed(seed)
+            pong.reset_ball()
 
     def on_game_over(self, pong: Pong):
         pass
@@ -0,0 +1,1046 @@
+from pygame.math import Vector2
+from dpongpy.log import logger
+from dpongpy import trace, profiling
+from dataclasses import dataclass, field
+from random import Random
+from itertools import chain
+import math
+from enum import Enum
+from typing import NamedTuple, Optional, TypeVar
+from time import perf_counter
+
+
+class Direction(Enum):
+    NONE = Vector2(0, 0)
+    LEFT = Vector2(-1, 0)
+    UP = Vector2(0, -1)
+    RIGHT = Vector2(1, 0)
+    DOWN = Vector2(0, 1)
+
+    def __repr__(self):
+        return f'<{type(self).__name__}.{self.name}>'
+
+    def __str__(self):
+        return repr(self)[1:-1]
+
+    @property
+    def is_vertical(self) -> bool:
+        return self in _VERTICAL_DIRECTIONS
+    
+    @property
+    def is_horizontal(self) -> bool:
+        return self in _HORIZONTAL_DIRECTIONS
+
+    @classmethod
+    def values(cls) -> tuple['Direction', ...]:
+        return _DIRECTIONS
+
+
+# lookup tables backing `Direction` queries, computed once since members (and their vectors) never change
+_DIRECTIONS = tuple(Direction.__members__.values())
+_VERTICAL_DIRECTIONS = frozenset(d for d in _DIRECTIONS if d.value.x == 0 and d.value.y != 0)
+_HORIZONTAL_DIRECTIONS = frozenset(d for d in _DIRECTIONS if d.value.y == 0 and d.value.x != 0)
+
+
+# noinspection PyUnresolvedReferences
+class Sized:
+    __slots__ = ()
+
+    @property
+    def width(self) -> float:
+        return self.size.x
+
+    @property
+    def height(self) -> float:
+        return self.size.y
+
+
+# noinspection PyUnresolvedReferences
+class Positioned:
+    __slots__ = ()
+
+    @property
+    def x(self) -> float:
+        return self.position.x
+
+    @property
+    def y(self) -> float:
+        return self.position.y
+
+
+@dataclass
+class Rectangle(Sized, Positioned):
+    top_left: Vector2
+    bottom_right: Vector2
+
+    def __post_init__(self):
+        fst, snd = Vector2(self.top_left), Vector2(self.bottom_right)
+        self.top_left = Vector2(min(fst.x, snd.x), min(fst.y, snd.y))
+        self.bottom_right = Vector2(max(fst.x, snd.x), max(fst.y, snd.y))
+
+    @property
+    def top(self) -> float:
+        return self.top_left.y
+
+    @property
+    def bottom(self) -> float:
+        return self.bottom_right.y
+
+    @property
+    def left(self) -> float:
+        return self.top_left.x
+
+    @property
+    def right(self) -> float:
+        return self.bottom_right.x
+
+    @property
+    def top_right(self) -> Vector2:
+        return Vector2(self.right, self.top)
+    
+    @property
+    def bottom_left(self) -> Vector2:
+        return Vector2(self.left, self.bottom)
+    
+    @property
+    def corners(self) -> list[Vector2]:
+        return [self.top_left, self.top_right, self.bottom_right, self.bottom_left]
+
+    @property
+    def size(self) -> Vector2:
+        return self.bottom_right - self.top_left
+    
+    @property
+    def position(self) -> Vector2:
+        return (self.top_left + self.bottom_right) / 2
+
+    def overlaps(self, other: 'Rectangle') -> bool:
+        return self.left <= other.right \
+            and self.right >= other.left \
+            and self.top <= other.bottom \
+            and self.bottom >= other.top
+
+    def is_inside(self, other) -> bool:
+        return self in other
+    
+    def __contains__(self, other) -> bool:
+        if isinstance(other, Rectangle):
+            return other.top_left in self and other.bottom_right in self
+        else:
+            x, y = other
+            return self.left <= x <= self.right and self.top <= y <= self.bottom
+    
+    def intersection_with(self, other: 'Rectangle') -> 'Rectangle':
+        if self.overlaps(other):
+            return Rectangle(
+                Vector2(
+                    max(self.left, other.left), 
+                    max(self.top, other.top)
+                ), 
+                Vector2(
+                    min(self.right, other.right), 
+                    min(self.bottom, other.bottom)
+                )
+            )
+        return None
+
+    def hits(self, other: 'Rectangle') -> dict[Direction, float]:
+        result = dict()
+        intersection = self.intersection_with(other)
+        if intersection is not None:
+            tl, tr, br, bl = tuple([corner in self for corner in other.corners])
+            if br and not(tl or tr or bl):
+                result[Direction.UP] = intersection.height
+                result[Direction.LEFT] = intersection.width
+            elif bl and not(tr or tl or br):
+                result[Direction.UP] = intersection.height
+                result[Direction.RIGHT] = intersection.width
+            elif tr and not(bl or br or tl):
+                result[Direction.DOWN] = intersection.height
+                result[Direction.LEFT] = intersection.width
+            elif tl and not(br or bl or tr):
+                result[Direction.DOWN] = intersection.height
+                result[Direction.RIGHT] = intersection.width
+            elif (tl and tr and not (bl or br)) or (self.top <= other.top <= self.bottom < other.bottom):
+                result[Direction.DOWN] = intersection.height
+            elif (bl and br and not (tl or tr)) or (other.top < self.top <= other.bottom <= self.bottom):
+                result[Direction.UP] = intersection.height
+            elif (tl and bl and not (tr or br)) or (self.left <= other.left <= self.right < other.right):
+                result[Direction.RIGHT] = intersection.width
+            elif (tr and br and not (tl or bl)) or (other.left < self.left <= other.right <= self.right):
+                result[Direction.LEFT] = intersection.width
+            else:
+                raise ValueError("Invalid collision, this is likely a bug")
+        return result
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        return self.top_left.x, self.top_left.y, self.bottom_right.x, self.bottom_right.y
+
+
+def collide(left: float, top: float, right: float, bottom: float,
+            other_left: float, other_top: float, other_right: float, other_bottom: float) \
+        -> tuple[tuple[Direction, float], ...]:
+    """
+    Scalar-only equivalent of `Rectangle.hits`, working on `(left, top, right, bottom)` bounds.
+    Returns the same `(direction, overlap)` pairs, in the same order, as a tuple instead of a dict.
+    """
+    if left > other_right or right < other_left or top > other_bottom or bottom < other_top:
+        return ()
+    width = min(right, other_right) - max(left, other_left)
+    height = min(bottom, other_bottom) - max(top, other_top)
+    left_in = left <= other_left <= right
+    right_in = left <= other_right <= right
+    top_in = top <= other_top <= bottom
+    bottom_in = top <= other_bottom <= bottom
+    tl, tr = left_in and top_in, right_in and top_in
+    br, bl = right_in and bottom_in, left_in and bottom_in
+    if br and not (tl or tr or bl):
+        return (Direction.UP, height), (Direction.LEFT, width)
+    elif bl and not (tr or tl or br):
+        return (Direction.UP, height), (Direction.RIGHT, width)
+    elif tr and not (bl or br or tl):
+        return (Direction.DOWN, height), (Direction.LEFT, width)
+    elif tl and not (br or bl or tr):
+        return (Direction.DOWN, height), (Direction.RIGHT, width)
+    elif (tl and tr and not (bl or br)) or (top <= other_top <= bottom < other_bottom):
+        return (Direction.DOWN, height),
+    elif (bl and br and not (tl or tr)) or (other_top < top <= other_bottom <= bottom):
+        return (Direction.UP, height),
+    elif (tl and bl and not (tr or br)) or (left <= other_left <= right < other_right):
+        return (Direction.RIGHT, width),
+    elif (tr and br and not (tl or bl)) or (other_left < left <= other_right <= right):
+        return (Direction.LEFT, width),
+    raise ValueError("Invalid collision, this is likely a bug")
+
+
+_GameObject = TypeVar('_GameObject', bound='GameObject')
+
+
+class GameObject(Sized, Positioned):
+    __slots__ = ('_size', '_position', '_speed', 'name', '_bounds', '_bounding_box', '_lent')
+
+    def __init__(self, size, position=None, speed=None, name=None):
+        self._size = Vector2(size)
+        self._position = Vector2(position) if position is not None else Vector2()
+        self._speed = Vector2(speed) if speed is not None else Vector2()
+        self.name = name or self.__class__.__name__.lower()
+        self._bounds = None
+        self._bounding_box = None
+        self._lent = False
+
+    def __eq__(self, other):
+        return isinstance(other, type(self)) and \
+            self.name == other.name and \
+            self._size == other._size and \
+            self._position == other._position and \
+            self._speed == other._speed
+
+    def __hash__(self):
+        return hash((type(self), self.name, self._size, self._position, self._speed))
+
+    def __repr__(self):
+        return f'<{type(self).__name__}(id={id(self)}, name={self.name}, size={self._size}, position={self._position}, speed={self._speed})>'
+
+    def __str__(self):
+        return f'{self.name}#{id(self)}'
+
+    def _own(self):
+        """
+        Replaces the vectors handed out by the `size`, `position` and `speed` getters with fresh copies,
+        so that in-place updates do not affect references held by callers.
+        """
+        if self._lent:
+            self._size, self._position, self._speed = Vector2(self._size), Vector2(self._position), Vector2(self._speed)
+            self._lent = False
+
+    def _assign(self, vector: Vector2, value: Vector2, verb: str):
+        self._bounds = self._bounding_box = None
+        if trace.MODEL.enabled:
+            old_x, old_y = vector
+            vector.update(value)
+            if (old_x, old_y) != tuple(vector):
+                trace.MODEL.record("%s %s: (%s, %s) -> (%s, %s)", self.name, verb, old_x, old_y, vector.x, vector.y)
+        else:
+            vector.update(value)
+
+    @property
+    def size(self) -> Vector2:
+        self._lent = True
+        return self._size
+
+    @size.setter
+    def size(self, value: Vector2):
+        self._own()
+        self._assign(self._size, value, "resized")
+
+    @property
+    def position(self) -> Vector2:
+        self._lent = True
+        return self._position
+
+    @position.setter
+    def position(self, value: Vector2):
+        self._own()
+        self._assign(self._position, value, "moves")
+
+    @property
+    def speed(self) -> Vector2:
+        self._lent = True
+        return self._speed
+
+    @speed.setter
+    def speed(self, value: Vector2):
+        self._own()
+        self._assign(self._speed, value, "accelerates")
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """
+        The `(left, top, right, bottom)` bounds of this object, cached until position or size change.
+        The cache is bypassed while the vectors are lent out, as callers may mutate them in place.
+        """
+        if self._bounds is None or self._lent:
+            x, y = self._position
+            half_width, half_height = self._size.x / 2, self._size.y / 2
+            self._bounds = (x - half_width, y - half_height, x + half_width, y + half_height)
+        return self._bounds
+
+    @property
+    def bounding_box(self) -> Rectangle:
+        if self._bounding_box is None or self._lent:
+            left, top, right, bottom = self.bounds
+            self._bounding_box = Rectangle(Vector2(left, top), Vector2(right, bottom))
+        return self._bounding_box
+
+    def update(self, delta_time: float):
+        self._own()
+        position, speed = self._position, self._speed
+        if speed.x or speed.y:
+            position.x += speed.x * delta_time
+            position.y += speed.y * delta_time
+            self._bounds = self._bounding_box = None
+
+    def bounce(self, direction: 'Direction', overlap: float):
+        """
+        Pushes this object back by `overlap` along `direction`, and reflects its speed along the same axis.
+        Mutates position and speed in place.
+        """
+        self._own()
+        position, speed, push = self._position, self._speed, direction.value
+        position.x -= push.x * overlap
+        position.y -= push.y * overlap
+        self._bounds = self._bounding_box = None
+        if direction.is_horizontal:
+            speed.x = -speed.x
+        if direction.is_vertical:
+            speed.y = -speed.y
+
+    def _state(self) -> tuple[float, float, float, float, float, float]:
+        (x, y), (speed_x, speed_y), (width, height) = self._position, self._speed, self._size
+        return x, y, speed_x, speed_y, width, height
+
+    def _load_state(self, x: float, y: float, speed_x: float, speed_y: float, width: float, height: float):
+        self._own()
+        self._position.update(x, y)
+        self._speed.update(speed_x, speed_y)
+        self._size.update(width, height)
+        self._bounds = self._bounding_box = None
+
+    def override(self, other: 'GameObject'):
+        assert isinstance(other, type(self)) and other.name == self.name, f"Invalid override: {other} -> {self}"
+        self.size = other._size
+        self.position = other._position
+        self.speed = other._speed
+
+    def diff(self, other: 'GameObject') -> dict[str, Vector2]:
+        """
+        The fields (among `position`, `speed`, `size`) whose value in `other` differs from this object's one.
+        """
+        changes = dict()
+        if self._position != other._position:
+            changes['position'] = Vector2(other._position)
+        if self._speed != other._speed:
+            changes['speed'] = Vector2(other._speed)
+        if self._size != other._size:
+            changes['size'] = Vector2(other._size)
+        return changes
+
+    def apply(self, changes: dict[str, Vector2]):
+        for name, value in changes.items():
+            setattr(self, name, value)
+
+    def copy(self: _GameObject) -> _GameObject:
+        return type(self)(self._size, self._position, self._speed, self.name)
+
+
+for method_name in ['overlaps', 'is_inside', '__contains__', 'intersection_with']:
+    def method(self: GameObject, other: GameObject | Rectangle, method_name=method_name):
+        if isinstance(other, GameObject):
+            other = other.bounding_box
+        return getattr(Rectangle, method_name)(self.bounding_box, other)
+    setattr(GameObject, method_name, method)
+
+
+def _game_object_hits(self: GameObject, other: GameObject | Rectangle) -> dict[Direction, float]:
+    return dict(collide(*self.bounds, *other.bounds))
+
+
+setattr(GameObject, 'hits', _game_object_hits)
+
+
+class Ball(GameObject):
+    __slots__ = ()
+
+
+class Paddle(GameObject):
+    __slots__ = ('side',)
+    _admissible_directions = set(Direction.values()) - {Direction.NONE}
+
+    def __init__(self, size, side: Direction, position=None, speed=None, name=None):
+        assert isinstance(side, Direction) and side in self._admissible_directions, f"Invalid direction {side}"
+        super().__init__(size, position, speed, name or "paddle_" + side.name.lower())
+        self.side = side
+
+    def __repr__(self):
+        return super().__repr__().replace(')>', f", side={self.side})>")
+
+    def __hash__(self):
+        return hash((super().__hash__(), self.side))
+
+    def __eq__(self, other):
+        return super().__eq__(other) and self.side == other.side
+    
+    def override(self, other: GameObject):
+        super().override(other)
+        self.side = other.side
+
+    def copy(self) -> 'Paddle':
+        return Paddle(self._size, self.side, self._position, self._speed, self.name)
+
+
+def fold(value: float, low: float, high: float) -> tuple[float, int]:
+    '''
+    Reflects `value` back into `[low, high]` as a point bouncing between the two ends would be.
+    Returns the reflected value and the amount of bounces.
+    '''
+    span = high - low
+    if span <= 0:
+        return low, 0
+    bounces = math.floor((value - low) / span)
+    offset = value - low - bounces * span
+    if bounces % 2:
+        offset = span - offset
+    return low + offset, abs(bounces)
+
+
+class Intercept(NamedTuple):
+    """When (in seconds from now) and where (the ball center) a ball reaches a paddle's plane, as per `Pong.predict_intercept`."""
+    delay: float
+    position: Vector2
+    bounces: int
+
+
+class Snapshot(NamedTuple):
+    """
+    A compact, immutable copy of the dynamic state of a `Pong`, as produced by `Pong.snapshot`.
+    `state` holds position, speed and size (6 floats each) of the `balls` balls, then of the paddles in `sides` order.
+    Snapshots decoded from the wire carry no `random` state, but the table `size` and `config` instead:
+    `None` fields are left untouched by `Pong.restore`.
+    """
+    updates: int
+    time: float
+    sides: tuple['Direction', ...]
+    state: tuple[float, ...]
+    random: Optional[tuple]
+    balls: int = 1
+    size: Optional[Vector2] = None
+    config: Optional['Config'] = None
+
+
+@dataclass
+class PongDiff:
+    """
+    A minimal change set turning a `Pong` into another one, as produced by `Pong.diff`.
+    Fields which did not change are `None` (or empty).
+    `extent` is not a change: it is the size of the table positions and speeds in changes are relative to
+    (e.g. `(1, 1)` if they are fractions of the table size), which `Pong.apply` rescales to the actual one.
+    """
+    updates: Optional[int] = None
+    time: Optional[float] = None
+    size: Optional[Vector2] = None
+    config: Optional['Config'] = None
+    ball: dict[str, Vector2] = field(default_factory=dict)
+    paddles: dict['Direction', dict[str, Vector2]] = field(default_factory=dict)
+    added: list['Paddle'] = field(default_factory=list)
+    removed: list['Direction'] = field(default_factory=list)
+    balls: dict[int, dict[str, Vector2]] = field(default_factory=dict)
+    added_balls: list['Ball'] = field(default_factory=list)
+    removed_balls: int = 0
+    extent: Optional[Vector2] = None
+
+    def rescaled(self, extent: Vector2) -> 'PongDiff':
+        '''A copy of these changes, with positions and speeds scaled as if they referred to a table of size `extent`.'''
+        assert self.extent is not None, "Changes without extent cannot be rescaled"
+        scale = Vector2(extent.x / self.extent.x, extent.y / self.extent.y)
+
+        def rescale(changes: dict[str, Vector2]) -> dict[str, Vector2]:
+            return {name: value.elementwise() * scale if name != 'size' else value for name, value in changes.items()}
+
+        def rescale_object(obj: _GameObject) -> _GameObject:
+            obj = obj.copy()
+            obj.position = obj.position.elementwise() * scale
+            obj.speed = obj.speed.elementwise() * scale
+            return obj
+
+        return PongDiff(self.updates, self.time, self.size, self.config, rescale(self.ball),
+                        {side: rescale(changes) for side, changes in self.paddles.items()},
+                        [rescale_object(paddle) for paddle in self.added], list(self.removed),
+                        {index: rescale(changes) for index, changes in self.balls.items()},
+                        [rescale_object(ball) for ball in self.added_balls], self.removed_balls, Vector2(extent))
+
+    def __bool__(self):
+        return self.updates is not None or self.time is not None or self.size is not None \
+            or self.config is not None or self.removed_balls > 0 \
+            or bool(self.ball or self.paddles or self.added or self.removed or self.balls or self.added_balls)
+
+
+@dataclass
+class Config:
+    paddle_ratio: Vector2 = field(default_factory=lambda: Vector2(0.01, 0.1))
+    ball_ratio: float = 0.05
+    ball_speed_ratio: float = 0.2
+    paddle_speed_ratio: float = 0.2
+    paddle_padding: float = 0.05
+
+
+@dataclass
+class Table(Sized):
+    size: Vector2
+    borders: dict[Direction, GameObject] = field(init=False)
+    half_planes: tuple[tuple[Direction, int, float, float], ...] = field(init=False)
+
+    def __post_init__(self):
+        borders = dict()
+        borders[Direction.UP] = Rectangle((-self.width, 0), (self.width * 2, -self.height))
+        borders[Direction.DOWN] = Rectangle((-self.width, self.height), (self.width * 2, self.height * 2))
+        borders[Direction.LEFT] = Rectangle((0, -self.height), (-self.width, self.height * 2))
+        borders[Direction.RIGHT] = Rectangle((self.width, -self.height), (self.width * 2, self.height * 2))
+        self.borders = dict()
+        for dir, rect in borders.items():
+            self.borders[dir] = GameObject(
+                size=rect.size,
+                position=rect.position,
+                name=f"border_{dir.name.lower()}"
+            )
+        # borders extend well beyond the table, so hitting one of them boils down to crossing a line:
+        # for each border (in the same order as `borders`) the overlap of an object whose bounds are
+        # `(left, top, right, bottom)` is `sign * (bounds[index] - limit)`, as in `(direction, index, sign, limit)`
+        self.half_planes = (
+            (Direction.UP, 1, -1.0, 0.0),
+            (Direction.DOWN, 3, 1.0, self.height),
+            (Direction.LEFT, 0, -1.0, 0.0),
+            (Direction.RIGHT, 2, 1.0, self.width),
+        )
+
+
+class Pong(Sized):
+    profiler: Optional['profiling.PhaseProfiler'] = None
+    '''Optional `dpongpy.profiling.PhaseProfiler` timing the phases of `update` (see `dpongpy.profiling.install`).'''
+
+    def __init__(self, size, config=None, paddles=None, random=None, balls: int = 1):
+        self.size = Vector2(size)
+        self.config = config or Config()
+        self.random = random or Random()
+        self._random_state: Optional[tuple] = None
+        self.balls: list[Ball] = []
+        self.reset_ball()
+        for _ in range(1, balls):
+            self.add_ball()
+        self.table = Table(self.size)
+        self.updates = 0
+        self.time: float = 0
+        if paddles is None:
+            paddles = (Direction.LEFT, Direction.RIGHT)
+        self.paddles = [paddle for paddle in paddles if isinstance(paddle, Paddle)]
+        self._init_paddles((side for side in paddles if isinstance(side, Direction)))
+
+    @property
+    def paddles(self) -> list[Paddle]:
+        return list(self._paddles.values())
+
+    @paddles.setter
+    def paddles(self, paddles):
+        self._paddles = {}
+        for paddle in paddles:
+            assert isinstance(paddle, Paddle), f"Invalid paddle: {paddle}"
+            self._paddles[paddle.side] = paddle
+
+    def __repr__(self):
+        return (f'<{type(self).__name__}('
+                f'id={id(self)}, '
+                f'size={self.size}, '
+                f'time={self.time}, '
+                f'updates={self.updates}, '
+                f'config={self.config}'
+                f'balls={self.balls}, '
+                f'paddles={self.paddles}, '
+                f')>')
+
+    @property
+    def _hittable_objects(self) -> list[GameObject]:
+        return self.paddles + list(self.table.borders.values())
+
+    @property
+    def ball(self) -> Ball:
+        """The first ball, i.e. the only one in ordinary matches: an `IndexError` is raised if there is none."""
+        if not self.balls:
+            raise IndexError(f"No ball in {self}")
+        return self.balls[0]
+
+    @ball.setter
+    def ball(self, ball: Ball):
+        if self.balls:
+            self.balls[0] = ball
+        else:
+            self.balls = [ball]
+
+    def reset_ball(self, speed: Optional[Vector2] = None):
+        if not self.balls:
+            self.ball = Ball(size=self._ball_size(), position=self.size / 2, name=self.ball_name(0))
+        else:
+            self.ball.size = self._ball_size()
+            self.ball.position = self.size / 2
+        self._serve(self.ball, speed)
+
+    def reseed(self, seed: int):
+        """Re-seeds the random generator, e.g. to share it among peers before serving the ball."""
+        self.random.seed(seed)
+        self._random_state = None
+
+    @staticmethod
+    def ball_name(index: int) -> str:
+        """The name of the `index`-th ball: the first one is just `"ball"`, as in ordinary matches."""
+        return "ball" if index == 0 else f"ball_{index}"
+
+    def _ball_size(self) -> Vector2:
+        return Vector2(min(*self.size) * self.config.ball_ratio)
+
+    def _serve(self, ball: Ball, speed: Optional[Vector2] = None):
+        if speed is None:
+            self._random_state = None
+            polar_speed = (min(*self.size) * self.config.ball_speed_ratio, self.random.uniform(0, 360))
+            speed = Vector2()
+            speed.from_polar(polar_speed)
+        ball.speed = Vector2(speed)
+
+    def add_ball(self, speed: Optional[Vector2] = None, position: Optional[Vector2] = None) -> Ball:
+        """
+        Adds one more ball (in the center of the table, by default) with a random direction unless `speed` is given.
+        """
+        ball = Ball(size=self._ball_size(), position=self.size / 2 if position is None else position,
+                    name=self.ball_name(len(self.balls)))
+        self._serve(ball, speed)
+        self.balls.append(ball)
+        logger.debug("Added ball %s to %s", ball, self)
+        return ball
+
+    def remove_ball(self, ball: Ball):
+        self.balls.remove(ball)
+        logger.debug("Removed ball %s from %s", ball, self)
+
+    def add_paddle(self, side: Direction, paddle: Optional[Paddle] = None):
+        assert side is not None and side != Direction.NONE, "Invalid side"
+        if side in self._paddles:
+            raise ValueError(f"Paddle one side {side} already exists")
+        if paddle is None:
+            paddle_ratio = self.config.paddle_ratio
+            if side.is_vertical:
+                paddle_ratio = (paddle_ratio.y, paddle_ratio.x)
+            paddle_size = self.size.elementwise() * paddle_ratio
+            padding = self.width * self.config.paddle_padding + paddle_size.x / 2 if side.is_horizontal \
+                else self.height * self.config.paddle_padding + paddle_size.y / 2
+            if side == Direction.UP:
+                position = Vector2(self.width / 2, padding)
+            elif side == Direction.RIGHT:
+                position = Vector2(self.width - padding, self.height / 2)
+            elif side == Direction.DOWN:
+                position = Vector2(self.width / 2, self.height - padding)
+            else:
+                position = Vector2(padding, self.height / 2)
+            paddle = Paddle(size=paddle_size, side=side, position=position)
+        self._paddles[side] = paddle
+        logger.debug(f"Added paddle {paddle} to {self} on side {paddle.side.name}")
+
+    def _plane_of(self, side: Direction) -> float:
+        '''The coordinate of the inner face of the paddle on `side`, or of the table edge if there is no such paddle.'''
+        axis = 0 if side.is_horizontal else 1
+        towards = side.value[axis]
+        if side in self._paddles:
+            bounds = self._paddles[side].bounds
+            return bounds[axis + 2] if towards < 0 else bounds[axis]
+        return 0.0 if towards < 0 else self.size[axis]
+
+    def predict_intercept(self, side: Direction, ball: Optional[Ball] = None) -> Optional[Intercept]:
+        """
+        Predicts when and where `ball` (the first one, by default) will touch the plane of the paddle on `side`,
+        i.e. the line of the paddle's inner face (or the table edge, if there is no paddle there),
+        assuming it only bounces off table borders, as it would if all other paddles missed it.
+        Reflections are folded analytically, so this takes constant time regardless of the amount of bounces.
+        Returns `None` if the ball does not move along the paddle's axis, or is already beyond the plane.
+        """
+        ball = ball or self.ball
+        axis = 0 if side.is_horizontal else 1
+        other = 1 - axis
+        towards = side.value[axis]
+        half, position, speed = ball._size / 2, ball._position, ball._speed
+        target = self._plane_of(side) - towards * half[axis]
+        if speed[axis] == 0 or (target - position[axis]) * towards < 0:
+            return None
+        if speed[axis] * towards > 0:
+            distance, bounces = abs(target - position[axis]), 0
+        else:
+            far = half[axis] if towards > 0 else self.size[axis] - half[axis]
+            distance, bounces = abs(far - position[axis]) + abs(far - target), 1
+        delay = distance / abs(speed[axis])
+        lateral, lateral_bounces = fold(position[other] + speed[other] * delay, half[other], self.size[other] - half[other])
+        intercept = Vector2()
+        intercept[axis], intercept[other] = target, lateral
+        return Intercept(delay, intercept, bounces + lateral_bounces)
+
+    def paddle(self, side: Direction) -> Paddle:
+        if side in self._paddles:
+            return self._paddles[side]
+        else:
+            raise KeyError(f"No such a paddle: {side}")
+        
+    def has_paddle(self, side: Direction):
+        return side in self._paddles
+
+    def remove_paddle(self, side: Direction):
+        if side in self._paddles:
+            del self._paddles[side]
+            logger.debug(f"Removed paddle from {self} on side {side}")
+        else:
+            raise KeyError(f"No such a paddle: {side}")
+
+    def _init_paddles(self, sides):
+        # no sets: paddles are added in the given order, whatever the hash seed (which would make replicas diverge)
+        for side in dict.fromkeys(sides or ()):
+            self.add_paddle(side)
+
+    def update(self, delta_time: float):
+        self.updates += 1
+        self.time += delta_time
+        if trace.MODEL.enabled:
+            trace.MODEL.record("Update %d (time: %s)", self.updates, self.time)
+        profiler = self.profiler
+        if profiler is None:
+            self._integrate_balls(delta_time)
+            self._integrate_paddles(delta_time)
+            self._handle_ball_collisions()
+            self._handle_paddle_collisions()
+        else:
+            self._profiled_update(delta_time, profiler)
+
+    def _profiled_update(self, delta_time: float, profiler: 'profiling.PhaseProfiler'):
+        start = perf_counter()
+        self._integrate_balls(delta_time)
+        balls_integrated = perf_counter()
+        self._integrate_paddles(delta_time)
+        paddles_integrated = perf_counter()
+        self._handle_ball_collisions()
+        balls_collided = perf_counter()
+        self._handle_paddle_collisions()
+        end = perf_counter()
+        profiler.record(profiling.BALL_INTEGRATION, balls_integrated - start)
+        profiler.record(profiling.PADDLE_INTEGRATION, paddles_integrated - balls_integrated)
+        profiler.record(profiling.BALL_COLLISIONS, balls_collided - paddles_integrated)
+        profiler.record(profiling.PADDLE_COLLISIONS, end - balls_collided)
+        profiler.record(profiling.UPDATE, end - start)
+
+    def _integrate_balls(self, delta_time: float):
+        for ball in self.balls:
+            ball.update(delta_time)
+
+    def _integrate_paddles(self, delta_time: float):
+        for paddle in self._paddles.values():
+            paddle.update(delta_time)
+
+    def _handle_ball_collisions(self):
+        for subject, other in self._candidate_pairs():
+            if isinstance(other, Ball):
+                self._handle_ball_collision(subject, other)
+            else:
+                self._handle_collisions(subject, (other,))
+        for ball in self.balls:
+            self._handle_border_collisions(ball)
+
+    def _handle_paddle_collisions(self):
+        for paddle in self._paddles.values():
+            self._handle_border_collisions(paddle)
+
+    def _candidate_pairs(self) -> list[tuple[Ball, GameObject]]:
+        """
+        Broad phase: finds the ball–paddle and ball–ball pairs whose bounding boxes overlap or touch,
+        by sorting balls and paddles along the x axis and sweeping over them (sweep and prune).
+        Borders are static, hence handled separately by `_handle_border_collisions`.
+        """
+        objects = sorted(chain(self.balls, self._paddles.values()), key=lambda obj: obj.bounds[0])
+        pairs = []
+        active: list[GameObject] = []
+        for obj in objects:
+            left, top, _, bottom = obj.bounds
+            active = [other for other in active if other.bounds[2] >= left]
+            is_ball = isinstance(obj, Ball)
+            for other in active:
+                _, other_top, _, other_bottom = other.bounds
+                if other_top <= bottom and other_bottom >= top:
+                    if isinstance(other, Ball):
+                        pairs.append((other, obj))
+                    elif is_ball:
+                        pairs.append((obj, other))
+            active.append(obj)
+        return pairs
+
+    def _handle_border_collisions(self, subject: GameObject):
+        for direction, index, sign, limit in self.table.half_planes:
+            overlap = sign * (subject.bounds[index] - limit)
+            if overlap > 0.0:
+                if trace.COLLISION.enabled:
+                    trace.COLLISION.record("%s hits %s in direction %s, overlap is %s",
+                                           subject.name, self.table.borders[direction].name, direction.name, overlap)
+                subject.bounce(direction, overlap)
+
+    def _handle_ball_collision(self, ball: Ball, other: Ball):
+        """
+        Separates two overlapping balls along the axis of least penetration, splitting the overlap evenly,
+        and exchanges their speeds along that axis if they are approaching each other
+        (i.e. an elastic collision between equal masses).
+        """
+        left, top, right, bottom = ball.bounds
+        other_left, other_top, other_right, other_bottom = other.bounds
+        width = min(right, other_right) - max(left, other_left)
+        height = min(bottom, other_bottom) - max(top, other_top)
+        if width <= 0.0 or height <= 0.0:
+            return
+        if width <= height:
+            axis, overlap = 0, width
+            direction = Direction.RIGHT if ball._position.x <= other._position.x else Direction.LEFT
+        else:
+            axis, overlap = 1, height
+            direction = Direction.DOWN if ball._position.y <= other._position.y else Direction.UP
+        if trace.COLLISION.enabled:
+            trace.COLLISION.record("%s hits %s in direction %s, overlap is %s",
+                                   ball.name, other.name, direction.name, overlap)
+        push = direction.value * (overlap / 2)
+        ball.position = ball._position - push
+        other.position = other._position + push
+        speed, other_speed = ball._speed, other._speed
+        if (other_speed[axis] - speed[axis]) * direction.value[axis] < 0:
+            speed[axis], other_speed[axis] = other_speed[axis], speed[axis]
+
+    def _handle_collisions(self, subject, objects):
+        for hittable in objects:
+            for direction, delta in collide(*subject.bounds, *hittable.bounds):
+                if trace.COLLISION.enabled:
+                    trace.COLLISION.record("%s hits %s in direction %s, overlap is %s",
+                                           subject.name, hittable.name, direction.name, delta)
+                if delta > 0.0:
+                    subject.bounce(direction, delta)
+
+    def move_paddle(self, paddle: int | Direction, direction: Direction):
+        if isinstance(paddle, Direction) and paddle in self._paddles:
+            selected = self._paddles[paddle]
+        elif isinstance(paddle, int) and paddle in range(len(self.paddles)):
+            selected = self.paddles[0]
+        else:
+            raise KeyError("No such a paddle: " + str(paddle))
+        if selected.side.is_horizontal and direction.is_vertical:
+            selected.speed = direction.value * self.height * self.config.paddle_speed_ratio
+        elif selected.side.is_vertical and direction.is_horizontal:
+            selected.speed = direction.value * self.width * self.config.paddle_speed_ratio
+        elif direction == Direction.NONE:
+            selected.speed = direction.value
+        else:
+            logger.debug("Ignored attempt to move %s in %s", paddle, direction)
+    
+    def stop_paddle(self, paddle: int | Direction):
+        self.move_paddle(paddle, Direction.NONE)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Captures the dynamic state of this match (time, ball, paddles, random generator) into a `Snapshot`.
+        The state of the random generator is only re-read after `reset_ball` draws from it:
+        code drawing from `self.random` directly should set `self._random_state = None` afterwards.
+        """
+        state: tuple[float, ...] = ()
+        for ball in self.balls:
+            state += ball._state()
+        sides = tuple(self._paddles)
+        for paddle in self._paddles.values():
+            state += paddle._state()
+        if self._random_state is None:
+            self._random_state = self.random.getstate()
+        return Snapshot(self.updates, self.time, sides, state, self._random_state, len(self.balls))
+
+    def restore(self, snapshot: Snapshot):
+        if snapshot.size is not None and snapshot.size != self.size:
+            self.size = Vector2(snapshot.size)
+            self.table = Table(self.size)
+        if snapshot.config is not None:
+            self.config = snapshot.config
+        state = snapshot.state
+        if len(self.balls) != snapshot.balls:
+            del self.balls[snapshot.balls:]
+            self.balls += [Ball((0, 0), name=self.ball_name(index)) for index in range(len(self.balls), snapshot.balls)]
+        for index, ball in enumerate(self.balls):
+            ball._load_state(*state[index * 6:index * 6 + 6])
+        if tuple(self._paddles) != snapshot.sides:
+            self._paddles = {side: self._paddles.get(side) or Paddle((0, 0), side) for side in snapshot.sides}
+        for index, paddle in enumerate(self._paddles.values(), start=snapshot.balls):
+            paddle._load_state(*state[index * 6:index * 6 + 6])
+        self.updates = snapshot.updates
+        self.time = snapshot.time
+        if snapshot.random is not None and snapshot.random is not self._random_state:
+            self.random.setstate(snapshot.random)
+            self._random_state = snapshot.random
+
+    def diff(self, other: 'Pong') -> PongDiff:
+        """
+        Computes the minimal set of changes which, once applied to this match, make it equal to `other`.
+        """
+        diff = PongDiff(extent=Vector2(other.size))
+        if self.updates != other.updates:
+            diff.updates = other.updates
+        if self.time != other.time:
+            diff.time = other.time
+        if self.size != other.size:
+            diff.size = Vector2(other.size)
+        if self.config != other.config:
+            diff.config = other.config
+        for index, ball in enumerate(other.balls):
+            if index >= len(self.balls):
+                diff.added_balls.append(ball.copy())
+            elif index == 0:
+                diff.ball = self.ball.diff(ball)  # the first ball has a field of its own, as in single-ball diffs
+            else:
+                changes = self.balls[index].diff(ball)
+                if changes:
+                    diff.balls[index] = changes
+        diff.removed_balls = max(len(self.balls) - len(other.balls), 0)
+        for side, paddle in other._paddles.items():
+            if side not in self._paddles:
+                diff.added.append(paddle.copy())
+            else:
+                changes = self._paddles[side].diff(paddle)
+                if changes:
+                    diff.paddles[side] = changes
+        diff.removed = [side for side in self._paddles if side not in other._paddles]
+        return diff
+
+    def apply(self, diff: PongDiff):
+        """
+        Applies a change set produced by `diff` in place, leaving unchanged objects untouched.
+        """
+        extent = diff.size if diff.size is not None else self.size
+        if diff.extent is not None and diff.extent != extent:
+            diff = diff.rescaled(extent)
+        if diff.size is not None:
+            self.size = Vector2(diff.size)
+            self.table = Table(self.size)
+        if diff.config is not None:
+            self.config = diff.config
+        if diff.updates is not None:
+            self.updates = diff.updates
+        if diff.time is not None:
+            self.time = diff.time
+        if diff.ball:
+            self.ball.apply(diff.ball)
+        if diff.removed_balls:
+            del self.balls[-diff.removed_balls:]
+        for index, changes in diff.balls.items():
+            self.balls[index].apply(changes)
+        self.balls += [ball.copy() for ball in diff.added_balls]
+        for side in diff.removed:
+            self.remove_paddle(side)
+        for paddle in diff.added:
+            self.add_paddle(paddle.side, paddle.copy())
+        for side, changes in diff.paddles.items():
+            self._paddles[side].apply(changes)
+
+    def override(self, other: 'Pong'):
+        if self is other:
+            return
+        if trace.MODEL.enabled:
+            trace.MODEL.record("Overriding Pong status (update %d)", other.updates)
+        diff = self.diff(other)
+        added = {paddle.side: paddle for paddle in diff.added}
+        removed = {side: self._paddles[side] for side in diff.removed}
+        self.apply(diff)
+        return added, removed
+
+
+class SnapshotRing:
+    """
+    Fixed-capacity buffer of `Snapshot`s, keyed by their update number.
+    Storing a snapshot evicts the one whose update number is `capacity` updates older.
+    """
+
+    def __init__(self, capacity: int):
+        assert capacity > 0, "Capacity must be positive"
+        self._slots: list[Optional[Snapshot]] = [None] * capacity
+        self._latest: Optional[int] = None
+
+    @classmethod
+    def for_duration(cls, seconds: float, fps: float) -> 'SnapshotRing':
+        return cls(max(1, round(seconds * fps)))
+
+    @property
+    def capacity(self) -> int:
+        return len(self._slots)
+
+    def push(self, snapshot: Snapshot):
+        self._slots[snapshot.updates % len(self._slots)] = snapshot
+        if self._latest is None or snapshot.updates > self._latest:
+            self._latest = snapshot.updates
+
+    def record(self, pong: Pong) -> Snapshot:
+        snapshot = pong.snapshot()
+        self.push(snapshot)
+        return snapshot
+
+    def __contains__(self, updates: int) -> bool:
+        snapshot = self._slots[updates % len(self._slots)]
+        return snapshot is not None and snapshot.updates == updates
+
+    def __getitem__(self, updates: int) -> Snapshot:
+        snapshot = self._slots[updates % len(self._slots)]
+        if snapshot is None or snapshot.updates != updates:
+            raise KeyError(f"No snapshot for update {updates}")
+        return snapshot
+
+    def get(self, updates: int, default=None) -> Optional[Snapshot]:
+        return self[updates] if updates in self else default
+
+    @property
+    def latest(self) -> Optional[Snapshot]:
+        return None if self._latest is None else self.get(self._latest)
+
+    def at_or_before(self, updates: int) -> Optional[Snapshot]:
+        """
+        The most recent snapshot whose update number is not greater than `updates`, if still available.
+        """
+        if self._latest is None:
+            return None
+        for candidate in range(min(updates, self._latest), self._latest - len(self._slots), -1):
+            if candidate in self:
+                return self._slots[candidate % len(self._slots)]
+        return None
+
+    def __len__(self):
+        return sum(1 for snapshot in self._slots if snapshot is not None)
+
+    def clear(self):
+        self._slots = [None] * len(self._slots)
+        self._latest = None
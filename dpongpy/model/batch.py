@@ -0,0 +1,288 @@
+from typing import Optional
+
+import numpy as np
+
+from dpongpy.model import Direction, Config, Pong, Paddle, Ball, Table, Vector2
+
+
+SIDES = tuple(direction for direction in Direction.values() if direction != Direction.NONE)
+'''The order in which paddle slots are stored (and checked for collisions) in a `PongBatch`.'''
+
+BORDERS = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
+'''The order in which table borders are checked for collisions, as in `Table.borders`.'''
+
+HALF_PLANES = tuple((direction, index, sign) for direction, index, sign, _ in Table(Vector2(1, 1)).half_planes)
+'''
+The `(direction, index, sign)` of borders as in `Table.half_planes`, in `BORDERS` order:
+their limit is 0 for negative signs, and the table size (along axis `index % 2`) otherwise.
+'''
+
+assert tuple(direction for direction, _, _ in HALF_PLANES) == BORDERS, "Borders must be checked in the same order"
+
+
+def _box(position: np.ndarray, size: np.ndarray) -> np.ndarray:
+    '''
+    Computes the bounding boxes of objects, as `(left, top, right, bottom)` along the last axis,
+    exactly as `GameObject.bounding_box` does.
+    '''
+    half_size = size / 2
+    return np.concatenate((position - half_size, position + half_size), axis=-1)
+
+
+def hits(subject: np.ndarray, other: np.ndarray):
+    '''
+    Vectorized counterpart of `Rectangle.hits`.
+
+    Both arguments are arrays of boxes shaped `(..., 4)`.
+    Returns a tuple `(dx, dy, flip_x, flip_y, invalid)` where `dx`/`dy` are the push-out offsets
+    `_handle_collisions` would apply to the subject's position, `flip_x`/`flip_y` tell which speed
+    components would be reflected, and `invalid` marks the collisions `Rectangle.hits` rejects.
+    '''
+    sl, st, sr, sb = (subject[..., i] for i in range(4))
+    ol, ot, or_, ob = (other[..., i] for i in range(4))
+    overlap = (sl <= or_) & (sr >= ol) & (st <= ob) & (sb >= ot)
+    width = np.minimum(sr, or_) - np.maximum(sl, ol)
+    height = np.minimum(sb, ob) - np.maximum(st, ot)
+
+    def inside(x, y):
+        return (sl <= x) & (x <= sr) & (st <= y) & (y <= sb)
+
+    tl, tr, br, bl = inside(ol, ot), inside(or_, ot), inside(or_, ob), inside(ol, ob)
+    cases = [
+        br & ~(tl | tr | bl),
+        bl & ~(tr | tl | br),
+        tr & ~(bl | br | tl),
+        tl & ~(br | bl | tr),
+        (tl & tr & ~(bl | br)) | ((st <= ot) & (ot <= sb) & (sb < ob)),
+        (bl & br & ~(tl | tr)) | ((ot < st) & (st <= ob) & (ob <= sb)),
+        (tl & bl & ~(tr | br)) | ((sl <= ol) & (ol <= sr) & (sr < or_)),
+        (tr & br & ~(tl | bl)) | ((ol < sl) & (sl <= or_) & (or_ <= sr)),
+    ]
+    # (vertical direction, horizontal direction) reported by each case of `Rectangle.hits`
+    outcomes = [
+        (Direction.UP, Direction.LEFT),
+        (Direction.UP, Direction.RIGHT),
+        (Direction.DOWN, Direction.LEFT),
+        (Direction.DOWN, Direction.RIGHT),
+        (Direction.DOWN, None),
+        (Direction.UP, None),
+        (None, Direction.RIGHT),
+        (None, Direction.LEFT),
+    ]
+    case = np.select(cases, list(range(len(cases))), default=len(cases))
+    case = np.where(overlap, case, -1)
+    dx, dy = np.zeros_like(width), np.zeros_like(height)
+    flip_x, flip_y = np.zeros_like(overlap), np.zeros_like(overlap)
+    for index, (vertical, horizontal) in enumerate(outcomes):
+        selected = case == index
+        if vertical is not None:
+            push = selected & (height > 0.0)
+            dy = np.where(push, -vertical.value.y * height, dy)
+            flip_y |= push
+        if horizontal is not None:
+            push = selected & (width > 0.0)
+            dx = np.where(push, -horizontal.value.x * width, dx)
+            flip_x |= push
+    invalid = case == len(cases)
+    return dx, dy, flip_x, flip_y, invalid
+
+
+class PongBatch:
+    '''
+    Struct-of-arrays simulation of N independent Pong matches.
+
+    Ball and paddle state are stored in contiguous NumPy arrays, and `update`/`move_paddle` operate
+    on all matches at once, mirroring the semantics of `Pong.update` and `Pong.move_paddle`.
+    Paddles are stored in one slot per side (cf. `SIDES`): `paddle_mask` tells which slots are in use.
+    Collisions of the ball against paddles are checked in `SIDES` order (`Pong.update` sweeps paddles by
+    their left bound instead, which only matters for balls touching two paddles at once), and only in
+    the matches where they touch. Then balls and paddles are checked against borders as half-planes
+    (cf. `HALF_PLANES`), as `Pong.update` does. Only single-ball matches are supported.
+    '''
+
+    def __init__(self, count: int, size, config: Optional[Config] = None, paddles=None, random=None):
+        template = Pong(size, config, paddles=paddles, random=random)
+        self._allocate(count)
+        for i in range(count):
+            template.reset_ball()
+            self._load(i, template)
+
+    @classmethod
+    def from_pongs(cls, pongs: list[Pong]) -> 'PongBatch':
+        batch = cls.__new__(cls)
+        batch._allocate(len(pongs))
+        for i, pong in enumerate(pongs):
+            batch._load(i, pong)
+        return batch
+
+    def _allocate(self, count: int):
+        self.size = np.zeros((count, 2))
+        self.paddle_speed_ratio = np.zeros(count)
+        self.time = np.zeros(count)
+        self.updates = np.zeros(count, dtype=np.int64)
+        self.ball_position = np.zeros((count, 2))
+        self.ball_speed = np.zeros((count, 2))
+        self.ball_size = np.zeros((count, 2))
+        self.paddle_position = np.zeros((count, len(SIDES), 2))
+        self.paddle_speed = np.zeros((count, len(SIDES), 2))
+        self.paddle_size = np.zeros((count, len(SIDES), 2))
+        self.paddle_mask = np.zeros((count, len(SIDES)), dtype=bool)
+
+    def _load(self, index: int, pong: Pong):
+        assert len(pong.balls) == 1, "Only single-ball matches can be batched"
+        self.size[index] = pong.size
+        self.paddle_speed_ratio[index] = pong.config.paddle_speed_ratio
+        self.time[index] = pong.time
+        self.updates[index] = pong.updates
+        self.ball_position[index] = pong.ball.position
+        self.ball_speed[index] = pong.ball.speed
+        self.ball_size[index] = pong.ball.size
+        self.paddle_mask[index] = False
+        for paddle in pong.paddles:
+            slot = SIDES.index(paddle.side)
+            self.paddle_position[index, slot] = paddle.position
+            self.paddle_speed[index, slot] = paddle.speed
+            self.paddle_size[index, slot] = paddle.size
+            self.paddle_mask[index, slot] = True
+
+    def __len__(self):
+        return len(self.size)
+
+    def to_pong(self, index: int, config: Optional[Config] = None) -> Pong:
+        '''
+        Exports the state of the `index`-th match into a new `Pong` instance.
+        '''
+        pong = Pong(self.size[index].tolist(), config, paddles=[])
+        pong.ball = Ball(
+            self.ball_size[index].tolist(),
+            self.ball_position[index].tolist(),
+            self.ball_speed[index].tolist()
+        )
+        pong.paddles = [
+            Paddle(
+                self.paddle_size[index, slot].tolist(),
+                side,
+                self.paddle_position[index, slot].tolist(),
+                self.paddle_speed[index, slot].tolist()
+            )
+            for slot, side in enumerate(SIDES) if self.paddle_mask[index, slot]
+        ]
+        pong.time = float(self.time[index])
+        pong.updates = int(self.updates[index])
+        return pong
+
+    def update(self, delta_time: float | np.ndarray):
+        delta_time = np.broadcast_to(np.asarray(delta_time, dtype=float), self.time.shape)
+        self.updates += 1
+        self.time += delta_time
+        self.ball_position += self.ball_speed * delta_time[:, None]
+        self.paddle_position += self.paddle_speed * delta_time[:, None, None]
+        for slot in range(len(SIDES)):
+            self._handle_paddle_collisions(slot)
+        self._handle_border_collisions(self.ball_position, self.ball_speed, self.ball_size / 2, self.size)
+        self._handle_border_collisions(self.paddle_position, self.paddle_speed, self.paddle_size / 2,
+                                       self.size[:, None], self.paddle_mask)
+
+    def _handle_paddle_collisions(self, slot: int):
+        '''Bounces balls off the paddle in `slot`, in the matches where it exists and touches the ball.'''
+        matches = np.flatnonzero(self.paddle_mask[:, slot])
+        if matches.size == 0:
+            return
+        ball = _box(self.ball_position[matches], self.ball_size[matches])
+        paddle = _box(self.paddle_position[matches, slot], self.paddle_size[matches, slot])
+        touching = (ball[:, 0] <= paddle[:, 2]) & (ball[:, 2] >= paddle[:, 0]) & \
+            (ball[:, 1] <= paddle[:, 3]) & (ball[:, 3] >= paddle[:, 1])
+        if not touching.any():
+            return
+        matches = matches[touching]
+        dx, dy, flip_x, flip_y, invalid = hits(ball[touching], paddle[touching])
+        if invalid.any():
+            raise ValueError(f"Invalid collision in matches {matches[invalid].tolist()}, this is likely a bug")
+        self.ball_position[matches] += np.stack((dx, dy), axis=-1)
+        speed = self.ball_speed[matches]
+        speed[flip_x, 0] *= -1
+        speed[flip_y, 1] *= -1
+        self.ball_speed[matches] = speed
+
+    @staticmethod
+    def _handle_border_collisions(position: np.ndarray, speed: np.ndarray, half_size: np.ndarray,
+                                  size: np.ndarray, active: Optional[np.ndarray] = None):
+        '''
+        Bounces objects off the borders they cross, in place, as `Pong._handle_border_collisions` does:
+        for each border, the overlap is `sign * (bound - limit)`, where bounds are recomputed after each bounce.
+        '''
+        for direction, index, sign in HALF_PLANES:
+            axis = index % 2
+            coordinate = position[..., axis]
+            bound = coordinate + sign * half_size[..., axis]
+            overlap = sign * (bound - size[..., axis]) if sign > 0 else sign * bound
+            crossing = overlap > 0.0
+            if active is not None:
+                crossing &= active
+            if crossing.any():
+                coordinate -= np.where(crossing, direction.value[axis] * overlap, 0.0)
+                speed[..., axis] = np.where(crossing, -speed[..., axis], speed[..., axis])
+
+    def move_paddle(self, paddle: Direction, direction: Direction, matches=None):
+        '''
+        Sets the speed of the paddle on side `paddle` in the selected matches (all of them by default),
+        as `Pong.move_paddle` does.
+        '''
+        slot = SIDES.index(paddle)
+        selected = np.zeros(len(self), dtype=bool)
+        selected[slice(None) if matches is None else matches] = True
+        if not self.paddle_mask[selected, slot].all():
+            raise KeyError("No such a paddle: " + str(paddle))
+        if paddle.is_horizontal and direction.is_vertical:
+            extent = self.size[selected, 1]
+        elif paddle.is_vertical and direction.is_horizontal:
+            extent = self.size[selected, 0]
+        elif direction == Direction.NONE:
+            extent = np.zeros(selected.sum())
+        else:
+            return
+        unit = np.array(direction.value)
+        self.paddle_speed[selected, slot] = unit * (extent * self.paddle_speed_ratio[selected])[:, None]
+
+    def stop_paddle(self, paddle: Direction, matches=None):
+        self.move_paddle(paddle, Direction.NONE, matches)
+
+    def predict_intercept(self, side: Direction):
+        '''
+        Vectorized counterpart of `Pong.predict_intercept`, for all matches at once.
+
+        Returns a tuple `(delay, position, bounces)` of arrays shaped `(N,)`, `(N, 2)` and `(N,)`:
+        `delay` is `inf` (and `position` is NaN) in matches where the ball never reaches the plane.
+        '''
+        axis = 0 if side.is_horizontal else 1
+        other = 1 - axis
+        towards = side.value[axis]
+        slot = SIDES.index(side)
+        paddle = _box(self.paddle_position[:, slot], self.paddle_size[:, slot])
+        face = paddle[:, axis + 2] if towards < 0 else paddle[:, axis]
+        edge: float | np.ndarray = 0.0 if towards < 0 else self.size[:, axis]
+        plane = np.where(self.paddle_mask[:, slot], face, edge)
+        half = self.ball_size / 2
+        position, speed = self.ball_position, self.ball_speed
+        target = plane - towards * half[:, axis]
+        approaching = speed[:, axis] * towards > 0
+        far = half[:, axis] if towards > 0 else self.size[:, axis] - half[:, axis]
+        distance = np.where(
+            approaching,
+            np.abs(target - position[:, axis]),
+            np.abs(far - position[:, axis]) + np.abs(far - target)
+        )
+        valid = (speed[:, axis] != 0) & ((target - position[:, axis]) * towards >= 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delay = np.where(valid, distance / np.abs(speed[:, axis]), np.inf)
+            low, high = half[:, other], self.size[:, other] - half[:, other]
+            span = high - low
+            unfolded = position[:, other] + speed[:, other] * np.where(valid, delay, 0.0) - low
+            reflections = np.floor(unfolded / span)
+            offset = unfolded - reflections * span
+            offset = np.where(reflections % 2 == 1, span - offset, offset)
+        result = np.full((len(self), 2), np.nan)
+        result[:, axis] = np.where(valid, target, np.nan)
+        result[:, other] = np.where(valid, low + offset, np.nan)
+        bounces = np.where(valid, np.abs(reflections) + ~approaching, 0).astype(np.int64)
+        return delay, result, bounces
@@ -0,0 +1,166 @@
+import math
+from dataclasses import dataclass
+
+from dpongpy.model import GameObject, Pong, Paddle, Direction
+from dpongpy import trace
+
+
+TOLERANCE = 1e-9
+'''Impacts this much in the past (in seconds) are still considered, to absorb rounding errors.'''
+
+MAX_IMPACTS_PER_UPDATE = 1000
+'''Upper bound to the amount of impacts resolved in a single update, to prevent endless bouncing.'''
+
+
+def _axis_entry_exit(low, high, other_low, other_high, speed):
+    if speed > 0:
+        return (other_low - high) / speed, (other_high - low) / speed
+    elif speed < 0:
+        return (other_high - low) / speed, (other_low - high) / speed
+    elif high < other_low or low > other_high:
+        return math.inf, -math.inf
+    return -math.inf, math.inf
+
+
+def time_of_impact(bounds, speed, other_bounds, other_speed) -> tuple[float, bool, bool] | None:
+    """
+    Computes when two boxes, moving linearly with the given speeds, will start touching.
+
+    Bounds are `(left, top, right, bottom)` tuples, speeds are `(x, y)` pairs.
+    Returns a tuple `(time, horizontal, vertical)` where `horizontal` (resp. `vertical`) tells whether
+    the boxes touch along the horizontal (resp. vertical) axis, or `None` if they never will.
+    """
+    left, top, right, bottom = bounds
+    other_left, other_top, other_right, other_bottom = other_bounds
+    speed_x, speed_y = speed[0] - other_speed[0], speed[1] - other_speed[1]
+    entry_x, exit_x = _axis_entry_exit(left, right, other_left, other_right, speed_x)
+    entry_y, exit_y = _axis_entry_exit(top, bottom, other_top, other_bottom, speed_y)
+    entry, exit = max(entry_x, entry_y), min(exit_x, exit_y)
+    if entry > exit or exit <= 0 or entry < -TOLERANCE or math.isinf(entry):
+        return None
+    return max(entry, 0.0), entry_x == entry, entry_y == entry
+
+
+@dataclass(frozen=True)
+class Impact:
+    time: float
+    subject: GameObject
+    obstacle: GameObject
+    horizontal: bool
+    vertical: bool
+
+
+class EventDrivenPong(Pong):
+    """
+    A `Pong` whose `update` advances from one impact to the next, rather than stepping by `delta_time`
+    and then resolving overlaps.
+
+    The exact time of the next impact (of balls against paddles and borders, and of paddles against
+    borders) is computed analytically given the current speeds, and cached until something changes a speed
+    in a way which is not an impact: moving paddles, resetting the ball, adding/removing paddles, or
+    overriding the state. So, arbitrarily large `delta_time`s cannot make the ball tunnel through paddles.
+    Code mutating game objects directly should call `replan` afterwards.
+    Balls do not hit each other in this mode.
+    """
+
+    def __init__(self, size, config=None, paddles=None, random=None, balls: int = 1):
+        self._impact: Impact | None = None
+        super().__init__(size, config, paddles, random, balls)
+
+    def replan(self):
+        self._impact = None
+
+    @property
+    def next_impact(self) -> Impact | None:
+        if self._impact is None:
+            self._impact = self._plan()
+        return self._impact
+
+    def _plan(self) -> Impact | None:
+        borders = self.table.borders.values()
+        pairs: list[tuple[GameObject, GameObject]] = []
+        pairs += [(ball, obstacle) for ball in self.balls for obstacle in self.paddles + list(borders)]
+        pairs += [(paddle, border) for paddle in self.paddles for border in borders]
+        result = None
+        for subject, obstacle in pairs:
+            impact = time_of_impact(subject.bounds, subject._speed, obstacle.bounds, obstacle._speed)
+            if impact is not None and (result is None or impact[0] < result[0]):
+                result = impact + (subject, obstacle)
+        if result is None:
+            return None
+        delay, horizontal, vertical, subject, obstacle = result
+        return Impact(self.time + delay, subject, obstacle, horizontal, vertical)
+
+    def _advance(self, delta_time: float):
+        for ball in self.balls:
+            ball.update(delta_time)
+        for paddle in self.paddles:
+            paddle.update(delta_time)
+        self.time += delta_time
+
+    def _resolve(self, impact: Impact):
+        impact.subject._own()
+        speed, obstacle_speed = impact.subject._speed, impact.obstacle._speed
+        if impact.horizontal:
+            speed.x = 2 * obstacle_speed.x - speed.x
+        if impact.vertical:
+            speed.y = 2 * obstacle_speed.y - speed.y
+        if trace.COLLISION.enabled:
+            trace.COLLISION.record("%s hits %s at time %s", impact.subject.name, impact.obstacle.name, impact.time)
+
+    def update(self, delta_time: float):
+        self.updates += 1
+        end = self.time + delta_time
+        for _ in range(MAX_IMPACTS_PER_UPDATE):
+            impact = self.next_impact
+            if impact is None or impact.time > end:
+                break
+            self._advance(max(impact.time - self.time, 0.0))
+            self._resolve(impact)
+            self.replan()
+        self._advance(max(end - self.time, 0.0))
+        self.time = end
+        if trace.MODEL.enabled:
+            trace.MODEL.record("Update %d (time: %s)", self.updates, self.time)
+
+    def reset_ball(self, speed=None):
+        super().reset_ball(speed)
+        self.replan()
+
+    def add_ball(self, speed=None, position=None):
+        ball = super().add_ball(speed, position)
+        self.replan()
+        return ball
+
+    def remove_ball(self, ball):
+        super().remove_ball(ball)
+        self.replan()
+
+    def add_paddle(self, side: Direction, paddle=None):
+        super().add_paddle(side, paddle)
+        self.replan()
+
+    def remove_paddle(self, side: Direction):
+        super().remove_paddle(side)
+        self.replan()
+
+    def move_paddle(self, paddle, direction: Direction):
+        super().move_paddle(paddle, direction)
+        self.replan()
+
+    def restore(self, snapshot):
+        super().restore(snapshot)
+        self.replan()
+
+    def apply(self, diff):
+        super().apply(diff)
+        self.replan()
+
+    @property
+    def paddles(self) -> list[Paddle]:
+        return super().paddles
+
+    @paddles.setter
+    def paddles(self, paddles):
+        Pong.paddles.fset(self, paddles)
+        self.replan()
@@ -0,0 +1,106 @@
+import math
+import struct
+import zlib
+from random import Random
+
+from pygame.math import Vector2
+
+from dpongpy.model import Pong, Ball, Paddle, Direction
+
+
+RESOLUTION_BITS = 8
+'''Positions, speeds and sizes are multiples of 2 ** -RESOLUTION_BITS pixels (per second).'''
+
+DEFAULT_FPS = 64
+'''Physics rate used when none is given: it must be a power of two, for the step to be exactly representable.'''
+
+_DIRECTION_RANGE = 1 << 10
+
+
+def quantize(value: float, bits: int = RESOLUTION_BITS) -> float:
+    '''
+    Rounds `value` to the nearest multiple of 2 ** -bits (ties towards +inf).
+    Only exact floating point operations are involved, so the result is the same on any platform.
+    '''
+    scale = 1 << bits
+    return math.floor(value * scale + 0.5) / scale
+
+
+def quantize_vector(vector: Vector2, bits: int = RESOLUTION_BITS) -> Vector2:
+    return Vector2(quantize(vector.x, bits), quantize(vector.y, bits))
+
+
+def is_dyadic(value: float, bits: int = 16) -> bool:
+    '''
+    Tells whether `value` is an integer divided by a power of two not greater than 2 ** bits.
+    (Any finite float is dyadic, strictly speaking: this rules out the ones approximating, say, 1/60.)
+    '''
+    denominator = value.as_integer_ratio()[1]
+    return denominator & (denominator - 1) == 0 and denominator <= 1 << bits
+
+
+class LockstepPong(Pong):
+    """
+    A `Pong` whose evolution only depends on its seed and on the sequence of paddle moves,
+    bit by bit, on every platform: peers fed with the same inputs compute the same state.
+
+    To this end:
+    - `update` only accepts a fixed `step`, which must be a power-of-two fraction of a second;
+    - positions, speeds and sizes are kept on a grid of 2 ** -`RESOLUTION_BITS` pixels, so that all
+      the arithmetic performed by `update` (sums, products by the step, halvings) is exact;
+    - balls are served via integer draws, square roots and divisions (which IEEE 754 rounds exactly),
+      rather than via `Vector2.from_polar` (which relies on the platform's trigonometric functions);
+    - the random generator is always seeded explicitly, and can be re-seeded via `reseed`.
+    """
+
+    def __init__(self, size, config=None, paddles=None, random=None, balls: int = 1, seed: int = 0,
+                 step: float = 1 / DEFAULT_FPS):
+        if step <= 0 or not is_dyadic(step):
+            raise ValueError(f"Lockstep physics requires a power-of-two fraction of a second as step, got {step}")
+        self.step = step
+        super().__init__(quantize_vector(Vector2(size)), config, paddles, random or Random(seed), balls)
+
+    def _ball_size(self) -> Vector2:
+        return quantize_vector(super()._ball_size())
+
+    def _serve(self, ball: Ball, speed: Vector2 | None = None):
+        if speed is None:
+            self._random_state = None
+            while True:
+                x = self.random.randint(-_DIRECTION_RANGE, _DIRECTION_RANGE)
+                y = self.random.randint(-_DIRECTION_RANGE, _DIRECTION_RANGE)
+                norm = x * x + y * y
+                if 0 < norm <= _DIRECTION_RANGE * _DIRECTION_RANGE:
+                    break
+            modulus = min(*self.size) * self.config.ball_speed_ratio / math.sqrt(norm)
+            speed = Vector2(x * modulus, y * modulus)
+        ball.speed = quantize_vector(Vector2(speed))
+        ball.position = quantize_vector(ball.position)
+
+    def add_paddle(self, side: Direction, paddle: Paddle | None = None):
+        super().add_paddle(side, paddle)
+        paddle = self.paddle(side)
+        paddle.size = quantize_vector(paddle.size)
+        paddle.position = quantize_vector(paddle.position)
+        paddle.speed = quantize_vector(paddle.speed)
+
+    def move_paddle(self, paddle: int | Direction, direction: Direction):
+        super().move_paddle(paddle, direction)
+        for selected in self._paddles.values():
+            selected.speed = quantize_vector(selected.speed)
+
+    def update(self, delta_time: float | None = None):
+        if delta_time is not None and delta_time != self.step:
+            raise ValueError(f"Lockstep physics only advances by {self.step}s, got {delta_time}s")
+        super().update(self.step)
+        for obj in self.balls + self.paddles:
+            obj.position = quantize_vector(obj.position)
+
+    def checksum(self) -> int:
+        '''
+        A CRC-32 of the dynamic state, which peers can exchange to detect desynchronisation.
+        '''
+        snapshot = self.snapshot()
+        sides = bytes(list(Direction).index(side) for side in snapshot.sides)
+        state = struct.pack(f'<qd{len(snapshot.state)}d', snapshot.updates, snapshot.time, *snapshot.state)
+        return zlib.crc32(state, zlib.crc32(sides))
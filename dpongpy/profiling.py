@@ -0,0 +1,137 @@
+"""
+Per-phase timing of `Pong.update`.
+
+Profiling is off unless a `PhaseProfiler` is installed, either on a single model (`pong.profiler = ...`)
+or on all of them (`install()`, or the `--profile` command line option of any role):
+
+    from dpongpy import profiling
+    profiler = profiling.install()
+    ...
+    print(profiler.report())
+
+When no profiler is installed, `Pong.update` only pays for one attribute lookup.
+"""
+
+import json
+import math
+from typing import Optional
+from dpongpy.log import logger
+
+
+BALL_INTEGRATION = "ball_integration"
+PADDLE_INTEGRATION = "paddle_integration"
+BALL_COLLISIONS = "ball_collisions"
+PADDLE_COLLISIONS = "paddle_border_collisions"
+UPDATE = "update"
+
+PHASES = (BALL_INTEGRATION, PADDLE_INTEGRATION, BALL_COLLISIONS, PADDLE_COLLISIONS, UPDATE)
+
+BUCKETS = 32
+'''Histogram buckets: the i-th one counts durations in [2 ** (i - 1), 2 ** i) microseconds (the 0-th, below 1us).'''
+
+
+class PhaseStats:
+    __slots__ = ('calls', 'total', 'min', 'max', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.histogram = [0] * BUCKETS
+
+    def record(self, seconds: float):
+        self.calls += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        '''
+        An upper bound (in seconds) to the given percentile of durations, with the resolution of the histogram.
+        '''
+        threshold = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= threshold:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.min if self.calls else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "histogram_us": {f"<{1 << bucket}": count for bucket, count in enumerate(self.histogram) if count},
+        }
+
+
+class PhaseProfiler:
+    def __init__(self):
+        self.phases: dict[str, PhaseStats] = {phase: PhaseStats() for phase in PHASES}
+
+    def record(self, phase: str, seconds: float):
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = PhaseStats()
+        stats.record(seconds)
+
+    def reset(self):
+        self.phases = {phase: PhaseStats() for phase in PHASES}
+
+    def to_dict(self) -> dict:
+        return {phase: stats.to_dict() for phase, stats in self.phases.items()}
+
+    def report(self) -> str:
+        header = f"{'phase':<26}{'calls':>10}{'total ms':>12}{'mean us':>10}{'min us':>10}{'max us':>10}" \
+                 f"{'p50 us':>10}{'p99 us':>10}"
+        lines = [header]
+        for phase, stats in self.phases.items():
+            if not stats.calls:
+                continue
+            lines.append(f"{phase:<26}{stats.calls:>10}{stats.total * 1e3:>12.2f}{stats.mean * 1e6:>10.2f}"
+                         f"{stats.min * 1e6:>10.2f}{stats.max * 1e6:>10.2f}"
+                         f"{stats.percentile(0.5) * 1e6:>10.1f}{stats.percentile(0.99) * 1e6:>10.1f}")
+        return "\n".join(lines)
+
+    def dump(self, file):
+        '''Exports the breakdown as JSON into `file`, a path or a writable text file.'''
+        if isinstance(file, str):
+            with open(file, "w") as f:
+                return self.dump(f)
+        json.dump(self.to_dict(), file, indent=2)
+
+
+PROFILER = PhaseProfiler()
+
+
+def install(profiler: Optional[PhaseProfiler] = None) -> PhaseProfiler:
+    '''Installs `profiler` (the global one, by default) on all `Pong` instances, which do not have their own.'''
+    from dpongpy.model import Pong
+    Pong.profiler = profiler or PROFILER
+    return Pong.profiler
+
+
+def uninstall():
+    from dpongpy.model import Pong
+    Pong.profiler = None
+
+
+def shutdown_report(file: Optional[str] = None, profiler: Optional[PhaseProfiler] = None):
+    '''Logs the breakdown, and exports it into `file` if given: meant to be registered via `atexit`.'''
+    profiler = profiler or PROFILER
+    logger.info("Pong.update phases breakdown:\n%s", profiler.report())
+    if file:
+        profiler.dump(file)
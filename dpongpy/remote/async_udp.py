@@ -0,0 +1,85 @@
+'''
+UDP coordinator and terminal running on a single asyncio event loop (see `dpongpy.remote.comm.udp.async_udp`):
+datagrams are received and decoded by the loop in between game ticks, and the game loop itself is a coroutine,
+which sleeps until the next tick instead of blocking in `clock.tick`. Hence, no receiving thread,
+and no hand-off between threads.
+'''
+
+import asyncio
+import threading
+from dpongpy.remote import Address
+from dpongpy.remote.centralised import DEFAULT_HOST, DEFAULT_PORT
+from dpongpy.remote.centralised.ipong_coordinator import IRemotePongCoordinator
+from dpongpy.remote.centralised.ipong_terminal import IRemotePongTerminal
+
+
+class AsyncioPongGame:
+    '''
+    Mixin running the game loop of `PongGame` as a coroutine on `self.event_loop`, which `initialize` must create.
+    Failures of the callbacks of the loop (e.g. while handling a datagram) stop the game, and are raised by `run`.
+    '''
+
+    def run(self):
+        game = self.event_loop.create_task(self.run_async())
+        try:
+            self.event_loop.run_until_complete(game)
+        except KeyboardInterrupt:
+            if not game.done():  # i.e. interrupted while the loop was waiting, rather than within the game loop
+                self.stop()  # the game loop ends, and cleans up, as soon as it gets control back
+                self.event_loop.run_until_complete(game)
+            raise
+        finally:
+            self.event_loop.run_until_complete(asyncio.sleep(0))  # lets closed transports release their sockets
+            self.event_loop.close()
+
+    async def run_async(self):
+        loop = asyncio.get_running_loop()
+        try:
+            self.dt = 0
+            self._accumulator = 0.0
+            self.before_run()
+            last = deadline = loop.time()
+            while self.running:
+                interpolation = self.simulate(self.dt)
+                self.view.render(interpolation)
+                self.at_each_run()
+                deadline = max(deadline + 1 / self.settings.fps, loop.time())
+                await asyncio.sleep(deadline - loop.time())  # datagrams are handled meanwhile
+                now = loop.time()
+                self.dt, last = now - last, now
+        finally:
+            self.after_run()
+        if self._failure is not None:
+            raise self._failure
+
+    def _callback(self, handler):
+        '''Wraps a handler of the event loop, so that its failures stop the game.'''
+        self._failure = None
+
+        def callback(*args):
+            try:
+                handler(*args)
+            except Exception as e:
+                self.running = False
+                self._failure = e
+
+        return callback
+
+
+class AsyncUdpPongCoordinator(AsyncioPongGame, IRemotePongCoordinator):
+    def initialize(self):
+        from dpongpy.remote.comm.udp.async_udp import Server as AsyncUDPServer
+        self._peers = set()
+        self._lock = threading.RLock()
+        self.event_loop = asyncio.new_event_loop()
+        self.server = self.event_loop.run_until_complete(
+            AsyncUDPServer.open(self._callback(self.on_payload), self.settings.port or DEFAULT_PORT))
+
+
+class AsyncUdpPongTerminal(AsyncioPongGame, IRemotePongTerminal):
+    def initialize(self):
+        from dpongpy.remote.comm.udp.async_udp import Client as AsyncUDPClient
+        address = Address(self.settings.host or DEFAULT_HOST, self.settings.port or DEFAULT_PORT)
+        self.event_loop = asyncio.new_event_loop()
+        self.client = self.event_loop.run_until_complete(
+            AsyncUDPClient.open(self._callback(self.on_payload), address))
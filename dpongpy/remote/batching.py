@@ -0,0 +1,81 @@
+"""
+Batching of outgoing messages: rather than one datagram (or frame) per event, the events produced within one tick
+are queued, and flushed once per tick packed into envelopes (see `presentation.envelope`), which receivers unpack
+in order (see `presentation.decode_events`).
+
+Envelopes never exceed `MAX_PAYLOAD` bytes (before compression, which never makes payloads longer), and a lone
+message is sent as it is. Coordinators only pack messages towards peers which support envelopes (see
+`negotiation.Format.batched`), and compress each packed payload once per format.
+
+Terminals cannot tell which coordinators support envelopes, hence coordinators announce it: the first flush towards
+a peer which just joined is an envelope, even if it carries a single message. Terminals only pack their own messages
+once they received an envelope.
+"""
+
+from typing import Hashable, Iterable, Iterator
+from dpongpy.remote.comm.udp.udp import THRESHOLD_DGRAM_SIZE
+from dpongpy.remote.negotiation import PeerFormats
+from dpongpy.remote.presentation import envelope, envelope_overhead
+
+
+MAX_PAYLOAD = THRESHOLD_DGRAM_SIZE
+'''Bytes of the largest envelope: the largest UDP datagram dpongpy sends.'''
+
+
+def pack(payloads: Iterable[str | bytes], codec: str, limit: int = MAX_PAYLOAD,
+         wrap: bool = False) -> list[str | bytes]:
+    '''
+    Groups payloads (encoded with `codec`) into as few envelopes of at most `limit` bytes as possible, in order.
+    Groups of one message are not wrapped (unless `wrap`), nor are messages which would not fit in any envelope.
+    '''
+    once, each = envelope_overhead(codec)
+    batches: list[list[str | bytes]] = []
+    batch: list[str | bytes] = []
+    size = once
+    for payload in payloads:
+        length = len(payload) + each  # JSON payloads are ASCII, hence as many bytes as characters
+        if batch and size + length > limit:
+            batches.append(batch)
+            batch, size = [], once
+        batch.append(payload)
+        size += length
+    if batch:
+        batches.append(batch)
+    return [envelope(batch, codec) if len(batch) > 1 or wrap and once + len(batch[0]) + each <= limit else batch[0]
+            for batch in batches]
+
+
+class Outbox:
+    """Coordinator side of batching: queues messages for groups of peers, until the end of the tick."""
+
+    def __init__(self, formats: PeerFormats, limit: int = MAX_PAYLOAD):
+        self.formats = formats
+        self.limit = limit
+        self._pending: dict[Hashable, list[str | bytes]] = {}
+        self._announced: set[Hashable] = set()
+
+    def announce(self, peer: Hashable):
+        '''Makes the next flush towards `peer` an envelope, so that it learns envelopes are supported.'''
+        self._announced.add(peer)
+
+    def put(self, message, peers: Iterable[Hashable]):
+        for peer, payload in self.formats.encoded(message, peers):
+            self._pending.setdefault(peer, []).append(payload)
+
+    def flush(self) -> Iterator[tuple[Hashable, str | bytes]]:
+        '''
+        Yields the payloads to send to each peer, emptying the outbox.
+        Peers of the same format which got the same messages share the same payloads, packed and compressed once.
+        '''
+        pending, self._pending = self._pending, {}
+        flushed: dict[tuple, list[str | bytes]] = {}
+        for peer, payloads in pending.items():
+            format = self.formats.format_of(peer)
+            wrap = peer in self._announced
+            self._announced.discard(peer)
+            key = (format, wrap, tuple(map(id, payloads)))  # encodings are shared by peers of the same codec
+            if key not in flushed:
+                batches = pack(payloads, format.codec, self.limit, wrap) if format.batched else payloads
+                flushed[key] = [self.formats.compress(format, payload) for payload in batches]
+            for payload in flushed[key]:
+                yield peer, payload
@@ -0,0 +1,455 @@
+"""
+Compact binary codec for control events and `Pong` status, alternative to the JSON one in `presentation`.
+
+Every message starts with a 3-bytes header: a magic byte (which can never start a UTF-8 text, hence
+a JSON message), the codec version, and the message kind. Then, each kind has a fixed, struct-packed layout:
+
+- `KIND_EVENT`: the index of the `ControlEvent` (in `CONTROL_EVENTS` order), followed by the fields of
+  that event, in the order listed by `EVENT_LAYOUTS` (optional fields are preceded by a presence flag);
+- `KIND_PONG`: a `Pong` status, i.e. size, config, time, updates, quantization bits (0 for none), then balls and
+  paddles (position, speed, size each; paddles are prefixed by their side);
+- `PongDiff`s (only found in events) start with a bit mask of the scalar fields they carry, then list the changed
+  balls (by index) and paddles (by side), each one with a bit mask of its changed vectors, then added and removed ones;
+- `KIND_JSON`: anything else (e.g. events with unexpected fields), as UTF-8 JSON produced by `presentation`;
+- `KIND_BATCH`: an envelope of other binary messages (see `envelope`), each one prefixed by its length.
+
+Positions and speeds are either doubles or, if the encoder is given a `Quantization`, fixed-point integers
+(of 1, 2 or 4 bytes, depending on bits) relative to the table size. Sizes are always doubles.
+Game objects' names are not transmitted: decoded objects get their default names.
+"""
+
+import struct
+from functools import lru_cache
+from typing import Optional, Sequence, TypeGuard
+from pygame.event import Event
+from dpongpy.model import Pong, PongDiff, GameObject, Paddle, Ball, Config, Direction, Snapshot, Vector2
+from dpongpy.controller import ControlEvent
+from dpongpy.remote.presentation import Quantization, serialize, deserialize, DEFAULT_DESERIALIZER, \
+    SNAPSHOT_DESERIALIZER
+
+
+MAGIC = 0xF7
+VERSION = 4
+
+KIND_EVENT = 1
+KIND_PONG = 2
+KIND_JSON = 3
+KIND_BATCH = 4
+
+CONTROL_EVENTS = (
+    ControlEvent.PLAYER_JOIN,
+    ControlEvent.PLAYER_LEAVE,
+    ControlEvent.GAME_START,
+    ControlEvent.GAME_OVER,
+    ControlEvent.PADDLE_MOVE,
+    ControlEvent.TIME_ELAPSED,
+    ControlEvent.STATE_ACK,
+)
+DIRECTIONS = Direction.values()
+
+# field name -> (value type, optional?), in encoding order
+EVENT_LAYOUTS: dict[ControlEvent, tuple[tuple[str, str, bool], ...]] = {
+    ControlEvent.PLAYER_JOIN: (("paddle_index", "direction", False),),
+    ControlEvent.PLAYER_LEAVE: (("paddle_index", "direction", False),),
+    ControlEvent.GAME_START: (("seed", "int", True),),
+    ControlEvent.GAME_OVER: (),
+    ControlEvent.PADDLE_MOVE: (("paddle_index", "direction", False), ("direction", "direction", False)),
+    ControlEvent.TIME_ELAPSED: (
+        ("dt", "float", False),
+        ("status", "pong", True),
+        ("frame", "int", True),
+        ("baseline", "int", True),
+        ("delta", "pongdiff", True),
+    ),
+    ControlEvent.STATE_ACK: (("frame", "int", False),),
+}
+VECTORS = ("position", "speed", "size")
+
+_HEADER = struct.Struct("!BBB")
+_U8 = struct.Struct("!B")
+_I64 = struct.Struct("!q")
+_F64 = struct.Struct("!d")
+_PONG = struct.Struct("!2d6ddqBBB")
+_VECTOR = struct.Struct("!2d")
+_CONFIG = struct.Struct("!6d")
+_CHANGES = struct.Struct("!BB")
+_LENGTH = struct.Struct("!I")
+
+_DIFF_UPDATES, _DIFF_TIME, _DIFF_SIZE, _DIFF_CONFIG, _DIFF_QUANTIZED = 1, 2, 4, 8, 16
+
+_EVENT_INDEX = {event.value: index for index, event in enumerate(CONTROL_EVENTS)}
+_DIRECTION_INDEX = {direction: index for index, direction in enumerate(DIRECTIONS)}
+
+
+def is_binary(payload) -> TypeGuard[bytes]:
+    return isinstance(payload, (bytes, bytearray, memoryview)) and len(payload) > 0 and payload[0] == MAGIC
+
+
+class _Layout:
+    """Structs packing game objects and their changes, with positions and speeds quantized or not."""
+
+    def __init__(self, quantization: Optional[Quantization] = None):
+        self.quantization = quantization
+        self.bits = 0 if quantization is None else quantization.bits
+        code = "d" if quantization is None else "B" if self.bits <= 8 else "H" if self.bits <= 16 else "I"
+        self.ball = struct.Struct(f"!4{code}2d")
+        self.paddle = struct.Struct(f"!B4{code}2d")
+        self.vector = struct.Struct(f"!2{code}")
+
+    def _motion(self, obj: GameObject, size: Vector2) -> tuple:
+        if self.quantization is None:
+            return (*obj._position, *obj._speed)
+        return (*self.quantization.quantize(obj._position, size, Quantization.POSITION_RANGE),
+                *self.quantization.quantize(obj._speed, size, Quantization.SPEED_RANGE))
+
+    def _vectors(self, values: Sequence, size: Vector2) -> tuple[Vector2, Vector2, Vector2]:
+        x, y, speed_x, speed_y, w, h = values
+        if self.quantization is None:
+            return Vector2(x, y), Vector2(speed_x, speed_y), Vector2(w, h)
+        return self.quantization.dequantize((x, y), size, Quantization.POSITION_RANGE), \
+            self.quantization.dequantize((speed_x, speed_y), size, Quantization.SPEED_RANGE), Vector2(w, h)
+
+    def pack_ball(self, ball: Ball, size: Vector2) -> bytes:
+        return self.ball.pack(*self._motion(ball, size), *ball._size)
+
+    def pack_paddle(self, paddle: Paddle, size: Vector2) -> bytes:
+        return self.paddle.pack(_DIRECTION_INDEX[paddle.side], *self._motion(paddle, size), *paddle._size)
+
+    def unpack_state(self, values: tuple, size: Vector2) -> tuple[float, ...]:
+        '''Position, speed and size of an unpacked object, as flat as in `Snapshot.state`.'''
+        if self.quantization is None:
+            return values
+        x, y, speed_x, speed_y, w, h = values
+        return (*self.quantization.dequantize((x, y), size, Quantization.POSITION_RANGE),
+                *self.quantization.dequantize((speed_x, speed_y), size, Quantization.SPEED_RANGE), w, h)
+
+    def unpack_ball(self, payload: memoryview, offset: int, size: Vector2,
+                    name: Optional[str] = None) -> tuple[Ball, int]:
+        position, speed, ball_size = self._vectors(self.ball.unpack_from(payload, offset), size)
+        return Ball(ball_size, position, speed, name), offset + self.ball.size
+
+    def unpack_paddle(self, payload: memoryview, offset: int, size: Vector2) -> tuple[Paddle, int]:
+        side, *values = self.paddle.unpack_from(payload, offset)
+        position, speed, paddle_size = self._vectors(values, size)
+        return Paddle(paddle_size, DIRECTIONS[side], position, speed), offset + self.paddle.size
+
+    def pack_change(self, name: str, value: Vector2, size: Vector2) -> bytes:
+        if self.quantization is None or name == "size":
+            return _VECTOR.pack(*value)
+        range = Quantization.POSITION_RANGE if name == "position" else Quantization.SPEED_RANGE
+        return self.vector.pack(*self.quantization.quantize(value, size, range))
+
+    def unpack_change(self, name: str, payload: memoryview, offset: int, size: Vector2) -> tuple[Vector2, int]:
+        if self.quantization is None or name == "size":
+            return Vector2(_VECTOR.unpack_from(payload, offset)), offset + _VECTOR.size
+        range = Quantization.POSITION_RANGE if name == "position" else Quantization.SPEED_RANGE
+        values = self.vector.unpack_from(payload, offset)
+        return self.quantization.dequantize(values, size, range), offset + self.vector.size
+
+
+@lru_cache(maxsize=None)
+def _layout(bits: int) -> _Layout:
+    return _Layout(Quantization(bits) if bits else None)
+
+
+class BinaryEncoder:
+    def __init__(self, quantization: Optional[Quantization] = None):
+        self._layout = _layout(0 if quantization is None else quantization.bits)
+
+    def encode(self, obj) -> bytes:
+        parts: list[bytes] = []
+        if isinstance(obj, Event) and self._encode_event(obj, parts):
+            return _HEADER.pack(MAGIC, VERSION, KIND_EVENT) + b"".join(parts)
+        elif isinstance(obj, Pong):
+            self._encode_pong(obj, parts)
+            return _HEADER.pack(MAGIC, VERSION, KIND_PONG) + b"".join(parts)
+        return _HEADER.pack(MAGIC, VERSION, KIND_JSON) + serialize(obj).encode()
+
+    def _encode_event(self, event: Event, parts: list) -> bool:
+        '''Appends the encoding of `event` to `parts`, if it fits its fixed layout; returns whether it did.'''
+        index = _EVENT_INDEX.get(event.type)
+        if index is None:
+            return False
+        layout = EVENT_LAYOUTS[CONTROL_EVENTS[index]]
+        data = event.dict
+        if not data.keys() <= {name for name, _, _ in layout}:
+            return False
+        parts.append(_U8.pack(index))
+        for name, kind, optional in layout:
+            if name not in data or data[name] is None:
+                if not optional:
+                    return False
+                parts.append(_U8.pack(0))
+                continue
+            if optional:
+                parts.append(_U8.pack(1))
+            if not self._encode_value(kind, data[name], parts):
+                return False
+        return True
+
+    def _encode_value(self, kind: str, value, parts: list) -> bool:
+        if kind == "direction":
+            if not isinstance(value, Direction):
+                return False
+            parts.append(_U8.pack(_DIRECTION_INDEX[value]))
+        elif kind == "float":
+            if not isinstance(value, (int, float)):
+                return False
+            parts.append(_F64.pack(value))
+        elif kind == "int":
+            if not isinstance(value, int) or not -2 ** 63 <= value < 2 ** 63:
+                return False
+            parts.append(_I64.pack(value))
+        elif kind == "pong":
+            if not isinstance(value, Pong):
+                return False
+            self._encode_pong(value, parts)
+        elif kind == "pongdiff":
+            if not isinstance(value, PongDiff):
+                return False
+            self._encode_pongdiff(value, parts)
+        return True
+
+    def _encode_pong(self, pong: Pong, parts: list):
+        config, layout, size = pong.config, self._layout, pong.size
+        parts.append(_PONG.pack(
+            size.x, size.y,
+            config.paddle_ratio.x, config.paddle_ratio.y, config.ball_ratio, config.ball_speed_ratio,
+            config.paddle_speed_ratio, config.paddle_padding,
+            pong.time, pong.updates, len(pong.balls), len(pong.paddles), layout.bits
+        ))
+        for ball in pong.balls:
+            parts.append(layout.pack_ball(ball, size))
+        for paddle in pong.paddles:
+            parts.append(layout.pack_paddle(paddle, size))
+
+    def _encode_pongdiff(self, diff: PongDiff, parts: list):
+        # changes can only be quantized if the size of the table they refer to is known
+        layout = self._layout if diff.extent is not None else _layout(0)
+        extent = diff.extent if diff.extent is not None else Vector2(1, 1)  # unquantized layouts ignore sizes
+        flags = (diff.updates is not None) * _DIFF_UPDATES | (diff.time is not None) * _DIFF_TIME | \
+            (diff.size is not None) * _DIFF_SIZE | (diff.config is not None) * _DIFF_CONFIG | \
+            (layout.bits > 0) * _DIFF_QUANTIZED
+        parts.append(_U8.pack(flags))
+        if layout.bits:
+            # no need to send the table size: dequantized values are fractions of it, rescaled by `Pong.apply`
+            parts.append(_U8.pack(layout.bits))
+        if diff.updates is not None:
+            parts.append(_I64.pack(diff.updates))
+        if diff.time is not None:
+            parts.append(_F64.pack(diff.time))
+        if diff.size is not None:
+            parts.append(_VECTOR.pack(*diff.size))
+        if diff.config is not None:
+            config = diff.config
+            parts.append(_CONFIG.pack(config.paddle_ratio.x, config.paddle_ratio.y, config.ball_ratio,
+                                      config.ball_speed_ratio, config.paddle_speed_ratio, config.paddle_padding))
+        balls = [(0, diff.ball)] if diff.ball else []
+        balls += diff.balls.items()
+        parts.append(_U8.pack(len(balls)))
+        for index, changes in balls:
+            self._encode_changes(layout, index, changes, extent, parts)
+        parts.append(_U8.pack(len(diff.paddles)))
+        for side, changes in diff.paddles.items():
+            self._encode_changes(layout, _DIRECTION_INDEX[side], changes, extent, parts)
+        parts.append(_U8.pack(len(diff.added_balls)))
+        for ball in diff.added_balls:
+            parts.append(layout.pack_ball(ball, extent))
+        parts.append(_U8.pack(diff.removed_balls))
+        parts.append(_U8.pack(len(diff.added)))
+        for paddle in diff.added:
+            parts.append(layout.pack_paddle(paddle, extent))
+        parts.append(_U8.pack(len(diff.removed)))
+        for side in diff.removed:
+            parts.append(_U8.pack(_DIRECTION_INDEX[side]))
+
+    def _encode_changes(self, layout: _Layout, key: int, changes: dict[str, Vector2], size: Vector2, parts: list):
+        mask = 0
+        for bit, name in enumerate(VECTORS):
+            if name in changes:
+                mask |= 1 << bit
+        parts.append(_CHANGES.pack(key, mask))
+        for name in VECTORS:
+            if name in changes:
+                parts.append(layout.pack_change(name, changes[name], size))
+
+
+class BinaryDecoder:
+    def __init__(self, snapshots: bool = False):
+        # whether `Pong`s are decoded as `Snapshot`s, as by `Deserializer(snapshots=True)`
+        self.snapshots = snapshots
+        self._deserializer = SNAPSHOT_DESERIALIZER if snapshots else DEFAULT_DESERIALIZER
+
+    def decode(self, payload: bytes):
+        payload = memoryview(payload)
+        magic, version, kind = _HEADER.unpack_from(payload)
+        if magic != MAGIC:
+            raise ValueError("Not a binary dpongpy message")
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary codec version: {version}")
+        offset = _HEADER.size
+        if kind == KIND_EVENT:
+            return self._decode_event(payload, offset)[0]
+        elif kind == KIND_PONG:
+            return self._decode_pong(payload, offset)[0]
+        elif kind == KIND_JSON:
+            return deserialize(bytes(payload[offset:]), self._deserializer)
+        elif kind == KIND_BATCH:
+            return self._decode_batch(payload, offset)
+        raise ValueError(f"Unknown binary message kind: {kind}")
+
+    def _decode_batch(self, payload: memoryview, offset: int) -> list:
+        messages = []
+        while offset < len(payload):
+            (length,), offset = _LENGTH.unpack_from(payload, offset), offset + _LENGTH.size
+            messages.append(self.decode(payload[offset:offset + length]))
+            offset += length
+        return messages
+
+    def _decode_event(self, payload: memoryview, offset: int) -> tuple[Event, int]:
+        (index,), offset = _U8.unpack_from(payload, offset), offset + _U8.size
+        control_event = CONTROL_EVENTS[index]
+        data = {}
+        for name, kind, optional in EVENT_LAYOUTS[control_event]:
+            if optional:
+                (present,), offset = _U8.unpack_from(payload, offset), offset + _U8.size
+                if not present:
+                    continue
+            data[name], offset = self._decode_value(kind, payload, offset)
+        return Event(control_event.value, data), offset
+
+    def _decode_value(self, kind: str, payload: memoryview, offset: int):
+        if kind == "direction":
+            return DIRECTIONS[payload[offset]], offset + 1
+        elif kind == "float":
+            return _F64.unpack_from(payload, offset)[0], offset + _F64.size
+        elif kind == "int":
+            return _I64.unpack_from(payload, offset)[0], offset + _I64.size
+        elif kind == "pong":
+            return self._decode_pong(payload, offset)
+        elif kind == "pongdiff":
+            return self._decode_pongdiff(payload, offset)
+        raise ValueError(f"Unknown field kind: {kind}")
+
+    def _decode_pong(self, payload: memoryview, offset: int) -> tuple[Pong | Snapshot, int]:
+        width, height, prx, pry, ball_ratio, ball_speed_ratio, paddle_speed_ratio, paddle_padding, \
+            time, updates, balls, paddles, bits = _PONG.unpack_from(payload, offset)
+        offset += _PONG.size
+        config = Config(Vector2(prx, pry), ball_ratio, ball_speed_ratio, paddle_speed_ratio, paddle_padding)
+        if self.snapshots:
+            return self._decode_snapshot(payload, offset, Vector2(width, height), config, time, updates,
+                                         balls, paddles, bits)
+        pong = Pong((width, height), config, paddles=[])
+        layout, size = _layout(bits), pong.size
+        pong.balls = []
+        for index in range(balls):
+            ball, offset = layout.unpack_ball(payload, offset, size, Pong.ball_name(index))
+            pong.balls.append(ball)
+        sides = []
+        for _ in range(paddles):
+            paddle, offset = layout.unpack_paddle(payload, offset, size)
+            sides.append(paddle)
+        pong.paddles = sides
+        pong.time = time
+        pong.updates = updates
+        return pong, offset
+
+    def _decode_snapshot(self, payload: memoryview, offset: int, size: Vector2, config: Config, time: float,
+                         updates: int, balls: int, paddles: int, bits: int) -> tuple[Snapshot, int]:
+        layout = _layout(bits)
+        state: tuple[float, ...] = ()
+        for _ in range(balls):
+            state += layout.unpack_state(layout.ball.unpack_from(payload, offset), size)
+            offset += layout.ball.size
+        sides = []
+        for _ in range(paddles):
+            side, *values = layout.paddle.unpack_from(payload, offset)
+            sides.append(DIRECTIONS[side])
+            state += layout.unpack_state(tuple(values), size)
+            offset += layout.paddle.size
+        return Snapshot(updates, time, tuple(sides), state, None, balls, size, config), offset
+
+    def _decode_pongdiff(self, payload: memoryview, offset: int) -> tuple[PongDiff, int]:
+        diff = PongDiff()
+        flags = payload[offset]
+        offset += 1
+        layout, extent = _layout(0), Vector2(1, 1)  # unquantized layouts ignore sizes
+        if flags & _DIFF_QUANTIZED:
+            layout, diff.extent = _layout(payload[offset]), Vector2(extent)
+            offset += 1
+        if flags & _DIFF_UPDATES:
+            diff.updates = _I64.unpack_from(payload, offset)[0]
+            offset += _I64.size
+        if flags & _DIFF_TIME:
+            diff.time = _F64.unpack_from(payload, offset)[0]
+            offset += _F64.size
+        if flags & _DIFF_SIZE:
+            diff.size = Vector2(_VECTOR.unpack_from(payload, offset))
+            offset += _VECTOR.size
+        if flags & _DIFF_CONFIG:
+            prx, pry, *ratios = _CONFIG.unpack_from(payload, offset)
+            diff.config = Config(Vector2(prx, pry), *ratios)
+            offset += _CONFIG.size
+        count, offset = payload[offset], offset + 1
+        for _ in range(count):
+            index, changes, offset = self._decode_changes(layout, payload, offset, extent)
+            if index == 0:
+                diff.ball = changes
+            else:
+                diff.balls[index] = changes
+        count, offset = payload[offset], offset + 1
+        for _ in range(count):
+            side, changes, offset = self._decode_changes(layout, payload, offset, extent)
+            diff.paddles[DIRECTIONS[side]] = changes
+        count, offset = payload[offset], offset + 1
+        for _ in range(count):
+            ball, offset = layout.unpack_ball(payload, offset, extent)
+            diff.added_balls.append(ball)
+        diff.removed_balls, offset = payload[offset], offset + 1
+        count, offset = payload[offset], offset + 1
+        for _ in range(count):
+            paddle, offset = layout.unpack_paddle(payload, offset, extent)
+            diff.added.append(paddle)
+        count, offset = payload[offset], offset + 1
+        diff.removed = [DIRECTIONS[side] for side in payload[offset:offset + count]]
+        return diff, offset + count
+
+    def _decode_changes(self, layout: _Layout, payload: memoryview, offset: int, size: Vector2) \
+            -> tuple[int, dict[str, Vector2], int]:
+        key, mask = _CHANGES.unpack_from(payload, offset)
+        offset += _CHANGES.size
+        changes: dict[str, Vector2] = {}
+        for bit, name in enumerate(VECTORS):
+            if mask & (1 << bit):
+                changes[name], offset = layout.unpack_change(name, payload, offset, size)
+        return key, changes, offset
+
+
+DEFAULT_ENCODER = BinaryEncoder()
+DEFAULT_DECODER = BinaryDecoder()
+SNAPSHOT_DECODER = BinaryDecoder(snapshots=True)
+
+
+@lru_cache(maxsize=None)
+def encoder_for(quantization: Quantization) -> BinaryEncoder:
+    return BinaryEncoder(quantization)
+
+
+def encode(obj, encoder=DEFAULT_ENCODER) -> bytes:
+    return encoder.encode(obj)
+
+
+def decode(payload: bytes, decoder=DEFAULT_DECODER):
+    return decoder.decode(payload)
+
+
+ENVELOPE_OVERHEAD = (_HEADER.size, _LENGTH.size)
+'''Bytes an envelope adds to the messages it carries: once, and per message.'''
+
+
+def envelope(payloads: list[bytes]) -> bytes:
+    '''A `KIND_BATCH` message carrying the given (already encoded) messages, decoded as the list of them.'''
+    parts = [_HEADER.pack(MAGIC, VERSION, KIND_BATCH)]
+    for payload in payloads:
+        parts += _LENGTH.pack(len(payload)), payload
+    return b"".join(parts)
@@ -20,6 +20,10 @@ def main_coordinator(settings=None):
             from dpongpy.remote.udp import UdpPongCoordinator
 
             UdpPongCoordinator(settings).run()
+        case "async_udp":
+            from dpongpy.remote.async_udp import AsyncUdpPongCoordinator
+
+            AsyncUdpPongCoordinator(settings).run()
         case _:
             raise ValueError(f"Unknown comm_tech: {comm_tech}")
 
@@ -41,6 +45,10 @@ def main_terminal(settings=None):
                     from dpongpy.remote.udp import UdpPongTerminal
 
                     UdpPongTerminal(settings).run()
+                case "async_udp":
+                    from dpongpy.remote.async_udp import AsyncUdpPongTerminal
+
+                    AsyncUdpPongTerminal(settings).run()
                 case _:
                     raise ValueError(f"Unknown comm_tech: {comm_tech}")
         case EtcdSettings():
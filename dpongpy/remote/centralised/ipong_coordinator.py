@@ -3,7 +3,10 @@ from dpongpy import PongGame, DistributedSettings
 from dpongpy.controller import ControlEvent
 from dpongpy.log import Loggable
 from dpongpy.model import Direction, Pong
-from dpongpy.remote.presentation import deserialize, serialize
+from dpongpy.remote.presentation import Quantization, decode_events
+from dpongpy.remote.batching import Outbox
+from dpongpy.remote.delta import DeltaSender
+from dpongpy.remote.negotiation import PeerFormats, is_advertisement
 from dpongpy.view import PongView
 from dpongpy.log import logger
 import pygame
@@ -18,8 +21,8 @@ class IRemotePongCoordinator(PongGame, Loggable):
             linked to each technology (e.g. UDP, ZMQ, WebSockets).
         - __handle_ingoing_messages(): 
             This method should handle incoming messages from peers.
-        - _broadcast_to_all_peers(message): 
-            This method should broadcast a message to all connected peers.
+        - _send_payload(peer, payload):
+            This method should send an encoded message to the given peer.
     """
 
     def __init__(self, settings: DistributedSettings = None):
@@ -30,6 +33,10 @@ class IRemotePongCoordinator(PongGame, Loggable):
         )  # cambia il modo in cui si chiama il super costruttore nel l'ereditarietà multipla
         self.pong.reset_ball((0, 0))
         self.communication_technology = settings.comm_technology
+        self.states = DeltaSender(settings.state_history) if settings.delta_states else None
+        self.quantization = Quantization(settings.quantization_bits) if settings.quantization_bits else None
+        self.formats = PeerFormats(settings.codec, self.quantization, settings.compression)
+        self.outbox = Outbox(self.formats) if settings.batching else None
         self.initialize()
 
     def initialize(self):
@@ -44,11 +51,8 @@ class IRemotePongCoordinator(PongGame, Loggable):
         from dpongpy.view import ShowNothingPongView
 
         class SendToPeersPongView(ShowNothingPongView):
-            def render(self):
-                event = coordinator.controller.create_event(
-                    ControlEvent.TIME_ELAPSED, dt=coordinator.dt, status=self._pong
-                )
-                coordinator._broadcast_to_all_peers(event)
+            def render(self, interpolation: float = 1.0):
+                coordinator._broadcast_status(self._pong, coordinator.dt)
 
         return SendToPeersPongView(coordinator.pong)
 
@@ -61,7 +65,10 @@ class IRemotePongCoordinator(PongGame, Loggable):
 
             def on_player_join(self, pong: Pong, paddle_index: int | Direction):
                 super().on_player_join(pong, paddle_index)
-                pong.reset_ball()
+                # share a fresh seed, so that peers can serve balls exactly as the coordinator does
+                seed = pong.random.getrandbits(32)
+                self.on_game_start(pong, seed)
+                coordinator._broadcast_to_all_peers(self.create_event(ControlEvent.GAME_START, seed=seed))
 
             def on_player_leave(self, pong: Pong, paddle_index: Direction):
                 if pong.has_paddle(paddle_index):
@@ -77,7 +84,8 @@ class IRemotePongCoordinator(PongGame, Loggable):
                 coordinator.stop()
 
             def handle_inputs(self, dt=None):
-                self.time_elapsed(dt)
+                if dt is not None:
+                    self.time_elapsed(dt)
 
         return Controller(coordinator.pong)
 
@@ -85,14 +93,9 @@ class IRemotePongCoordinator(PongGame, Loggable):
         try:
             max_retries = 3
             while self.running:
-                message, sender = self.server.receive()
+                message, sender = self.server.receive(decode=False)
                 if sender is not None:
-                    self.add_peer(sender)
-                    message = deserialize(message)
-                    assert isinstance(
-                        message, pygame.event.Event
-                    ), f"Expected {pygame.event.Event}, got {type(message)}"
-                    pygame.event.post(message)
+                    self.on_payload(message, sender)
                 elif self.running:
                     logger.warn(
                         "Receive operation returned None: the server may have been closed ahead of time"
@@ -109,9 +112,10 @@ class IRemotePongCoordinator(PongGame, Loggable):
         super().before_run()
 
     def at_each_run(self):
-        pass
+        self.flush()
 
     def after_run(self):
+        self.flush()
         self.server.close()
         print("\033[32mCoordinator stopped gracefully\033[0m")
         super().after_run()
@@ -130,14 +134,69 @@ class IRemotePongCoordinator(PongGame, Loggable):
         with self._lock:
             self._peers.add(peer)
 
+    def on_payload(self, payload: str | bytes, sender):
+        """Handles a payload received from sender, i.e. each event it carries, in order."""
+        self.add_peer(sender)
+        for event in decode_events(payload):
+            self.on_message(event, sender)
+
+    def on_message(self, message: pygame.event.Event, sender):
+        assert isinstance(
+            message, pygame.event.Event
+        ), f"Expected {pygame.event.Event}, got {type(message)}"
+        if ControlEvent.STATE_ACK.matches(message):
+            # acknowledgements are about the connection with sender, not about the game
+            if self.states is not None:
+                self.states.acknowledge(sender, message.frame)
+        elif is_advertisement(message):
+            # so are advertisements, which precede joins
+            format = self.formats.negotiate(sender, message)
+            logger.info(f"Sending {format} messages to {sender}")
+            if self.outbox is not None:
+                self.outbox.announce(sender)
+            if self.states is not None and message.dict.get("deltas"):
+                self.states.stream_to(sender)
+        else:
+            if ControlEvent.PLAYER_LEAVE.matches(message):
+                self.forget_peer(sender)
+            pygame.event.post(message)
+
+    def forget_peer(self, peer):
+        """Forgets what is known about the connection with peer, which may join again (e.g. from the same address)."""
+        if self.states is not None:
+            self.states.forget(peer)
+        self.formats.forget(peer)
+
+    def _broadcast_status(self, pong: Pong, dt: float):
+        if self.states is None:
+            event = self.controller.create_event(ControlEvent.TIME_ELAPSED, dt=dt, status=pong)
+            self._broadcast_to_all_peers(event)
+        else:
+            for event, peers in self.states.messages(pong, self.peers, dt):
+                self._send_to_peers(event, peers)
+
     def _broadcast_to_all_peers(self, message):
+        self._send_to_peers(message, self.peers)
+
+    def _send_to_peers(self, message, peers):
+        if self.outbox is not None:
+            self.outbox.put(message, peers)  # sent by the next flush
+        else:
+            for peer, payload in self.formats.payloads(message, peers):
+                self._send_payload(peer, payload)
+
+    def flush(self):
+        """Sends the messages batched since the last flush, i.e. once per tick."""
+        if self.outbox is not None:
+            for peer, payload in self.outbox.flush():
+                self._send_payload(peer, payload)
+
+    def _send_payload(self, peer, payload):
         """
         Default implementation. Suitable for sychronous communication like ZMQ or UDP.
         Not compatible with WebSockets implementation
         """
-        event = serialize(message)
-        for peer in self.peers:
-            self.server.send(peer, event)
+        self.server.send(peer, payload)
 
 class ThreadedPongCoordinator(IRemotePongCoordinator):
     def __init__(self, settings: DistributedSettings = None):
@@ -10,7 +10,10 @@ from dpongpy.controller import ControlEvent
 from dpongpy.log import Loggable
 from dpongpy.model import *
 from dpongpy.remote.centralised import DEFAULT_HOST, DEFAULT_PORT
-from dpongpy.remote.presentation import deserialize, serialize
+from dpongpy.remote.presentation import decode, encode
+from dpongpy.remote.batching import pack
+from dpongpy.remote.delta import DeltaReceiver
+from dpongpy.remote.negotiation import LEGACY_CODEC, advertisement
 
 
 class IRemotePongTerminal(PongGame, Loggable):
@@ -30,9 +33,9 @@ class IRemotePongTerminal(PongGame, Loggable):
 
         This method is responsible for initializing the remote Pong terminal and setting up any necessary configurations or connections to a server over the specified network protocol (WebSockets, ZMQ, etc.).
 
-    - send_event(event: Event) -> None
+    - _send(payload: str | bytes) -> None
 
-        This method is used to transmit events from the local client (terminal) to a remote server or another client.
+        This method is used to transmit encoded events from the local client (terminal) to a remote server or another client.
         Default implementation works for ZMQ and UDP. Websockets MUST override this method.
     """
 
@@ -45,6 +48,9 @@ class IRemotePongTerminal(PongGame, Loggable):
         super().__init__(self.settings)
         self.pong.reset_ball((0, 0))
         self.communication_technology = self.settings.comm_technology
+        self.states: DeltaReceiver = DeltaReceiver(self.settings.state_history)
+        self._outgoing: list[str | bytes] = []
+        self.coordinator_batches: bool = False  # whether the coordinator was seen sending envelopes, hence unpacks them
 
         self.initialize()
 
@@ -55,11 +61,29 @@ class IRemotePongTerminal(PongGame, Loggable):
         self.__handle_ingoing_messages()
 
     def send_event(self, event):
-        if isinstance(self, WebSocketPongTerminal):
-            raise NotImplementedError(
-                "WebSocketPongTerminal requires a different implementation of send_event"
-            )
-        self.client.send(serialize(event))
+        """Sends event to the coordinator: joins are preceded by the advertisement of the formats this terminal decodes."""
+        if ControlEvent.PLAYER_JOIN.matches(event):
+            self._enqueue(advertisement(self.settings.codec, self.settings.compression))
+        self._enqueue(event)
+
+    def _enqueue(self, event):
+        payload = self._encode(event)
+        if self.settings.batching and self.coordinator_batches:
+            self._outgoing.append(payload)  # sent by the next flush
+        else:
+            self._send(payload)
+
+    def flush(self):
+        """Sends the events batched since the last flush, i.e. once per tick."""
+        outgoing, self._outgoing = self._outgoing, []
+        for payload in pack(outgoing, self.settings.codec or LEGACY_CODEC):
+            self._send(payload)
+
+    def _send(self, payload):
+        self.client.send(payload)
+
+    def _encode(self, event: Event) -> str | bytes:
+        return encode(event, self.settings.codec or LEGACY_CODEC)
 
     def create_controller(terminal, paddle_commands=None):
         from dpongpy.controller.local import EventHandler, PongInputHandler
@@ -77,12 +101,26 @@ class IRemotePongTerminal(PongGame, Loggable):
             def handle_inputs(self, dt=None):
                 return super().handle_inputs(dt)
 
-            def on_time_elapsed(self, pong: Pong, dt: float, status: Pong = None):
+            def on_time_elapsed(self, pong: Pong, dt: float, status: Pong | Snapshot | None = None,
+                                frame: int | None = None, baseline: int | None = None,
+                                delta: PongDiff | None = None):
+                if frame is not None:
+                    status = terminal.states.receive(frame, status, baseline, delta)
+                    if status is None:
+                        return  # stale frame, or delta against a frame this terminal never got
+                    terminal.send_event(self.create_event(ControlEvent.STATE_ACK, frame=frame))
                 if status is None or pong is status:
                     pong.update(dt)
+                elif isinstance(status, Snapshot):
+                    pong.restore(status)
                 else:
                     pong.override(status)
 
+            def on_game_start(self, pong: Pong, seed: int | None = None):
+                if seed is not None:
+                    pong.reseed(seed)
+                    pong.reset_ball()
+
             def on_paddle_move(
                 self, pong: Pong, paddle_index: int | Direction, direction: Direction
             ):
@@ -97,13 +135,9 @@ class IRemotePongTerminal(PongGame, Loggable):
         try:
             max_retries = 3
             while self.running:
-                message = self.client.receive()
+                message = self.client.receive(decode=False)
                 if message is not None:
-                    message = deserialize(message)
-                    assert isinstance(
-                        message, pygame.event.Event
-                    ), f"Expected {pygame.event.Event}, got {type(message)}"
-                    pygame.event.post(message)
+                    self.on_payload(message)
                 elif self.running:
                     logger.warn(
                         "Receive operation returned None: the client may have been closed ahead of time"
@@ -115,6 +149,19 @@ class IRemotePongTerminal(PongGame, Loggable):
             self.running = False
             raise e
 
+    def on_payload(self, payload: str | bytes):
+        """Posts each event carried by a payload received from the coordinator, in order."""
+        events = decode(payload, snapshots=True)
+        if isinstance(events, list):
+            self.coordinator_batches = True
+        else:
+            events = [events]
+        for event in events:
+            assert isinstance(
+                event, pygame.event.Event
+            ), f"Expected {pygame.event.Event}, got {type(event)}"
+            pygame.event.post(event)
+
     def before_run(self):
         logger.info("Terminal starting")
         super().before_run()
@@ -122,7 +169,12 @@ class IRemotePongTerminal(PongGame, Loggable):
             ControlEvent.PLAYER_JOIN, paddle_index=self.pong.paddles[0].side
         )
 
+    def at_each_run(self):
+        self.flush()
+        super().at_each_run()
+
     def after_run(self):
+        self.flush()
         self.client.close()
         logger.info("Terminal stopped gracefully")
         super().after_run()
@@ -141,6 +193,3 @@ class ThreadedPongTerminal(IRemotePongTerminal):
         self.receiving_thread.start()
         self._peers = set()
         self._lock = threading.RLock()
-
-    def send_event(self, event):
-        self.client.send(serialize(event))
@@ -0,0 +1,132 @@
+'''
+UDP endpoints on asyncio (`loop.create_datagram_endpoint`), the non-blocking counterpart of `udp`:
+rather than blocking on `recvfrom` in a dedicated thread, received datagrams are handed to a callback
+by the event loop itself, and sends never block (the transport buffers what the socket cannot take yet).
+'''
+
+import asyncio
+import random
+from typing import Callable, Optional, TypeVar
+from dpongpy import trace
+from dpongpy.log import logger
+from dpongpy.remote import Address
+from dpongpy.remote.comm.udp.udp import THRESHOLD_DGRAM_SIZE, UDP_DROP_RATE
+
+
+Receiver = Callable[[bytes, Address], None]
+
+_Endpoint = TypeVar('_Endpoint', bound='Endpoint')
+
+
+class _Protocol(asyncio.DatagramProtocol):
+    def __init__(self, receiver: Receiver):
+        self._receiver = receiver
+
+    def datagram_received(self, data: bytes, address: tuple):
+        sender = Address(*address[:2])
+        if trace.UDP.enabled:
+            trace.UDP.record("Received %d bytes from %s: %r", len(data), str(sender), data)
+        self._receiver(data, sender)
+
+    def error_received(self, exc: Exception):
+        # e.g. ICMP "port unreachable" after a peer went away: the endpoint is still usable
+        logger.warn(exc)
+
+
+class Endpoint:
+    '''
+    A UDP socket driven by an asyncio event loop. Use the `open` of `Server` or `Client` to create one, within the loop.
+
+    Attributes:
+        - remote_address (Address): The peer datagrams are sent to by default, if any.
+        - local_address (Address): The local socket address.
+    '''
+
+    def __init__(self, transport: asyncio.DatagramTransport, remote_address: Optional[Address] = None):
+        self._transport = transport
+        self._remote_address = remote_address
+
+    @classmethod
+    async def _open(cls: type[_Endpoint], receiver: Receiver, bind_to: Optional[Address] = None,
+                    remote_address: Optional[Address] = None) -> _Endpoint:
+        '''
+        Opens an endpoint, bound to `bind_to` (any local port, if None), which calls `receiver` with each datagram
+        it receives (and the address of its sender), from within the event loop.
+        '''
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _Protocol(receiver),
+            local_addr=bind_to.as_tuple() if bind_to is not None else None,
+            remote_addr=remote_address.as_tuple() if remote_address is not None else None,
+        )
+        endpoint = cls(transport, remote_address)
+        logger.debug(f"Bind asyncio UDP endpoint to {endpoint.local_address}")
+        return endpoint
+
+    @property
+    def remote_address(self) -> Optional[Address]:
+        return self._remote_address
+
+    @property
+    def local_address(self) -> Address:
+        return Address(*self._transport.get_extra_info("sockname")[:2])
+
+    @property
+    def closed(self) -> bool:
+        return self._transport.is_closing()
+
+    def _send(self, payload: bytes | str, address: Optional[Address] = None) -> int:
+        '''
+        Sends a message to `address`, or to the remote peer of this endpoint.
+
+        Returns:
+            - int: The number of bytes sent (or rather, buffered for sending).
+        '''
+        if self.closed:
+            raise OSError("Endpoint is closed")
+        if isinstance(payload, str):
+            payload = payload.encode()
+        if len(payload) > THRESHOLD_DGRAM_SIZE:
+            raise ValueError(f"Payload size must be less than {THRESHOLD_DGRAM_SIZE} bytes ({THRESHOLD_DGRAM_SIZE / 1024} KiB)")
+        address = address or self.remote_address
+        if address is None:
+            raise ValueError("No address to send to")
+        if random.uniform(0, 1) < UDP_DROP_RATE:
+            logger.warn(f"Pretend to send {len(payload)} bytes to {address}: {payload!r}")
+        else:
+            # connected endpoints may only send to their peer, and without telling its address
+            self._transport.sendto(payload, None if self.remote_address else address.as_tuple())
+            if trace.UDP.enabled:
+                trace.UDP.record("Sent %d bytes to %s: %r", len(payload), str(address), payload)
+        return len(payload)
+
+    def close(self):
+        self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class Server(Endpoint):
+    '''An endpoint receiving from, and sending to, any peer: the asyncio counterpart of `udp.Server`.'''
+
+    @classmethod
+    async def open(cls, receiver: Receiver, port: int) -> 'Server':
+        return await cls._open(receiver, bind_to=Address.local_port_on_any_interface(port))
+
+    def send(self, address: Address, payload: bytes | str) -> int:
+        return self._send(payload, address)
+
+
+class Client(Endpoint):
+    '''An endpoint connected to a single peer: the asyncio counterpart of `udp.Client`.'''
+
+    @classmethod
+    async def open(cls, receiver: Callable[[bytes], None], remote_address: Address) -> 'Client':
+        return await cls._open(lambda payload, _: receiver(payload), remote_address=remote_address)
+
+    def send(self, payload: bytes | str) -> int:
+        return self._send(payload)
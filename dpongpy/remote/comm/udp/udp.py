@@ -1,4 +1,5 @@
 from dpongpy.log import logger
+from dpongpy import trace
 from dpongpy.remote import *
 import os
 import random
@@ -45,7 +46,8 @@ def udp_send(sock: socket.socket, address:Address, payload: bytes | str) -> int:
             logger.warn(f"Pretend to send {result} bytes to {address}: {payload}")
         else:
             result = sock.sendto(payload, address.as_tuple())
-            logger.debug(f"Sent {result} bytes to {address}: {payload}")
+            if trace.UDP.enabled:
+                trace.UDP.record("Sent %d bytes to %s: %r", result, str(address), payload)
         return result
     except OSError as e:
         logger.error(e)
@@ -68,7 +70,8 @@ def udp_receive(sock: socket.socket, decode=True) -> tuple[str | bytes, Address]
             return None, None
         payload, address = sock.recvfrom(THRESHOLD_DGRAM_SIZE)
         address = Address(*address)
-        logger.debug(f"Received {len(payload)} bytes from {address}: {payload}")
+        if trace.UDP.enabled:
+            trace.UDP.record("Received %d bytes from %s: %r", len(payload), str(address), payload)
         if decode:
             payload = payload.decode()
         return payload, address
@@ -44,7 +44,7 @@ class Server(Server):
         session._first_message = message  # Store the first message
         return session
 
-    def receive(self) -> Tuple[Optional[str], Optional[str]]:
+    def receive(self, decode=True) -> Tuple[Optional[str | bytes], Optional[str]]:
         """
         Receives a message from any client and manages sessions.
         """
@@ -64,17 +64,19 @@ class Server(Server):
                 )  # Placeholder address
                 self.sessions[client_id_hex] = session
 
-            return message.decode("utf-8"), client_id_hex
+            return (message.decode("utf-8") if decode else message), client_id_hex
         except zmq.Again:
             return None, None
 
-    def send(self, client_id: str, payload: str):
+    def send(self, client_id: str, payload: str | bytes):
         """
         Sends a message to a specific client.
         """
         if client_id in self.sessions:
             client_id_bytes = binascii.unhexlify(client_id)
-            self.socket.send_multipart([client_id_bytes, payload.encode("utf-8")])
+            if isinstance(payload, str):
+                payload = payload.encode("utf-8")
+            self.socket.send_multipart([client_id_bytes, payload])
         else:
             logger.debug(f"Client {client_id} not found in sessions")
 
@@ -0,0 +1,177 @@
+"""
+Optional compression stage between `encode` and the transports, meant for the many small messages of a match.
+
+Messages are compressed one by one with raw DEFLATE (stdlib `zlib`), primed with a *preset dictionary*
+trained offline from recorded traffic (see `benchmarks.dictionary`): even the first message of a connection then finds
+most of its field names and type tags in the dictionary, which plain DEFLATE cannot exploit on such short inputs.
+Dictionaries are shipped as static resources (in `dictionaries`), each one with a fixed id: changes to the game or
+to the codecs never change them, hence peers of different versions keep compressing towards each other.
+
+Compressed payloads start with a 2-bytes header (`MAGIC`, dictionary id), hence `decode` recognises them by
+themselves. Since both ends need the very same dictionary, its use is negotiated per connection (see `negotiation`):
+terminals advertise the fingerprints of the dictionaries they have when joining, and coordinators only compress
+towards peers which advertised theirs. Payloads which would not shrink are sent as they are.
+
+Each `Compressor` keeps `CompressionStats`, i.e. the achieved ratio and the CPU time spent, so that
+deployments can tell whether compression pays off.
+"""
+
+import struct
+import time
+import zlib
+from functools import lru_cache
+from importlib import resources
+from typing import Iterable, Optional, TypeGuard
+from dpongpy.log import logger
+
+
+MAGIC = 0xF8
+'''First byte of compressed payloads: neither a JSON document nor a binary message may start with it.'''
+
+_HEADER = struct.Struct("!BB")
+
+LEVEL = 6
+
+_WBITS = -15  # raw DEFLATE: no zlib header nor checksum, as transports already deliver whole payloads
+
+
+def fingerprint(dictionary: bytes) -> int:
+    '''Identifies a dictionary across processes (and versions of dpongpy), for negotiation purposes.'''
+    return zlib.crc32(dictionary)
+
+
+DEFAULT_DICTIONARY_ID = 1
+
+_DICTIONARIES = {
+    DEFAULT_DICTIONARY_ID: ("1.zdict", 0x13B38AB6),  # 2- and 4-paddle matches, JSON and binary, deltas
+}
+'''Dictionaries known by this process, by id: the resource holding each one, and its expected fingerprint.'''
+
+
+@lru_cache(maxsize=None)
+def dictionary(id: int) -> bytes:
+    if id not in _DICTIONARIES:
+        raise ValueError(f"Unknown compression dictionary: {id}")
+    name, expected = _DICTIONARIES[id]
+    data = resources.files(__package__).joinpath("dictionaries", name).read_bytes()
+    if fingerprint(data) != expected:
+        raise ValueError(f"Compression dictionary {id} was modified: ship changed dictionaries with new ids")
+    return data
+
+
+def fingerprints() -> list[int]:
+    '''Fingerprints of the dictionaries this process can decompress with, to be advertised to peers.'''
+    return [fingerprint(dictionary(id)) for id in _DICTIONARIES]
+
+
+def negotiate(advertised: Optional[Iterable[int]]) -> Optional[int]:
+    '''The id of a dictionary both ends have, given the fingerprints advertised by the peer, if any.'''
+    advertised = set(advertised or ())
+    for id in _DICTIONARIES:
+        if fingerprint(dictionary(id)) in advertised:
+            return id
+    return None
+
+
+class CompressionStats:
+    __slots__ = ('messages', 'compressed', 'raw_bytes', 'wire_bytes', 'compress_time', 'decompress_time')
+
+    def __init__(self):
+        self.messages = 0
+        self.compressed = 0
+        self.raw_bytes = 0
+        self.wire_bytes = 0
+        self.compress_time = 0.0
+        self.decompress_time = 0.0
+
+    @property
+    def ratio(self) -> float:
+        '''Uncompressed over transmitted bytes: the higher, the better.'''
+        return self.raw_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
+    def to_dict(self) -> dict:
+        return {
+            "messages": self.messages,
+            "compressed": self.compressed,
+            "raw_bytes": self.raw_bytes,
+            "wire_bytes": self.wire_bytes,
+            "ratio": self.ratio,
+            "compress_us_per_message": self.compress_time / self.messages * 1e6 if self.messages else 0.0,
+            "compress_time": self.compress_time,
+            "decompress_time": self.decompress_time,
+        }
+
+    def __str__(self):
+        return (f"{self.messages} messages ({self.compressed} compressed): {self.raw_bytes} -> {self.wire_bytes} bytes, "
+                f"ratio {self.ratio:.2f}, {self.compress_time * 1e3:.1f}ms compressing, "
+                f"{self.decompress_time * 1e3:.1f}ms decompressing")
+
+
+class Compressor:
+    '''
+    Compresses and decompresses single messages with a given dictionary.
+    Primed (de)compression objects are copied for each message, which is way cheaper than priming new ones.
+    '''
+
+    def __init__(self, id: int = DEFAULT_DICTIONARY_ID, level: int = LEVEL):
+        self.id = id
+        self.dictionary = dictionary(id)
+        self._header = _HEADER.pack(MAGIC, id)
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS, zdict=self.dictionary)
+        self._decompressor = zlib.decompressobj(_WBITS, zdict=self.dictionary)
+        self.stats = CompressionStats()
+
+    def compress(self, payload: str | bytes) -> str | bytes:
+        '''The compressed `payload`, or `payload` itself if compression would not make it shorter.'''
+        start = time.perf_counter()
+        raw = payload.encode() if isinstance(payload, str) else payload
+        compressor = self._compressor.copy()
+        compressed = self._header + compressor.compress(raw) + compressor.flush()
+        stats = self.stats
+        stats.compress_time += time.perf_counter() - start
+        stats.messages += 1
+        stats.raw_bytes += len(raw)
+        if len(compressed) < len(raw):
+            stats.compressed += 1
+            stats.wire_bytes += len(compressed)
+            return compressed
+        stats.wire_bytes += len(raw)
+        return payload
+
+    def decompress(self, payload: bytes) -> bytes:
+        start = time.perf_counter()
+        magic, id = _HEADER.unpack_from(payload)
+        assert magic == MAGIC and id == self.id, f"Not compressed with dictionary {self.id}"
+        decompressor = self._decompressor.copy()
+        raw = decompressor.decompress(memoryview(payload)[_HEADER.size:]) + decompressor.flush()
+        self.stats.decompress_time += time.perf_counter() - start
+        return raw
+
+
+_COMPRESSORS: dict[int, Compressor] = {}
+
+
+def compressor_for(id: int) -> Compressor:
+    '''The compressor shared by the whole process for the given dictionary.'''
+    if id not in _COMPRESSORS:
+        _COMPRESSORS[id] = Compressor(id)
+    return _COMPRESSORS[id]
+
+
+def is_compressed(payload) -> TypeGuard[bytes]:
+    return isinstance(payload, (bytes, bytearray, memoryview)) and len(payload) > 1 and payload[0] == MAGIC
+
+
+def decompress(payload: bytes) -> bytes:
+    '''Decompresses a payload produced by any `Compressor` of a known dictionary.'''
+    return compressor_for(payload[1]).decompress(payload)
+
+
+def report() -> dict[int, CompressionStats]:
+    '''Statistics of the shared compressors used so far, by dictionary id.'''
+    return {id: compressor.stats for id, compressor in _COMPRESSORS.items()}
+
+
+def shutdown_report():
+    for id, stats in report().items():
+        logger.info(f"Compression with dictionary {id}: {stats}")
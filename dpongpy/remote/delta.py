@@ -0,0 +1,232 @@
+"""
+Delta compression of the `Pong` status streamed by coordinators to terminals.
+
+Each status broadcast by the coordinator is a numbered *frame*. Terminals acknowledge (via `ControlEvent.STATE_ACK`)
+the frames they manage to reconstruct, and the coordinator sends each peer only the `PongDiff` between its latest
+acknowledged frame (the *baseline*) and the current status. Peers whose baseline is unknown (e.g. they just joined)
+or too old (i.e. no longer in the history) receive a full *keyframe* instead:
+
+- keyframe: `TIME_ELAPSED(dt, frame, status=<Pong>)`
+- delta:    `TIME_ELAPSED(dt, frame, baseline=<frame>, delta=<PongDiff>)`
+
+Peers sharing the same baseline get the very same message, hence it can be encoded once for all of them.
+Only peers which advertised they rebuild statuses this way (see `negotiation.advertisement`) get numbered frames:
+peers predating delta streaming get the plain `TIME_ELAPSED(dt, status)` they always got.
+Frames are numbered from 1 again whenever a coordinator (re)starts: terminals tell such restarts from stale
+messages by the keyframes restarted coordinators keep sending (see `DeltaReceiver.receive`).
+"""
+
+from typing import Hashable, Iterable, Optional
+from pygame.event import Event
+from dpongpy.model import GameObject, Pong, PongDiff, Snapshot, Vector2
+from dpongpy.controller import ControlEvent, create_event
+
+
+DEFAULT_HISTORY = 64
+'''Amount of frames kept on both sides, i.e. how old a baseline can be before falling back to keyframes.'''
+
+RESTART_KEYFRAMES = 3
+'''Consecutive stale keyframes after which terminals assume the coordinator restarted numbering frames.'''
+
+
+class FrameHistory:
+    """
+    Fixed-capacity buffer of `Snapshot`s keyed by frame number: storing a frame evicts the one `capacity` frames older.
+    Frames are numbered by the stream rather than by `Pong.updates`, since the status may change between updates
+    (e.g. when a player joins).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY):
+        assert capacity > 0, "Capacity must be positive"
+        self._slots: list[Optional[tuple[int, Snapshot]]] = [None] * capacity
+
+    @property
+    def capacity(self) -> int:
+        return len(self._slots)
+
+    def put(self, frame: int, snapshot: Snapshot):
+        self._slots[frame % len(self._slots)] = (frame, snapshot)
+
+    def get(self, frame: int) -> Optional[Snapshot]:
+        slot = self._slots[frame % len(self._slots)]
+        return slot[1] if slot is not None and slot[0] == frame else None
+
+    def __contains__(self, frame: int) -> bool:
+        return self.get(frame) is not None
+
+
+def _scratch_for(scratch: Optional[Pong], pong: Pong | Snapshot) -> Pong:
+    '''A `Pong` (`scratch` itself, if compatible) where to restore snapshots of `pong` (or a decoded snapshot).'''
+    if scratch is None or scratch.size != pong.size or scratch.config != pong.config:
+        scratch = Pong(pong.size, pong.config, paddles=[])
+    return scratch
+
+
+_FIELDS = (('position', 0), ('speed', 2), ('size', 4))
+'''Fields of game objects, and where they start in their `GameObject._state`.'''
+
+
+def _changes(before: tuple[float, ...], obj: GameObject) -> dict[str, Vector2]:
+    '''The changes `GameObject.diff` would find in `obj`, compared to a copy whose `_state` was `before`.'''
+    after = obj._state()
+    return {name: Vector2(after[start:start + 2]) for name, start in _FIELDS
+            if before[start:start + 2] != after[start:start + 2]}
+
+
+def _diff(snapshot: Snapshot, pong: Pong) -> Optional[PongDiff]:
+    '''
+    The changes `Pong.diff` would find in `pong`, compared to the match `snapshot` was taken of,
+    computed out of the snapshot itself: `None` if balls or paddles were added or removed in the meanwhile.
+    '''
+    if snapshot.balls != len(pong.balls) or snapshot.sides != tuple(pong._paddles):
+        return None
+    diff = PongDiff(extent=Vector2(pong.size))
+    if snapshot.updates != pong.updates:
+        diff.updates = pong.updates
+    if snapshot.time != pong.time:
+        diff.time = pong.time
+    state = snapshot.state
+    for index, ball in enumerate(pong.balls):
+        changes = _changes(state[index * 6:index * 6 + 6], ball)
+        if index == 0:
+            diff.ball = changes
+        elif changes:
+            diff.balls[index] = changes
+    for index, (side, paddle) in enumerate(pong._paddles.items(), start=snapshot.balls):
+        changes = _changes(state[index * 6:index * 6 + 6], paddle)
+        if changes:
+            diff.paddles[side] = changes
+    return diff
+
+
+class DeltaSender:
+    """
+    Coordinator side of the stream: numbers frames, tracks acknowledgements, and computes per-baseline deltas.
+    Deltas are computed once per baseline and frame, straight out of the baseline snapshot: a scratch `Pong` where to
+    restore it is only needed if balls or paddles were added or removed since then.
+    """
+
+    def __init__(self, history: int = DEFAULT_HISTORY):
+        self.history = FrameHistory(history)
+        self.frame = 0
+        self._acknowledged: dict[Hashable, int] = {}
+        self._streamed: set[Hashable] = set()
+        self._scratch: Optional[Pong] = None
+        self._deltas: dict[tuple[int, int], PongDiff] = {}  # keyed by baseline and frame
+
+    def stream_to(self, peer: Hashable):
+        '''Sends numbered frames to `peer` from now on, as it advertised it can rebuild them.'''
+        self._streamed.add(peer)
+
+    def acknowledge(self, peer: Hashable, frame: int):
+        if frame > self._acknowledged.get(peer, -1):
+            self._acknowledged[peer] = frame
+
+    def forget(self, peer: Hashable):
+        self._acknowledged.pop(peer, None)
+        self._streamed.discard(peer)
+
+    def baseline_of(self, peer: Hashable) -> Optional[int]:
+        '''The frame deltas for `peer` can be computed against, if any.'''
+        frame = self._acknowledged.get(peer)
+        return frame if frame is not None and frame in self.history else None
+
+    def messages(self, pong: Pong, peers: Iterable[Hashable], dt: float) -> list[tuple[Event, list[Hashable]]]:
+        '''
+        Records the current status of `pong` as a new frame, and returns the messages to send,
+        each one along with the peers it is meant for.
+        '''
+        self.frame += 1
+        self.history.put(self.frame, pong.snapshot())
+        self._deltas.clear()
+        groups: dict[Optional[int], list[Hashable]] = {}
+        legacy = []
+        for peer in peers:
+            if peer in self._streamed:
+                groups.setdefault(self.baseline_of(peer), []).append(peer)
+            else:
+                legacy.append(peer)
+        messages = []
+        if legacy:
+            messages.append((create_event(ControlEvent.TIME_ELAPSED, dt=dt, status=pong), legacy))
+        for baseline, members in groups.items():
+            if baseline is None:
+                event = create_event(ControlEvent.TIME_ELAPSED, dt=dt, frame=self.frame, status=pong)
+            else:
+                event = create_event(ControlEvent.TIME_ELAPSED, dt=dt, frame=self.frame, baseline=baseline,
+                                     delta=self.delta(baseline, pong))
+            messages.append((event, members))
+        return messages
+
+    def delta(self, baseline: int, pong: Pong) -> PongDiff:
+        '''The changes from the `baseline` frame to `pong`, i.e. the current frame.'''
+        key = (baseline, self.frame)
+        diff = self._deltas.get(key)
+        if diff is not None:
+            return diff
+        snapshot = self.history.get(baseline)
+        if snapshot is None:
+            raise KeyError(f"Frame {baseline} is no longer in history")
+        diff = _diff(snapshot, pong)
+        if diff is None:
+            self._scratch = _scratch_for(self._scratch, pong)
+            self._scratch.restore(snapshot)
+            diff = self._scratch.diff(pong)
+        self._deltas[key] = diff
+        return diff
+
+
+class DeltaReceiver:
+    """
+    Terminal side of the stream: rebuilds the coordinator's status out of keyframes and deltas.
+    The rebuilt status is retained, hence deltas against the latest frame are applied onto it, with no restoring.
+    """
+
+    def __init__(self, history: int = DEFAULT_HISTORY):
+        self.history = FrameHistory(history)
+        self.frame: Optional[int] = None
+        self._mirror: Optional[Pong] = None
+        self._stale_keyframes = 0
+
+    def reset(self):
+        '''Forgets the frames received so far, e.g. because they belong to the stream of a previous coordinator.'''
+        self.history = FrameHistory(self.history.capacity)
+        self.frame = None
+        self._stale_keyframes = 0
+
+    def _restarted(self, frame: int) -> bool:
+        '''Whether the stale keyframe `frame` rather means the coordinator restarted numbering frames.'''
+        if self.frame is None or self.frame - frame >= self.history.capacity:
+            return True  # far older than any message of the current stream may still be around
+        self._stale_keyframes += 1
+        return self._stale_keyframes >= RESTART_KEYFRAMES
+
+    def receive(self, frame: int, status: Pong | Snapshot | None = None, baseline: Optional[int] = None,
+                delta: Optional[PongDiff] = None) -> Optional[Pong]:
+        '''
+        Rebuilds the status of `frame`, either a keyframe (`status`, possibly decoded as a `Snapshot`)
+        or a `delta` against the `baseline` frame.
+        Returns `None` if that is not possible (i.e. the baseline is unknown) or pointless (i.e. the frame is stale).
+        '''
+        if self.frame is not None and frame <= self.frame:
+            if status is None or not self._restarted(frame):
+                return None
+            self.reset()
+        self._stale_keyframes = 0
+        if status is not None:
+            self._mirror = _scratch_for(self._mirror, status)
+            snapshot = status if isinstance(status, Snapshot) else status.snapshot()
+            self._mirror.restore(snapshot)
+        else:
+            if baseline is None or delta is None or self._mirror is None:
+                return None
+            if baseline != self.frame:
+                baseline_snapshot = self.history.get(baseline)
+                if baseline_snapshot is None:
+                    return None
+                self._mirror.restore(baseline_snapshot)
+            self._mirror.apply(delta)
+            snapshot = self._mirror.snapshot()
+        self.history.put(frame, snapshot)
+        self.frame = frame
+        return self._mirror
@@ -0,0 +1,129 @@
+"""
+Per-connection negotiation of wire formats, so that coordinators can adopt new codecs without upgrading all terminals.
+
+Right before joining, terminals advertise what they can decode in an `ADVERTISEMENT` event (see `advertisement`):
+
+- `codecs`: the codecs they support, mapped to their wire-format version, in order of preference;
+- `compression`: the fingerprints of their compression dictionaries (if compression is enabled, see `compression`);
+- `deltas`: whether they rebuild statuses out of numbered frames and deltas (see `delta`).
+
+Coordinators pick the best common format for each peer (see `PeerFormats`), and encode each message once per
+distinct format rather than once per peer. Peers advertising nothing predate negotiation: they get `LEGACY_CODEC`,
+one message at a time (i.e. no envelopes, see `batching`).
+Advertisements are no `ControlEvent`s, and joins carry nothing more than they used to: coordinators predating
+negotiation decode advertisements as plain events, and ignore them as they do with any other non-control event.
+"""
+
+from typing import Hashable, Iterable, Iterator, NamedTuple, Optional
+import pygame
+from pygame.event import Event
+from dpongpy.remote import compression
+from dpongpy.remote.presentation import CODECS, Quantization, encode
+
+
+JSON_VERSION = 2
+'''Version of the JSON wire format (the binary one is `binary.VERSION`): 2 introduced envelopes.'''
+
+LEGACY_CODEC = "json"
+'''The codec of peers which advertise none.'''
+
+BY_COMPACTNESS = ("binary", "json")
+'''Codecs from the most to the least compact one, i.e. the order in which coordinators prefer them.'''
+
+assert set(BY_COMPACTNESS) == set(CODECS), "Codecs must be ranked by compactness"
+
+ADVERTISEMENT = pygame.USEREVENT
+'''Type of advertisement events: `pygame.event.custom_type` never returns it, hence no `ControlEvent` has it.'''
+
+
+def codec_versions(preferred: Optional[str] = None) -> dict[str, int]:
+    '''The codecs this process supports, with their wire-format version, `preferred` (if any) first.'''
+    from dpongpy.remote import binary
+    versions = {"json": JSON_VERSION, "binary": binary.VERSION}
+    if preferred is None:
+        return versions
+    return {preferred: versions[preferred], **versions}
+
+
+def advertisement(preferred: Optional[str] = None, compressed: bool = False) -> Event:
+    '''The event terminals send right before their `PLAYER_JOIN`, advertising the formats they can decode.'''
+    attributes: dict = dict(codecs=codec_versions(preferred), deltas=True)
+    if compressed:
+        attributes["compression"] = compression.fingerprints()
+    return Event(ADVERTISEMENT, attributes)
+
+
+def is_advertisement(event: Event) -> bool:
+    return event.type == ADVERTISEMENT
+
+
+def _supports(advertised: Optional[dict[str, int]], codec: str) -> bool:
+    return advertised is not None and advertised.get(codec) == codec_versions()[codec]
+
+
+def negotiate_codec(advertised: Optional[dict[str, int]], preferred: Optional[str] = None) -> str:
+    '''
+    The codec to encode messages with, towards a peer which advertised the given codecs (and versions):
+    `preferred` if the peer supports it, otherwise the most compact codec both ends support in the same version.
+    '''
+    for codec in ((preferred,) if preferred else ()) + BY_COMPACTNESS:
+        if _supports(advertised, codec):
+            return codec
+    return LEGACY_CODEC
+
+
+class Format(NamedTuple):
+    codec: str
+    compression: Optional[int] = None  # dictionary id, if compressed
+    batched: bool = False  # whether the peer unpacks envelopes
+
+
+class PeerFormats:
+    """Coordinator side of the negotiation: tracks the format of each peer, and encodes messages for groups of peers."""
+
+    def __init__(self, preferred: Optional[str] = None, quantization: Optional[Quantization] = None,
+                 compressed: bool = False):
+        self.preferred = preferred
+        self.quantization = quantization
+        self.compressed = compressed
+        self._formats: dict[Hashable, Format] = {}
+
+    def negotiate(self, peer: Hashable, advertisement: Event) -> Format:
+        '''Picks the format of `peer` out of its `advertisement`.'''
+        assert is_advertisement(advertisement), f"Formats are negotiated out of advertisements, got {advertisement}"
+        codecs, fingerprints = advertisement.dict.get("codecs"), advertisement.dict.get("compression")
+        dictionary = compression.negotiate(fingerprints) if self.compressed else None
+        codec = negotiate_codec(codecs, self.preferred)
+        format = self._formats[peer] = Format(codec, dictionary, _supports(codecs, codec))
+        return format
+
+    def format_of(self, peer: Hashable) -> Format:
+        '''The format negotiated with `peer`, if any, otherwise the legacy one.'''
+        return self._formats.get(peer) or Format(LEGACY_CODEC)
+
+    def compress(self, format: Format, payload: str | bytes) -> str | bytes:
+        if format.compression is None:
+            return payload
+        return compression.compressor_for(format.compression).compress(payload)
+
+    def forget(self, peer: Hashable):
+        self._formats.pop(peer, None)
+
+    def encoded(self, message, peers: Iterable[Hashable]) -> Iterator[tuple[Hashable, str | bytes]]:
+        '''Yields the encoding of message for each peer, uncompressed: message is encoded once per codec.'''
+        encoded: dict[str, str | bytes] = {}
+        for peer in peers:
+            codec = self.format_of(peer).codec
+            payload = encoded.get(codec)
+            if payload is None:
+                payload = encoded[codec] = encode(message, codec, self.quantization)
+            yield peer, payload
+
+    def payloads(self, message, peers: Iterable[Hashable]) -> Iterator[tuple[Hashable, str | bytes]]:
+        '''Yields the payload for each peer: message is encoded once per codec, and compressed once per format.'''
+        payloads: dict[Format, str | bytes] = {}
+        for peer, payload in self.encoded(message, peers):
+            format = self.format_of(peer)
+            if format not in payloads:
+                payloads[format] = self.compress(format, payload)
+            yield peer, payloads[format]
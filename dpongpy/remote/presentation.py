@@ -1,28 +1,92 @@
 from pygame.event import Event
 from dpongpy.model import *
 from dpongpy.controller import ControlEvent
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional, Sequence, cast
 import json
 
 
 _DEBUG = False
 
 
+@dataclass(frozen=True)
+class Quantization:
+    '''
+    Fixed-point encoding of positions and speeds, as `bits`-wide unsigned integers normalized to the table size.
+    Positions range in `POSITION_RANGE` (i.e. up to a whole table beyond each border), speeds in `SPEED_RANGE`
+    (i.e. up to two tables per second): values beyond are clamped. Sizes are never quantized.
+    '''
+    bits: int = 16
+
+    POSITION_RANGE = (-1.0, 2.0)
+    SPEED_RANGE = (-2.0, 2.0)
+
+    def __post_init__(self):
+        assert 1 <= self.bits <= 32, f"Quantization bits must be in [1, 32], got {self.bits}"
+
+    @property
+    def levels(self) -> int:
+        return (1 << self.bits) - 1
+
+    def quantize(self, vector: Vector2, size: Vector2, range: tuple[float, float]) -> list[int]:
+        low, high = range
+        scale = self.levels / (high - low)
+        return [min(max(round((vector[axis] / size[axis] - low) * scale), 0), self.levels) for axis in (0, 1)]
+
+    def dequantize(self, values: Sequence[int], size: Vector2, range: tuple[float, float]) -> Vector2:
+        low, high = range
+        scale = (high - low) / self.levels
+        return Vector2((values[0] * scale + low) * size[0], (values[1] * scale + low) * size[1])
+
+    def max_error(self, extent: float, range: tuple[float, float] = POSITION_RANGE) -> float:
+        '''The largest difference between an in-range value and its dequantized counterpart, along `extent`.'''
+        low, high = range
+        return (high - low) * extent / self.levels / 2
+
+    @classmethod
+    def for_error(cls, extent: float, max_error: float = 0.5 ** 4) -> 'Quantization':
+        '''
+        The narrowest quantization keeping positions within `max_error` from their true value along `extent`.
+        The default bound is way below the half pixel which would make rounding to pixels differ.
+        '''
+        bits = 1
+        while cls(bits).max_error(extent) > max_error:
+            bits += 1
+        return cls(bits)
+
+
 class Serializer:
-    primitives = [int, float, str, bool]
+    primitives = [int, float, str, bool, type(None)]
     containers = [list, tuple]
 
+    def __init__(self, quantization: Optional[Quantization] = None):
+        # type -> bound method serializing its instances, compiled the first time the type is met
+        self._plans: dict[type, Callable] = {}
+        self.quantization = quantization
+
     def serialize(self, obj) -> str:
         return json.dumps(self._serialize(obj), indent=2 if _DEBUG else None)
 
     def _serialize(self, obj):
-        if any(isinstance(obj, primitive) for primitive in self.primitives):
-            return self._serialize_primitive(obj)
-        elif isinstance(obj, dict):
-            return self._serialize_dict(obj)
-        elif any(isinstance(obj, container) for container in self.containers):
-            return self._serialize_iterable(obj)
-        else:
-            return self._serialize_any(obj)
+        plan = self._plans.get(type(obj))
+        if plan is None:
+            plan = self._plans[type(obj)] = self._compile(type(obj))
+        return plan(obj)
+
+    def _compile(self, klass: type) -> Callable:
+        '''Selects the method serializing instances of `klass`, in the same order `_serialize` always did.'''
+        if issubclass(klass, tuple(self.primitives)):
+            return self._serialize_primitive
+        elif issubclass(klass, dict):
+            return self._serialize_dict
+        elif issubclass(klass, tuple(self.containers)):
+            return self._serialize_iterable
+        for ancestor in klass.mro():
+            method = getattr(self, f"_serialize_{ancestor.__name__.lower()}", None)
+            if method is not None:
+                return method
+        return self._serialize_any
 
     def _serialize_iterable(self, obj):
         return [self._serialize(item) for item in obj]
@@ -73,29 +137,94 @@ class Serializer:
         return self._to_dict(config, 'paddle_ratio', 'ball_ratio', 'ball_speed_ratio', 'paddle_speed_ratio', 'paddle_padding')
 
     def _serialize_pong(self, pong: Pong):
-        return self._to_dict(pong, 'paddles', 'ball', 'config', 'size', 'time', 'updates')
+        # the first ball is `ball`, as for single-ball peers, and any other one is in `extra_balls`
+        if self.quantization is None:
+            if pong.balls:
+                obj = self._to_dict(pong, 'paddles', 'ball', 'config', 'size', 'time', 'updates')
+            else:
+                obj = dict(self._to_dict(pong, 'paddles', 'config', 'size', 'time', 'updates'), ball=None)
+            if len(pong.balls) > 1:
+                obj['extra_balls'] = self._serialize(pong.balls[1:])
+        else:
+            obj = self._to_dict(pong, 'config', 'size', 'time', 'updates')
+            obj['paddles'] = [self._serialize_quantized(paddle, pong.size) for paddle in pong.paddles]
+            balls = [self._serialize_quantized(ball, pong.size) for ball in pong.balls]
+            obj['ball'] = balls[0] if balls else None
+            if len(balls) > 1:
+                obj['extra_balls'] = balls[1:]
+            obj['bits'] = self.quantization.bits
+        obj['$type'] = 'Pong'  # physics modes (e.g. `LockstepPong`) are none of the peers' business
+        return obj
+
+    def _serialize_quantized(self, obj: GameObject, size: Vector2):
+        assert self.quantization is not None, "Only quantizing serializers quantize game objects"
+        serialized = self._serialize(obj)
+        serialized['position'] = self.quantization.quantize(obj.position, size, Quantization.POSITION_RANGE)
+        serialized['speed'] = self.quantization.quantize(obj.speed, size, Quantization.SPEED_RANGE)
+        return serialized
+
+    def _serialize_changes(self, changes: dict[str, Vector2], size: Optional[Vector2]):
+        if self.quantization is None or size is None:
+            return self._serialize(changes)
+        serialized = {}
+        for name, value in changes.items():
+            if name == 'position':
+                serialized[name] = self.quantization.quantize(value, size, Quantization.POSITION_RANGE)
+            elif name == 'speed':
+                serialized[name] = self.quantization.quantize(value, size, Quantization.SPEED_RANGE)
+            else:
+                serialized[name] = self._serialize(value)
+        return serialized
+
+    def _serialize_pongdiff(self, diff: PongDiff):
+        obj = self._to_dict(diff, 'updates', 'time', 'size', 'config', 'removed', 'removed_balls')
+        size = diff.extent if self.quantization is not None else None
+        obj['ball'] = self._serialize_changes(diff.ball, size)
+        # JSON keys can only be strings, hence changes keyed by side or index travel as pairs
+        obj['paddles'] = [[self._serialize(side), self._serialize_changes(changes, size)]
+                          for side, changes in diff.paddles.items()]
+        obj['balls'] = [[index, self._serialize_changes(changes, size)] for index, changes in diff.balls.items()]
+        if self.quantization is None or size is None:
+            obj['added'], obj['added_balls'] = self._serialize(diff.added), self._serialize(diff.added_balls)
+        else:
+            obj['added'] = [self._serialize_quantized(paddle, size) for paddle in diff.added]
+            obj['added_balls'] = [self._serialize_quantized(ball, size) for ball in diff.added_balls]
+            # no need to send the table size: dequantized values are fractions of it, rescaled by `Pong.apply`
+            obj['bits'] = self.quantization.bits
+        return obj
 
 
 class Deserializer:
-    def deserialize(self, input: str):
+    def __init__(self, snapshots: bool = False):
+        # $type -> bound method deserializing it, looked up the first time the $type is met
+        self._decoders: dict[str, Callable] = {}
+        # whether `Pong`s are decoded as `Snapshot`s, to be restored into an existing model, rather than built anew
+        self.snapshots = snapshots
+
+    def deserialize(self, input: str | bytes):
         return self._deserialize(json.loads(input))
 
     def _deserialize(self, obj):
-        if isinstance(obj, dict):
+        # JSON only yields exact dicts and lists, hence no need for isinstance checks
+        kind = type(obj)
+        if kind is dict:
             if "$type" in obj:
                 return self._deserialize_any(obj)
             else:
                 return {key: self._deserialize(value) for key, value in obj.items()}
-        if isinstance(obj, list):
+        if kind is list:
             return [self._deserialize(item) for item in obj]
         return obj
 
     def _deserialize_any(self, obj):
         type_name = obj["$type"]
-        method_name = f"_deserialize_{type_name.lower()}"
-        if hasattr(self, method_name):
-            return getattr(self, method_name)(obj)
-        raise NotImplementedError(f"Deserialization for {type_name} is not implemented")
+        decoder = self._decoders.get(type_name)
+        if decoder is None:
+            decoder = getattr(self, f"_deserialize_{type_name.lower()}", None)
+            if decoder is None:
+                raise NotImplementedError(f"Deserialization for {type_name} is not implemented")
+            self._decoders[type_name] = decoder
+        return decoder(obj)
 
     def _from_dict(self, obj: dict, *attributes):
         return [self._deserialize(obj[name]) for name in attributes]
@@ -127,27 +256,146 @@ class Deserializer:
     def _deserialize_config(self, obj):
         return Config(*self._from_dict(obj, 'paddle_ratio', 'ball_ratio', 'ball_speed_ratio', 'paddle_speed_ratio', 'paddle_padding'))
 
+    @staticmethod
+    def _balls_of(obj) -> list:
+        '''The serialized balls of a serialized `Pong`.'''
+        balls = [obj['ball']] if obj['ball'] is not None else []
+        return balls + obj.get('extra_balls', [])
+
     def _deserialize_pong(self, obj):
+        if self.snapshots:
+            return self._snapshot_of(obj)
         pong = Pong(*self._from_dict(obj, 'size', 'config'), paddles=[])
+        balls = self._balls_of(obj)
         pong.paddles = [self._deserialize(paddle) for paddle in obj['paddles']]
-        pong.ball = self._deserialize(obj['ball'])
+        pong.balls = [self._deserialize(ball) for ball in balls]
         pong.time = self._deserialize(obj['time'])
         pong.updates = self._deserialize(obj['updates'])
+        if 'bits' in obj:
+            quantization = Quantization(obj['bits'])
+            for game_object, serialized in zip(pong.paddles + pong.balls, obj['paddles'] + balls):
+                self._dequantize(quantization, game_object, serialized, pong.size)
         return pong
 
+    def _snapshot_of(self, obj) -> Snapshot:
+        size, config = self._from_dict(obj, 'size', 'config')
+        balls = self._balls_of(obj)
+        quantization = Quantization(obj['bits']) if 'bits' in obj else None
+        state: list[float] = []
+        for serialized in balls + obj['paddles']:
+            position, speed, extent = serialized['position'], serialized['speed'], serialized['size']
+            if quantization is None:
+                state += position['x'], position['y'], speed['x'], speed['y']
+            else:
+                state.extend(quantization.dequantize(position, size, Quantization.POSITION_RANGE))
+                state.extend(quantization.dequantize(speed, size, Quantization.SPEED_RANGE))
+            state += extent['x'], extent['y']
+        sides = tuple(Direction[paddle['side']['name']] for paddle in obj['paddles'])
+        return Snapshot(obj['updates'], obj['time'], sides, tuple(state), None, len(balls), size, config)
+
+    def _dequantize(self, quantization: Quantization, game_object: GameObject, serialized: dict, size: Vector2):
+        game_object.position = quantization.dequantize(serialized['position'], size, Quantization.POSITION_RANGE)
+        game_object.speed = quantization.dequantize(serialized['speed'], size, Quantization.SPEED_RANGE)
+
+    def _dequantize_changes(self, quantization: Quantization, changes: dict, size: Vector2) -> dict[str, Vector2]:
+        if 'position' in changes:
+            changes['position'] = quantization.dequantize(changes['position'], size, Quantization.POSITION_RANGE)
+        if 'speed' in changes:
+            changes['speed'] = quantization.dequantize(changes['speed'], size, Quantization.SPEED_RANGE)
+        return changes
+
+    def _deserialize_pongdiff(self, obj):
+        diff = PongDiff(*self._from_dict(obj, 'updates', 'time', 'size', 'config', 'ball'))
+        diff.paddles = {self._deserialize(side): self._deserialize(changes) for side, changes in obj['paddles']}
+        diff.added, diff.removed, diff.added_balls, diff.removed_balls = \
+            self._from_dict(obj, 'added', 'removed', 'added_balls', 'removed_balls')
+        diff.balls = {index: self._deserialize(changes) for index, changes in obj['balls']}
+        if 'bits' in obj:
+            quantization, diff.extent = Quantization(obj['bits']), Vector2(1, 1)
+            for changes in [diff.ball, *diff.paddles.values(), *diff.balls.values()]:
+                self._dequantize_changes(quantization, changes, diff.extent)
+            for game_object, serialized in zip(diff.added + diff.added_balls, obj['added'] + obj['added_balls']):
+                self._dequantize(quantization, game_object, serialized, diff.extent)
+        return diff
+
 
 DEFAULT_SERIALIZER = Serializer()
 DEFAULT_DESERIALIZER = Deserializer()
+SNAPSHOT_DESERIALIZER = Deserializer(snapshots=True)
 
 
 def serialize(obj, serializer=DEFAULT_SERIALIZER):
     return serializer.serialize(obj)
 
 
-def deserialize(input: str, deserializer=DEFAULT_DESERIALIZER):
+def deserialize(input: str | bytes, deserializer=DEFAULT_DESERIALIZER):
     return deserializer.deserialize(input)
 
 
+CODECS = ("json", "binary")
+
+
+@lru_cache(maxsize=None)
+def _serializer_for(quantization: Quantization) -> Serializer:
+    return Serializer(quantization)
+
+
+def encode(obj, codec: str = "json", quantization: Optional[Quantization] = None) -> str | bytes:
+    '''
+    Encodes `obj` for the wire, with the given codec: either JSON text, or compact `binary` messages.
+    If `quantization` is given, positions and speeds travel as fixed-point integers.
+    '''
+    from dpongpy.remote import binary
+    if codec == "json":
+        return serialize(obj, DEFAULT_SERIALIZER if quantization is None else _serializer_for(quantization))
+    elif codec == "binary":
+        return binary.encode(obj, binary.DEFAULT_ENCODER if quantization is None else binary.encoder_for(quantization))
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def envelope(payloads: list[str | bytes], codec: str = "json") -> str | bytes:
+    '''
+    A single message carrying the given ones, already encoded with `codec`: `decode` turns it into the list of them.
+    JSON envelopes are arrays, binary ones are `KIND_BATCH` messages.
+    '''
+    from dpongpy.remote import binary
+    if codec == "json":
+        return "[" + ", ".join(cast(list[str], payloads)) + "]"
+    elif codec == "binary":
+        return binary.envelope(cast(list[bytes], payloads))
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def envelope_overhead(codec: str) -> tuple[int, int]:
+    '''Bytes an envelope of the given codec adds to the messages it carries: once, and per message (at most).'''
+    from dpongpy.remote import binary
+    if codec == "json":
+        return 2, 2
+    elif codec == "binary":
+        return binary.ENVELOPE_OVERHEAD
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def decode(payload: str | bytes, snapshots: bool = False):
+    '''
+    Decodes a message produced by `encode`, whatever its codec and quantization,
+    which are detected from the payload itself, possibly compressed (see `dpongpy.remote.compression`).
+    If `snapshots`, `Pong`s are decoded as `Snapshot`s, which are way cheaper to build and to `Pong.restore`.
+    '''
+    from dpongpy.remote import binary, compression
+    if compression.is_compressed(payload):
+        payload = compression.decompress(payload)
+    if binary.is_binary(payload):
+        return binary.decode(payload, binary.SNAPSHOT_DECODER if snapshots else binary.DEFAULT_DECODER)
+    return deserialize(payload, SNAPSHOT_DESERIALIZER if snapshots else DEFAULT_DESERIALIZER)
+
+
+def decode_events(payload: str | bytes, snapshots: bool = False) -> list[Event]:
+    '''The events carried by a payload, in order: either a single one, or those in an envelope.'''
+    decoded = decode(payload, snapshots)
+    return decoded if isinstance(decoded, list) else [decoded]
+
+
 if __name__ == '__main__':
     _DEBUG = True
     pong = Pong(size=(800, 600))
@@ -1,4 +1,5 @@
 from dpongpy.log import logger
+from dpongpy import trace
 from dpongpy.remote import *
 from functools import cache
 import threading
@@ -25,8 +26,8 @@ def tcp_send(sock: socket.socket, payload: bytes | str) -> int:
         payload = payload.encode()
     length = len(payload).to_bytes(4, 'big')
     result: int = sock.sendall(payload + length)
-    actual_address = tcp_get_remote_address(sock)
-    logger.debug(f"Sent {result} bytes to {actual_address}: {payload}")
+    if trace.TCP.enabled:
+        trace.TCP.record("Sent %d bytes to %s: %r", len(payload), str(tcp_get_remote_address(sock)), payload)
     return result
 
 
@@ -34,7 +35,8 @@ def tcp_receive(sock: socket.socket, decode=True) -> tuple[str | bytes, Address]
     length = int.from_bytes(sock.recv(4), 'big')
     payload = sock.recv(length)
     address = tcp_get_remote_address(sock)
-    logger.debug(f"Received {len(payload)} bytes from {address}: {payload}")
+    if trace.TCP.enabled:
+        trace.TCP.record("Received %d bytes from %s: %r", len(payload), str(address), payload)
     if decode:
         payload = payload.decode()
     return payload, address
@@ -0,0 +1,64 @@
+"""
+Synthetic recordings of the messages exchanged by coordinators and terminals.
+
+Headless matches (see `dpongpy.sim`) are played by bots, and each step yields the events that would travel on the wire
+if every paddle belonged to a remote terminal: joins and game starts first, then paddle moves, status broadcasts
+(keyframes or deltas, see `dpongpy.remote.delta`, or full statuses) and their acknowledgements, finally leaves and
+the game over.
+Recordings are deterministic for a given seed, hence suitable for training compression dictionaries.
+"""
+
+from random import Random
+from typing import Iterator, Optional
+from pygame.event import Event
+from dpongpy import PongGame, SimulationSettings
+from dpongpy.controller import ControlEvent, create_event
+from dpongpy.model import Direction
+from dpongpy.remote.delta import DeltaSender
+from dpongpy.remote.presentation import Quantization, encode
+
+
+def record(settings: Optional[SimulationSettings] = None, loss: float = 0.1, deltas: bool = True) -> Iterator[Event]:
+    '''
+    Yields the events of the headless matches described by `settings`, in the order they would be sent.
+    Statuses are streamed as deltas, unless `deltas` is false (as with the `--full-states` option).
+    A `loss` fraction of status messages goes unacknowledged, so that deltas against older baselines show up too.
+    Status messages refer to the live model, hence they must be encoded before resuming the iteration.
+    '''
+    from dpongpy.sim import create_match
+    settings = settings or SimulationSettings(physics="lockstep", seed=0, duration=2.0)
+    random = Random(settings.seed)
+    delta_time = PongGame.step_for(settings) or 1 / settings.fps
+    for _ in range(settings.matches):
+        match = create_match(settings, Random(random.random()))
+        pong, sender, peers = match.pong, DeltaSender(), [paddle.side for paddle in match.pong.paddles]
+        for side in peers:
+            sender.stream_to(side)
+            yield create_event(ControlEvent.PLAYER_JOIN, paddle_index=side)
+            yield create_event(ControlEvent.GAME_START, seed=random.getrandbits(32))
+        moves: dict[Direction, Optional[Direction]] = {side: Direction.NONE for side in match.bots}
+        for _ in range(round(settings.duration / delta_time)):
+            match.step(delta_time)
+            for side, direction in match.moves.items():
+                if direction != moves[side]:
+                    moves[side] = direction
+                    yield create_event(ControlEvent.PADDLE_MOVE, paddle_index=side, direction=direction)
+            if not deltas:
+                yield create_event(ControlEvent.TIME_ELAPSED, dt=delta_time, status=pong)
+                continue
+            for event, receivers in sender.messages(pong, peers, delta_time):
+                yield event
+                for peer in receivers:
+                    if random.random() >= loss:
+                        sender.acknowledge(peer, event.frame)
+                        yield create_event(ControlEvent.STATE_ACK, frame=event.frame)
+        for side in peers:
+            yield create_event(ControlEvent.PLAYER_LEAVE, paddle_index=side)
+        yield create_event(ControlEvent.GAME_OVER)
+
+
+def record_payloads(settings: Optional[SimulationSettings] = None, codec: str = "json",
+                    quantization: Optional[Quantization] = None, deltas: bool = True) -> Iterator[str | bytes]:
+    '''Same as `record`, yielding the encoded messages instead.'''
+    for event in record(settings, deltas=deltas):
+        yield encode(event, codec, quantization)
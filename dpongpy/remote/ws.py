@@ -6,7 +6,6 @@ from dpongpy.remote.centralised import (
 )
 from dpongpy.remote.centralised.ipong_coordinator import IRemotePongCoordinator
 from dpongpy.remote.centralised.ipong_terminal import IRemotePongTerminal
-from dpongpy.remote.presentation import deserialize, serialize
 import asyncio
 from dpongpy.log import logger
 import pygame
@@ -58,23 +57,16 @@ class WebSocketPongCoordinator(IRemotePongCoordinator):
         while self.running:
             sender, message = await self.server.receive()
             if sender is not None:
-                self.add_peer(sender)
-                message = deserialize(message)
-                assert isinstance(
-                    message, pygame.event.Event
-                ), f"Expected {pygame.event.Event}, got {type(message)}"
-                pygame.event.post(message)
+                self.on_payload(message, sender)
             elif self.running:
                 self.error(
                     "Receive operation returned None: the server may have been closed ahead of time"
                 )
                 raise RuntimeError("Receive operation returned None")
 
-    def _broadcast_to_all_peers(self, message):
-        event = serialize(message)
-        for peer in self.peers:
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(self.server.send(client_socket=peer, payload=event))
+    def _send_payload(self, peer, payload):
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(self.server.send(client_socket=peer, payload=payload))
 
     def create_event(self, event_type: ControlEvent, dt=None, status=None):
         return ControlEvent(event_type, dt, status, self._pong)
@@ -116,21 +108,17 @@ class WebSocketPongTerminal(IRemotePongTerminal):
             self._handle_ingoing_messages_async(), loop=self.event_loop
         )
 
-    def send_event(self, event):
+    def _send(self, payload):
         loop = asyncio.get_event_loop()
         # Execute event on the event loop in a blocking way
-        loop.run_until_complete(self.client.send(serialize(event)))
+        loop.run_until_complete(self.client.send(payload))
 
     async def _handle_ingoing_messages_async(self):
         assert self.running, "Client is not running"
         while self.running:
             message = await self.client.receive()
             if message is not None:
-                message = deserialize(message)
-                assert isinstance(
-                    message, pygame.event.Event
-                ), f"Expected {pygame.event.Event}, got {type(message)}"
-                pygame.event.post(message)
+                self.on_payload(message)
             elif self.running:
                 self.error(
                     "Receive operation returned None: the client may have been closed ahead of time"
@@ -0,0 +1,200 @@
+"""
+Headless simulation of Pong matches, driven by bots, as fast as the CPU allows.
+
+No display, no pygame event queue, and no sleeping are involved:
+bots decide paddle moves by looking at the model, which is then updated in fixed time steps.
+"""
+
+import time
+from dataclasses import dataclass, field
+from random import Random
+from typing import Callable, Iterable, Optional
+
+from dpongpy import PongGame, SimulationSettings
+from dpongpy.log import logger
+from dpongpy.model import Pong, Paddle, Direction
+
+
+class Bot:
+    def act(self, pong: Pong, paddle: Paddle) -> Direction:
+        raise NotImplementedError
+
+
+class IdleBot(Bot):
+    def act(self, pong: Pong, paddle: Paddle) -> Direction:
+        return Direction.NONE
+
+
+class TrackingBot(Bot):
+    '''
+    Moves the paddle towards the ball, along the paddle's axis.
+    '''
+    def __init__(self, tolerance: float = 0.25):
+        self.tolerance = tolerance
+
+    def act(self, pong: Pong, paddle: Paddle) -> Direction:
+        if paddle.side.is_horizontal:
+            delta, extent = pong.ball.y - paddle.y, paddle.height
+            negative, positive = Direction.UP, Direction.DOWN
+        else:
+            delta, extent = pong.ball.x - paddle.x, paddle.width
+            negative, positive = Direction.LEFT, Direction.RIGHT
+        if abs(delta) <= extent * self.tolerance:
+            return Direction.NONE
+        return positive if delta > 0 else negative
+
+
+class PredictiveBot(Bot):
+    '''
+    Moves the paddle towards the point where the ball is predicted to reach the paddle's plane,
+    or tracks the ball if it is moving away.
+    '''
+    def __init__(self, tolerance: float = 0.25):
+        self.tolerance = tolerance
+        self._fallback = TrackingBot(tolerance)
+
+    def act(self, pong: Pong, paddle: Paddle) -> Direction:
+        intercept = pong.predict_intercept(paddle.side)
+        if intercept is None or intercept.bounces > 1:
+            return self._fallback.act(pong, paddle)
+        if paddle.side.is_horizontal:
+            delta, extent = intercept.position.y - paddle.y, paddle.height
+            negative, positive = Direction.UP, Direction.DOWN
+        else:
+            delta, extent = intercept.position.x - paddle.x, paddle.width
+            negative, positive = Direction.LEFT, Direction.RIGHT
+        if abs(delta) <= extent * self.tolerance:
+            return Direction.NONE
+        return positive if delta > 0 else negative
+
+
+class RandomBot(Bot):
+    '''
+    Picks a random admissible direction, keeping it for a random amount of updates.
+    '''
+    def __init__(self, random: Optional[Random] = None, max_hold: int = 60):
+        self.random = random or Random()
+        self.max_hold = max_hold
+        self._current = Direction.NONE
+        self._hold = 0
+
+    def act(self, pong: Pong, paddle: Paddle) -> Direction:
+        if self._hold <= 0:
+            choices = [Direction.UP, Direction.DOWN] if paddle.side.is_horizontal else [Direction.LEFT, Direction.RIGHT]
+            self._current = self.random.choice(choices + [Direction.NONE])
+            self._hold = self.random.randint(1, self.max_hold)
+        self._hold -= 1
+        return self._current
+
+
+class ScriptedBot(Bot):
+    '''
+    Replays a script of `(time, direction)` pairs, sorted by time.
+    '''
+    def __init__(self, script: Iterable[tuple[float, Direction]]):
+        self.script = sorted(script, key=lambda entry: entry[0])
+        self._next = 0
+        self._current = Direction.NONE
+
+    def act(self, pong: Pong, paddle: Paddle) -> Direction:
+        while self._next < len(self.script) and self.script[self._next][0] <= pong.time:
+            self._current = self.script[self._next][1]
+            self._next += 1
+        return self._current
+
+
+BOTS: dict[str, Callable[[Random], Bot]] = {
+    "idle": lambda random: IdleBot(),
+    "tracking": lambda random: TrackingBot(),
+    "predictive": lambda random: PredictiveBot(),
+    "random": lambda random: RandomBot(random),
+}
+
+
+class HeadlessMatch:
+    def __init__(self, pong: Pong, bots: dict[Direction, Bot]):
+        assert set(bots.keys()) <= {paddle.side for paddle in pong.paddles}, "Bots must control existing paddles"
+        self.pong = pong
+        self.bots = bots
+        self._moves: dict[Direction, Optional[Direction]] = {side: None for side in bots}
+
+    def step(self, delta_time: float):
+        for side, bot in self.bots.items():
+            direction = bot.act(self.pong, self.pong.paddle(side))
+            if direction != self._moves[side]:
+                self.pong.move_paddle(side, direction)
+                self._moves[side] = direction
+        self.pong.update(delta_time)
+
+    @property
+    def moves(self) -> dict[Direction, Optional[Direction]]:
+        '''The direction each bot last moved its paddle in, by side (`None` before the first `step`).'''
+        return dict(self._moves)
+
+    def run(self, duration: float, delta_time: float):
+        steps = round(duration / delta_time)
+        for _ in range(steps):
+            self.step(delta_time)
+        return steps
+
+
+@dataclass
+class SimulationReport:
+    matches: int
+    updates: int
+    duration: float
+    wall_time: float
+    per_match: list[dict] = field(default_factory=list)
+
+    @property
+    def simulated_time(self) -> float:
+        return self.matches * self.duration
+
+    @property
+    def speedup(self) -> float:
+        '''How many times faster than real time the simulation was, overall.'''
+        return self.simulated_time / self.wall_time if self.wall_time > 0 else float('inf')
+
+    @property
+    def updates_per_second(self) -> float:
+        return self.updates / self.wall_time if self.wall_time > 0 else float('inf')
+
+    def __str__(self):
+        return (f"Simulated {self.matches} match(es) for {self.duration:.1f}s each "
+                f"in {self.wall_time:.3f}s: {self.updates} updates, "
+                f"{self.updates_per_second:,.0f} updates/s, {self.speedup:,.1f}x real time")
+
+
+def create_match(settings: SimulationSettings, random: Random) -> HeadlessMatch:
+    model = PongGame.model_class(settings.physics)
+    options = PongGame.model_options(settings)
+    options["random"] = random
+    pong = model(size=settings.size, config=settings.config, paddles=settings.paddles, **options)
+    bots = {side: BOTS[settings.bot](random) for side in settings.paddles}
+    return HeadlessMatch(pong, bots)
+
+
+def simulate(settings: Optional[SimulationSettings] = None) -> SimulationReport:
+    settings = settings or SimulationSettings()
+    random = Random(settings.seed)
+    matches = [create_match(settings, Random(random.random())) for _ in range(settings.matches)]
+    delta_time = PongGame.step_for(settings) or 1 / settings.fps
+    updates = 0
+    start = time.perf_counter()
+    for match in matches:
+        updates += match.run(settings.duration, delta_time)
+    wall_time = time.perf_counter() - start
+    report = SimulationReport(settings.matches, updates, settings.duration, wall_time)
+    for match in matches:
+        report.per_match.append({
+            "time": match.pong.time,
+            "updates": match.pong.updates,
+            "ball": tuple(match.pong.ball.position),
+        })
+    return report
+
+
+def main(settings: Optional[SimulationSettings] = None):
+    report = simulate(settings)
+    logger.info(str(report))
+    return report
@@ -0,0 +1,225 @@
+"""
+Low-overhead structured tracing.
+
+Hot paths guard every trace point with a flag check, e.g.:
+
+    if trace.MODEL.enabled:
+        trace.MODEL.record("%s moves: %s -> %s", obj.name, x, y)
+
+Records are stored unformatted (template + arguments) into a fixed-size in-memory ring buffer,
+so that formatting only happens when the buffer is dumped or printed.
+Arguments should be immutable scalars (numbers, strings, bytes), as they are formatted lazily.
+
+The buffer can be dumped into a compact binary file, which can be pretty-printed later via:
+
+    python -m dpongpy.trace <dump file>
+"""
+
+import struct
+import sys
+import time
+from dpongpy.log import logger
+
+
+DEFAULT_CAPACITY = 65536
+
+_MAGIC = b"DPTR"
+_VERSION = 1
+_HEADER = struct.Struct("!4sHI")
+_RECORD = struct.Struct("!qBHB")
+_U16 = struct.Struct("!H")
+_U32 = struct.Struct("!I")
+_I64 = struct.Struct("!q")
+_F64 = struct.Struct("!d")
+
+
+class Category:
+    __slots__ = ('name', 'id', 'enabled')
+
+    def __init__(self, name: str, id: int):
+        self.name = name
+        self.id = id
+        self.enabled = False
+
+    def __repr__(self):
+        return f'<{type(self).__name__}({self.name}, enabled={self.enabled})>'
+
+    def record(self, template: str, *args):
+        TRACER.record(self, template, args)
+
+
+class RingBuffer:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        assert capacity > 0, "Capacity must be positive"
+        self._items = [None] * capacity
+        self._next = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._items)
+
+    def __len__(self):
+        return self._size
+
+    def append(self, item):
+        self._items[self._next] = item
+        self._next = (self._next + 1) % len(self._items)
+        if self._size < len(self._items):
+            self._size += 1
+
+    def clear(self):
+        self._items = [None] * len(self._items)
+        self._next = 0
+        self._size = 0
+
+    def __iter__(self):
+        start = (self._next - self._size) % len(self._items)
+        for i in range(self._size):
+            yield self._items[(start + i) % len(self._items)]
+
+
+class Tracer:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.categories: dict[str, Category] = dict()
+        self.buffer = RingBuffer(capacity)
+
+    def category(self, name: str) -> Category:
+        if name not in self.categories:
+            self.categories[name] = Category(name, len(self.categories))
+        return self.categories[name]
+
+    def enable(self, *names: str):
+        for name in names or self.categories:
+            self._lookup(name).enabled = True
+
+    def disable(self, *names: str):
+        for name in names or self.categories:
+            self._lookup(name).enabled = False
+
+    def _lookup(self, name: str) -> Category:
+        if name not in self.categories:
+            raise KeyError(f"No such trace category: {name}. Available: {', '.join(self.categories)}")
+        return self.categories[name]
+
+    def record(self, category: Category, template: str, args: tuple):
+        self.buffer.append((time.time_ns(), category.id, template, args))
+
+    def records(self):
+        names = {category.id: category.name for category in self.categories.values()}
+        for timestamp, category, template, args in self.buffer:
+            yield timestamp, names[category], template, args
+
+    def dump(self, file) -> int:
+        """
+        Writes the content of the buffer into `file` (a path or a binary stream), in binary format.
+        Returns the number of records written.
+        """
+        if isinstance(file, str):
+            with open(file, "wb") as stream:
+                return self.dump(stream)
+        records = list(self.buffer)
+        unique = dict.fromkeys(template for _, _, template, _ in records)  # in order of appearance
+        templates = {template: index for index, template in enumerate(unique)}
+        file.write(_HEADER.pack(_MAGIC, _VERSION, len(records)))
+        names = sorted(self.categories.values(), key=lambda category: category.id)
+        _write_strings(file, [category.name for category in names])
+        _write_strings(file, list(templates))
+        for timestamp, category, template, args in records:
+            file.write(_RECORD.pack(timestamp, category, templates[template], len(args)))
+            for arg in args:
+                _write_value(file, arg)
+        logger.info("Dumped %d trace records", len(records))
+        return len(records)
+
+
+def _write_strings(file, strings: list[str]):
+    file.write(_U16.pack(len(strings)))
+    for string in strings:
+        data = string.encode()
+        file.write(_U32.pack(len(data)))
+        file.write(data)
+
+
+def _read_strings(file) -> list[str]:
+    count, = _U16.unpack(file.read(_U16.size))
+    result = []
+    for _ in range(count):
+        length, = _U32.unpack(file.read(_U32.size))
+        result.append(file.read(length).decode())
+    return result
+
+
+def _write_value(file, value):
+    if isinstance(value, bool) or not isinstance(value, (int, float, bytes, str)):
+        value = repr(value)
+    if isinstance(value, int):
+        file.write(b"i" + _I64.pack(value))
+    elif isinstance(value, float):
+        file.write(b"f" + _F64.pack(value))
+    else:
+        tag = b"b" if isinstance(value, bytes) else b"s"
+        data = value if isinstance(value, bytes) else value.encode()
+        file.write(tag + _U32.pack(len(data)) + data)
+
+
+def _read_value(file):
+    tag = file.read(1)
+    if tag == b"i":
+        return _I64.unpack(file.read(_I64.size))[0]
+    elif tag == b"f":
+        return _F64.unpack(file.read(_F64.size))[0]
+    length, = _U32.unpack(file.read(_U32.size))
+    data = file.read(length)
+    return data if tag == b"b" else data.decode()
+
+
+def load(file):
+    """
+    Reads a dump produced by `Tracer.dump`, yielding `(timestamp, category, template, args)` tuples.
+    """
+    if isinstance(file, str):
+        with open(file, "rb") as stream:
+            yield from load(stream)
+        return
+    magic, version, count = _HEADER.unpack(file.read(_HEADER.size))
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Not a dpongpy trace dump (version {_VERSION})")
+    categories = _read_strings(file)
+    templates = _read_strings(file)
+    for _ in range(count):
+        timestamp, category, template, argc = _RECORD.unpack(file.read(_RECORD.size))
+        args = tuple(_read_value(file) for _ in range(argc))
+        yield timestamp, categories[category], templates[template], args
+
+
+def format_record(timestamp: int, category: str, template: str, args: tuple) -> str:
+    seconds, nanos = divmod(timestamp, 1_000_000_000)
+    when = time.strftime("%H:%M:%S", time.localtime(seconds))
+    return f"{when}.{nanos // 1000:06d} [{category}] {template % args}"
+
+
+def pretty_print(file, output=sys.stdout):
+    for record in load(file):
+        print(format_record(*record), file=output)
+
+
+TRACER = Tracer()
+
+MODEL = TRACER.category("model")
+COLLISION = TRACER.category("collision")
+UDP = TRACER.category("udp")
+TCP = TRACER.category("tcp")
+
+
+def enable(*names: str):
+    TRACER.enable(*names)
+
+
+def disable(*names: str):
+    TRACER.disable(*names)
+
+
+def dump(file) -> int:
+    return TRACER.dump(file)
+
@@ -0,0 +1,8 @@
+import sys
+from dpongpy.trace import pretty_print
+
+
+if len(sys.argv) != 2:
+    print("Usage: python -m dpongpy.trace <dump file>", file=sys.stderr)
+    sys.exit(1)
+pretty_print(sys.argv[1])
@@ -13,12 +13,22 @@ class PongView:
     def __init__(self, pong: Pong):
         self._pong = pong
 
-    def render(self):
+    def capture(self):
+        """
+        Called right before each physics step, so that views can remember the previous state.
+        """
+        pass
+
+    def render(self, interpolation: float = 1.0):
+        """
+        Renders the current state. An interpolation factor lower than 1 asks for blending
+        the state captured before the last physics step with the current one.
+        """
         raise NotImplemented
 
 
 class ShowNothingPongView(PongView):
-    def render(self):
+    def render(self, interpolation: float = 1.0):
         pass
 
 
@@ -29,6 +39,8 @@ class ScreenPongView(PongView):
         super().__init__(pong)
         self._screen = screen or pygame.display.set_mode(pong.size)
         self._debug = debug
+        self._previous: dict[str, Vector2] = dict()
+        self._interpolation = 1.0
 
     def __getattr__(self, name):
         if not name.startswith("draw_"):
@@ -46,10 +58,24 @@ class ScreenPongView(PongView):
             return debug_draw
         return lambda *args, **kwargs: function(self._screen, *args, **kwargs)
 
-    def render(self):
+    def capture(self):
+        self._previous = {obj.name: obj.position for obj in self._pong.balls + self._pong.paddles}
+
+    def position_of(self, obj: GameObject) -> Vector2:
+        previous = self._previous.get(obj.name)
+        if previous is None or self._interpolation >= 1.0:
+            return obj.position
+        return previous.lerp(obj.position, max(self._interpolation, 0.0))
+
+    def bounds_of(self, obj: GameObject) -> Rect:
+        return Rect(self.position_of(obj) - obj.size / 2, obj.size)
+
+    def render(self, interpolation: float = 1.0):
+        self._interpolation = interpolation
         self._screen.fill("black")
         self.render_arena(self._pong)
-        self.render_ball(self._pong.ball)
+        for ball in self._pong.balls:
+            self.render_ball(ball)
         self.render_paddles(self._pong.paddles)
 
     def render_arena(self, pong: Pong):
@@ -58,14 +84,15 @@ class ScreenPongView(PongView):
         self.draw_debug_rect(Rect((0, 0), pong.size), width=1)
 
     def render_bounds(self, obj: GameObject):
-        self.draw_debug_rect(rect(obj.bounding_box), width=1)
+        self.draw_debug_rect(self.bounds_of(obj), width=1)
 
     def render_speed(self, obj: GameObject):
         if self._debug:
-            self.draw_line("blue", obj.position, obj.position + obj.speed, width=2)
+            position = self.position_of(obj)
+            self.draw_line("blue", position, position + obj.speed, width=2)
 
     def render_ball(self, ball: Ball):
-        self.draw_ellipse("white", rect(ball.bounding_box), width=0)
+        self.draw_ellipse("white", self.bounds_of(ball), width=0)
         self.render_bounds(ball)
         self.render_speed(ball)
 
@@ -74,6 +101,6 @@ class ScreenPongView(PongView):
             self.render_paddle(paddle)
 
     def render_paddle(self, paddle: Paddle):
-        self.draw_rect("white", rect(paddle.bounding_box), width=0)
+        self.draw_rect("white", self.bounds_of(paddle), width=0)
         self.render_bounds(paddle)
         self.render_speed(paddle)
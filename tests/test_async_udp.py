@@ -0,0 +1,111 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import asyncio
+import socket
+import time
+import unittest
+import pygame
+from dpongpy import DistributedSettings
+from dpongpy.controller import ControlEvent, create_event
+from dpongpy.model import Direction
+from dpongpy.remote import Address
+from dpongpy.remote.async_udp import AsyncUdpPongCoordinator, AsyncUdpPongTerminal
+from dpongpy.remote.batching import pack
+from dpongpy.remote.comm.udp.async_udp import Client, Server
+from dpongpy.remote.presentation import encode, decode_events
+
+
+class TestAsyncUdp(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    async def exchange(self):
+        requests, responses = asyncio.Queue(), asyncio.Queue()
+        server = await Server.open(lambda payload, sender: requests.put_nowait((payload, sender)), 0)
+        address = Address.localhost(server.local_address.port)
+        client = await Client.open(responses.put_nowait, address)
+        with server, client:
+            events = [create_event(ControlEvent.PLAYER_JOIN, paddle_index=Direction.LEFT),
+                      create_event(ControlEvent.STATE_ACK, frame=1)]
+            client.send(pack([encode(event, "binary") for event in events], "binary")[0])
+            payload, sender = await asyncio.wait_for(requests.get(), 1)
+            server.send(sender, "pong")
+            response = await asyncio.wait_for(responses.get(), 1)
+        return decode_events(payload), sender, response, client.local_address
+
+    def test_exchange(self):
+        events, sender, response, client_address = self.loop.run_until_complete(self.exchange())
+        self.assertEqual([ControlEvent.PLAYER_JOIN.value, ControlEvent.STATE_ACK.value], [e.type for e in events])
+        self.assertEqual(client_address.port, sender.port)
+        self.assertEqual(b"pong", response)
+
+    def test_closed_endpoints_do_not_send(self):
+        async def closed():
+            client = await Client.open(lambda payload: None, Address.localhost(9))
+            client.close()
+            client.send("ping")
+        with self.assertRaises(OSError):
+            self.loop.run_until_complete(closed())
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(("", 0))
+        return probe.getsockname()[1]
+
+
+class TestAsyncUdpGames(unittest.TestCase):
+    """Coordinator and terminal talking over loopback: their event loops are pumped in turn, rather than run."""
+
+    def setUp(self):
+        pygame.init()
+        pygame.event.clear()
+        port = free_port()
+        self.coordinator = AsyncUdpPongCoordinator(DistributedSettings(port=port))
+        self.terminal = AsyncUdpPongTerminal(DistributedSettings(port=port, initial_paddles=(Direction.LEFT,)))
+
+    def tearDown(self):
+        for game, endpoint in ((self.coordinator, self.coordinator.server), (self.terminal, self.terminal.client)):
+            endpoint.close()
+            game.event_loop.run_until_complete(asyncio.sleep(0))
+            game.event_loop.close()
+        pygame.quit()
+
+    def pump(self, game, until):
+        """Runs the event loop of game until the condition holds, e.g. because of datagrams from the other end."""
+        deadline = time.monotonic() + 1
+        while not until():
+            self.assertLess(time.monotonic(), deadline, "Nothing received")
+            game.event_loop.run_until_complete(asyncio.sleep(0.01))
+
+    def receive(self, game, event: ControlEvent):
+        """Runs the event loop of game until it posts event, then handles the events posted so far."""
+        self.pump(game, lambda: pygame.event.peek(event.value))
+        game.controller.handle_events()
+
+    def test_join_status_and_leave(self):
+        self.terminal.send_event(create_event(ControlEvent.PLAYER_JOIN, paddle_index=Direction.LEFT))
+        self.receive(self.coordinator, ControlEvent.PLAYER_JOIN)
+        self.assertEqual([Direction.LEFT], [paddle.side for paddle in self.coordinator.pong.paddles])
+        [peer] = self.coordinator.peers
+
+        self.coordinator.pong.update(1 / 60)
+        self.coordinator._broadcast_status(self.coordinator.pong, 1 / 60)
+        self.coordinator.flush()
+        self.receive(self.terminal, ControlEvent.TIME_ELAPSED)
+        self.assertEqual(1, self.terminal.states.frame)
+        self.assertEqual(self.coordinator.pong.snapshot().state, self.terminal.pong.snapshot().state)
+        self.assertTrue(self.terminal.coordinator_batches)
+        self.terminal.flush()
+        self.pump(self.coordinator, lambda: self.coordinator.states.baseline_of(peer) == 1)
+
+        self.terminal.send_event(create_event(ControlEvent.PLAYER_LEAVE, paddle_index=Direction.LEFT))
+        self.terminal.flush()
+        self.receive(self.coordinator, ControlEvent.PLAYER_LEAVE)
+        self.assertEqual([], self.coordinator.pong.paddles)
+        self.assertIsNone(self.coordinator.states.baseline_of(peer))
+        self.assertFalse(self.coordinator.running)
@@ -0,0 +1,113 @@
+import unittest
+from random import Random
+from dpongpy.model import *
+from dpongpy.model.batch import PongBatch, hits
+import numpy as np
+
+
+class TestHits(unittest.TestCase):
+    def test_same_as_rectangle_hits(self):
+        random = Random(42)
+        for _ in range(500):
+            a = Rectangle((random.uniform(0, 4), random.uniform(0, 4)), (random.uniform(0, 4), random.uniform(0, 4)))
+            b = Rectangle((random.uniform(0, 4), random.uniform(0, 4)), (random.uniform(0, 4), random.uniform(0, 4)))
+            subject = np.array([a.left, a.top, a.right, a.bottom])
+            other = np.array([b.left, b.top, b.right, b.bottom])
+            try:
+                expected = a.hits(b)
+            except ValueError:
+                self.assertTrue(hits(subject, other)[4])
+                continue
+            dx, dy, flip_x, flip_y, invalid = hits(subject, other)
+            with self.subTest(subject=a, other=b):
+                self.assertFalse(invalid)
+                pushed = sum((d.value * -delta for d, delta in expected.items() if delta > 0), Vector2())
+                self.assertEqual(Vector2(float(dx), float(dy)), pushed)
+                self.assertEqual(bool(flip_x), any(d.is_horizontal and v > 0 for d, v in expected.items()))
+                self.assertEqual(bool(flip_y), any(d.is_vertical and v > 0 for d, v in expected.items()))
+
+
+class TestPredictIntercept(unittest.TestCase):
+    def test_same_as_pong(self):
+        pongs = [Pong(size=(800, 600), random=Random(i)) for i in range(50)]
+        for pong in pongs[::3]:
+            pong.remove_paddle(Direction.LEFT)
+        batch = PongBatch.from_pongs(pongs)
+        for side in (Direction.LEFT, Direction.RIGHT, Direction.UP):
+            delay, position, bounces = batch.predict_intercept(side)
+            for i, pong in enumerate(pongs):
+                expected = pong.predict_intercept(side)
+                with self.subTest(side=side, match=i):
+                    if expected is None:
+                        self.assertEqual(delay[i], np.inf)
+                    else:
+                        self.assertEqual(delay[i], expected.delay)
+                        self.assertEqual(Vector2(position[i].tolist()), expected.position)
+                        self.assertEqual(bounces[i], expected.bounces)
+
+
+class TestPongBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.size = Vector2(800, 600)
+        self.pongs = [Pong(size=self.size, random=Random(i)) for i in range(5)]
+        self.batch = PongBatch.from_pongs(self.pongs)
+
+    def assertSameState(self, batch: PongBatch, pongs: list[Pong]):
+        for i, expected in enumerate(pongs):
+            actual = batch.to_pong(i)
+            with self.subTest(match=i):
+                self.assertEqual(actual.updates, expected.updates)
+                self.assertEqual(actual.time, expected.time)
+                self.assertEqual(actual.ball, expected.ball)
+                self.assertEqual(
+                    {paddle.side: paddle for paddle in actual.paddles},
+                    {paddle.side: paddle for paddle in expected.paddles}
+                )
+
+    def test_initial_state(self):
+        self.assertEqual(len(self.batch), len(self.pongs))
+        self.assertSameState(self.batch, self.pongs)
+
+    def test_update_matches_pong(self):
+        directions = [Direction.UP, Direction.DOWN, Direction.NONE]
+        for step in range(1000):
+            if step % 37 == 0:
+                for side in (Direction.LEFT, Direction.RIGHT):
+                    direction = directions[(step // 37 + int(side == Direction.RIGHT)) % 3]
+                    self.batch.move_paddle(side, direction)
+                    for pong in self.pongs:
+                        pong.move_paddle(side, direction)
+            self.batch.update(0.05)
+            for pong in self.pongs:
+                pong.update(0.05)
+        self.assertSameState(self.batch, self.pongs)
+
+    def test_update_matches_pong_with_missing_paddles(self):
+        pongs = [Pong(size=self.size, random=Random(i)) for i in range(30)]
+        for pong in pongs[::3]:
+            pong.remove_paddle(Direction.LEFT)
+        for pong in pongs[1::3]:
+            pong.add_paddle(Direction.UP)
+        batch = PongBatch.from_pongs(pongs)
+        for _ in range(1000):
+            batch.update(0.05)
+            for pong in pongs:
+                pong.update(0.05)
+        self.assertSameState(batch, pongs)
+
+    def test_move_paddle_on_subset(self):
+        self.batch.move_paddle(Direction.LEFT, Direction.UP, matches=[0, 2])
+        self.pongs[0].move_paddle(Direction.LEFT, Direction.UP)
+        self.pongs[2].move_paddle(Direction.LEFT, Direction.UP)
+        self.assertSameState(self.batch, self.pongs)
+
+    def test_move_missing_paddle(self):
+        with self.assertRaises(KeyError):
+            self.batch.move_paddle(Direction.UP, Direction.LEFT)
+
+    def test_create_many(self):
+        batch = PongBatch(1000, self.size)
+        self.assertEqual(batch.ball_position.shape, (1000, 2))
+        self.assertTrue(np.all(batch.ball_position == self.size / 2))
+        batch.update(1 / 60)
+        self.assertTrue(np.all(batch.updates == 1))
@@ -0,0 +1,127 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import unittest
+from random import Random
+import pygame
+from dpongpy import DistributedSettings
+from dpongpy.controller import ControlEvent, create_event
+from dpongpy.model import Pong, Direction
+from dpongpy.remote import binary, compression
+from dpongpy.remote.batching import Outbox, pack
+from dpongpy.remote.centralised.ipong_terminal import IRemotePongTerminal
+from dpongpy.remote.negotiation import PeerFormats, advertisement
+from dpongpy.remote.presentation import CODECS, encode, envelope, decode, decode_events
+
+
+class TestBatching(unittest.TestCase):
+    def setUp(self):
+        self.pong = Pong((800, 600), paddles=[Direction.LEFT, Direction.RIGHT], random=Random(1))
+        self.events = [
+            create_event(ControlEvent.PADDLE_MOVE, paddle_index=Direction.LEFT, direction=Direction.UP),
+            create_event(ControlEvent.TIME_ELAPSED, dt=0.1, status=self.pong),
+            create_event(ControlEvent.STATE_ACK, frame=7),
+        ]
+
+    def assertSameEvents(self, expected, actual):
+        self.assertEqual([event.type for event in expected], [event.type for event in actual])
+        self.assertEqual(self.pong.balls, actual[1].status.balls)
+        self.assertEqual(7, actual[2].frame)
+
+    def test_envelope_round_trip(self):
+        for codec in CODECS:
+            with self.subTest(codec=codec):
+                payload = envelope([encode(event, codec) for event in self.events], codec)
+                self.assertSameEvents(self.events, decode_events(payload))
+                self.assertEqual(self.events[:1], decode_events(encode(self.events[0], codec)))
+
+    def test_compressed_envelope_round_trip(self):
+        payload = compression.Compressor().compress(envelope([encode(event) for event in self.events]))
+        self.assertTrue(compression.is_compressed(payload))
+        self.assertSameEvents(self.events, decode_events(payload))
+
+    def test_pack_respects_limit_and_order(self):
+        for codec in CODECS:
+            with self.subTest(codec=codec):
+                payloads = [encode(event, codec) for event in self.events * 4]
+                limit = 2 * max(len(payload) for payload in payloads) + 16
+                packed = pack(payloads, codec, limit)
+                self.assertLess(1, len(packed))
+                self.assertLess(len(packed), len(payloads))
+                self.assertTrue(all(len(payload) <= limit for payload in packed))
+                events = [event for payload in packed for event in decode_events(payload)]
+                self.assertEqual([event.type for event in self.events * 4], [event.type for event in events])
+
+    def test_lone_messages_are_not_wrapped(self):
+        payload = encode(self.events[0], "binary")
+        self.assertEqual([payload], pack([payload], "binary"))
+        self.assertEqual([], pack([], "json"))
+        self.assertEqual(self.events[:1], decode(pack([payload], "binary", wrap=True)[0]))
+        self.assertEqual([payload], pack([payload], "binary", limit=len(payload), wrap=True))
+
+    def test_outbox_packs_once_per_format(self):
+        formats = PeerFormats(compressed=True)
+        formats.negotiate("a", advertisement())
+        formats.negotiate("b", advertisement())
+        formats.negotiate("d", advertisement(compressed=True))
+        outbox = Outbox(formats)
+        for event in self.events:
+            outbox.put(event, ["a", "b", "c", "d"])
+        flushed = {}
+        for peer, payload in outbox.flush():
+            flushed.setdefault(peer, []).append(payload)
+        self.assertEqual(1, len(flushed["a"]))
+        self.assertIs(flushed["a"][0], flushed["b"][0])
+        self.assertTrue(binary.is_binary(flushed["a"][0]))
+        self.assertEqual(len(self.events), len(flushed["c"]))  # legacy peers get one message at a time
+        self.assertTrue(compression.is_compressed(flushed["d"][0]))
+        for peer in "abd":
+            self.assertSameEvents(self.events, decode(flushed[peer][0]))
+        self.assertEqual([], list(outbox.flush()))
+
+    def test_outbox_announces_envelopes_to_joining_peers(self):
+        formats = PeerFormats()
+        formats.negotiate("a", advertisement())
+        outbox = Outbox(formats)
+        outbox.announce("a")
+        outbox.announce("b")
+        received = []
+        for _ in range(2):
+            outbox.put(self.events[0], ["a", "b"])
+            flushed = dict(outbox.flush())
+            self.assertEqual(self.events[0], decode(flushed["b"]))  # legacy peers never get envelopes
+            received.append(decode(flushed["a"]))
+        self.assertEqual([self.events[:1], self.events[0]], received)
+
+
+class TestTerminalBatching(unittest.TestCase):
+    class Terminal(IRemotePongTerminal):
+        def initialize(self):
+            self.sent = []
+
+        def _send(self, payload):
+            self.sent.append(payload)
+
+    def setUp(self):
+        pygame.init()
+        self.terminal = self.Terminal(DistributedSettings(initial_paddles=(Direction.LEFT,)))
+        self.events = [create_event(ControlEvent.PADDLE_MOVE, paddle_index=Direction.LEFT, direction=Direction.UP),
+                       create_event(ControlEvent.STATE_ACK, frame=1)]
+
+    def tearDown(self):
+        pygame.quit()
+
+    def send_and_flush(self):
+        self.terminal.sent.clear()
+        for event in self.events:
+            self.terminal.send_event(event)
+        self.terminal.flush()
+        return self.terminal.sent
+
+    def test_no_envelopes_until_the_coordinator_sends_one(self):
+        self.assertEqual(2, len(self.send_and_flush()))
+        self.terminal.on_payload(encode(self.events[1]))
+        self.assertEqual(2, len(self.send_and_flush()))
+        self.terminal.on_payload(envelope([encode(self.events[1])]))
+        [payload] = self.send_and_flush()
+        self.assertEqual([event.type for event in self.events], [event.type for event in decode_events(payload)])
@@ -0,0 +1,76 @@
+import unittest
+from benchmarks.suite import BENCHMARKS, run, compare
+from benchmarks import dictionary
+from dpongpy.remote.traffic import record_payloads
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_run(self):
+        report = run(["gameobject.bounding_box"], repeat=1, min_time=0.001)
+        self.assertEqual(len(report["results"]), len(BENCHMARKS["gameobject.bounding_box"].grid["moving"]))
+        for result in report["results"]:
+            self.assertGreater(result["seconds_per_call"], 0)
+            self.assertIn("moving", result["params"])
+
+    def test_grid(self):
+        cases = list(BENCHMARKS["pong.update"].cases())
+        self.assertEqual(len(cases), 2 * 2 * 3)
+        self.assertIn({"paddles": 4, "size": "800x600", "fps": 60}, cases)
+
+    def test_compare(self):
+        baseline = {"results": [
+            {"name": "a", "params": {"x": 1}, "seconds_per_call": 1.0},
+            {"name": "b", "params": {}, "seconds_per_call": 1.0},
+        ]}
+        current = {"results": [
+            {"name": "a", "params": {"x": 1}, "seconds_per_call": 1.05},
+            {"name": "b", "params": {}, "seconds_per_call": 1.5},
+            {"name": "c", "params": {}, "seconds_per_call": 1.0},
+        ]}
+        comparison = compare(baseline, current, threshold=0.1)
+        self.assertEqual([entry["key"] for entry in comparison], ["a[x=1]", "b[]"])
+        self.assertEqual([entry["regression"] for entry in comparison], [False, True])
+
+
+class TestDictionaryTraining(unittest.TestCase):
+    def test_training_is_deterministic(self):
+        samples = list(record_payloads())
+        self.assertEqual(dictionary.train(samples), dictionary.train(samples))
+        self.assertLessEqual(len(dictionary.train(samples, 512)), 512)
+        self.assertIn(b'"$type": "Vector2"', dictionary.train(samples))
+
+
+class TestSerializationBenchmark(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from benchmarks import serialization
+        cls.corpus = serialization.record_corpus(duration=0.25)
+        cls.events = [serialization.deserialize(line) for line in cls.corpus]
+
+    def test_corpus(self):
+        import os
+        import tempfile
+        from benchmarks import serialization
+        kinds = {serialization.kind_of(event) for event in self.events}
+        for kind in ["PADDLE_MOVE", "PLAYER_JOIN", "PLAYER_LEAVE", "GAME_OVER", "TIME_ELAPSED/delta",
+                     "TIME_ELAPSED/status/2p", "TIME_ELAPSED/status/3p", "TIME_ELAPSED/status/4p"]:
+            self.assertIn(kind, kinds)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.jsonl")
+            serialization.save(self.corpus, path)
+            self.assertEqual(self.corpus, serialization.load(path))
+
+    def test_conformance(self):
+        from benchmarks import serialization
+        self.assertEqual([], serialization.check(self.events))
+        event = self.events[-1]
+        other = next(other for other in self.events if other.type != event.type)
+        self.assertFalse(serialization.conforms(event, other))
+
+    def test_measure(self):
+        from benchmarks import serialization
+        result = serialization.measure(self.events[:50], "binary", compressed=True, repeat=1)
+        self.assertEqual(50, result["messages"])
+        self.assertGreater(result["encode_per_second"], 0)
+        self.assertGreater(result["bytes_per_message"], 0)
+        self.assertGreater(result["decode_peak_bytes"], 0)
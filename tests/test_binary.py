@@ -0,0 +1,84 @@
+import unittest
+from random import Random
+from pygame.event import Event
+from dpongpy.controller import ControlEvent, create_event
+from dpongpy.model import Pong, Direction
+from dpongpy.remote import binary
+from dpongpy.remote.presentation import encode, decode, serialize
+
+
+def sample_pong(balls: int = 1) -> Pong:
+    pong = Pong((800, 600), paddles=[Direction.LEFT, Direction.RIGHT, Direction.UP], random=Random(1), balls=balls)
+    pong.move_paddle(Direction.LEFT, Direction.UP)
+    for _ in range(30):
+        pong.update(1 / 60)
+    return pong
+
+
+def wire_state(pong: Pong):
+    '''The part of a snapshot which travels on the wire (the random generator does not).'''
+    return pong.snapshot()._replace(random=None)
+
+
+class TestBinaryCodec(unittest.TestCase):
+    def assertSameEvent(self, expected: Event, actual: Event):
+        self.assertEqual(expected.type, actual.type)
+        self.assertEqual(expected.dict, actual.dict)
+
+    def test_pong_round_trip(self):
+        for balls in (1, 3):
+            pong = sample_pong(balls)
+            decoded = decode(encode(pong, "binary"))
+            self.assertEqual(wire_state(pong), wire_state(decoded))
+            self.assertEqual(pong.config, decoded.config)
+            self.assertEqual(pong.balls, decoded.balls)
+            self.assertEqual(pong.paddles, decoded.paddles)
+
+    def test_control_events_round_trip(self):
+        events = [
+            create_event(ControlEvent.PLAYER_JOIN, paddle_index=Direction.LEFT),
+            create_event(ControlEvent.PLAYER_LEAVE, paddle_index=Direction.DOWN),
+            create_event(ControlEvent.GAME_START),
+            create_event(ControlEvent.GAME_START, seed=2 ** 32 - 1),
+            create_event(ControlEvent.GAME_OVER),
+            create_event(ControlEvent.PADDLE_MOVE, paddle_index=Direction.RIGHT, direction=Direction.NONE),
+            create_event(ControlEvent.TIME_ELAPSED, dt=1 / 60),
+        ]
+        for event in events:
+            with self.subTest(event=event):
+                payload = encode(event, "binary")
+                self.assertTrue(binary.is_binary(payload))
+                self.assertNotEqual(binary.KIND_JSON, payload[2])
+                self.assertSameEvent(event, decode(payload))
+
+    def test_time_elapsed_with_status(self):
+        pong = sample_pong()
+        event = create_event(ControlEvent.TIME_ELAPSED, dt=1 / 60, status=pong)
+        decoded = decode(encode(event, "binary"))
+        self.assertEqual(1 / 60, decoded.dt)
+        self.assertEqual(wire_state(pong), wire_state(decoded.status))
+
+    def test_smaller_than_json(self):
+        event = create_event(ControlEvent.TIME_ELAPSED, dt=1 / 60, status=sample_pong())
+        self.assertLess(len(encode(event, "binary")) * 4, len(serialize(event).encode()))
+
+    def test_json_fallback(self):
+        event = create_event(ControlEvent.PLAYER_JOIN, paddle_index=Direction.LEFT, extra="field")
+        payload = encode(event, "binary")
+        self.assertEqual(binary.KIND_JSON, payload[2])
+        self.assertSameEvent(event, decode(payload))
+
+    def test_json_still_decoded(self):
+        event = create_event(ControlEvent.PADDLE_MOVE, paddle_index=Direction.LEFT, direction=Direction.UP)
+        for payload in (encode(event), encode(event).encode()):
+            self.assertSameEvent(event, decode(payload))
+
+    def test_version_mismatch(self):
+        payload = bytearray(encode(create_event(ControlEvent.GAME_OVER), "binary"))
+        payload[1] = binary.VERSION + 1
+        with self.assertRaises(ValueError):
+            decode(bytes(payload))
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            encode(sample_pong(), "xml")
@@ -0,0 +1,63 @@
+import unittest
+import zlib
+from random import Random
+from dpongpy import SimulationSettings
+from dpongpy.controller import ControlEvent, create_event
+from dpongpy.model import Pong, Direction
+from dpongpy.remote import compression
+from dpongpy.remote.presentation import encode, decode
+from dpongpy.remote.traffic import record_payloads
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.compressor = compression.Compressor()
+        self.pong = Pong((800, 600), paddles=[Direction.LEFT, Direction.RIGHT], random=Random(3))
+        self.pong.update(0.5)
+
+    def test_round_trip(self):
+        event = create_event(ControlEvent.TIME_ELAPSED, dt=1 / 60, status=self.pong)
+        for codec in ("json", "binary"):
+            with self.subTest(codec=codec):
+                payload = self.compressor.compress(encode(event, codec))
+                self.assertTrue(compression.is_compressed(payload))
+                self.assertEqual(self.pong.balls, decode(payload).status.balls)
+
+    def test_incompressible_payloads_are_left_alone(self):
+        random = Random(0)
+        payload = bytes(random.getrandbits(8) for _ in range(64))
+        self.assertIs(payload, self.compressor.compress(payload))
+        self.assertEqual(1, self.compressor.stats.messages)
+        self.assertEqual(0, self.compressor.stats.compressed)
+
+    def test_dictionary_beats_plain_zlib(self):
+        settings = SimulationSettings(physics="lockstep", seed=11, duration=1.0,
+                                      paddles=(Direction.LEFT, Direction.UP, Direction.RIGHT))
+        payloads = [payload.encode() for payload in record_payloads(settings)]
+        for payload in payloads:
+            self.compressor.compress(payload)
+        plain = sum(len(payload) for payload in payloads) / sum(len(zlib.compress(payload)) for payload in payloads)
+        self.assertGreater(self.compressor.stats.ratio, 2 * plain)
+        self.assertGreater(self.compressor.stats.compress_time, 0)
+
+    def test_dictionaries_are_shipped(self):
+        for id, (_, expected) in compression._DICTIONARIES.items():
+            self.assertEqual(expected, compression.fingerprint(compression.dictionary(id)))
+        self.assertIn(b'"$type": "Vector2"', compression.dictionary(compression.DEFAULT_DICTIONARY_ID))
+
+    def test_modified_dictionaries_are_rejected(self):
+        compression._DICTIONARIES[99] = ("1.zdict", 0)
+        try:
+            with self.assertRaises(ValueError):
+                compression.dictionary(99)
+        finally:
+            del compression._DICTIONARIES[99]
+
+    def test_negotiation(self):
+        self.assertEqual(compression.DEFAULT_DICTIONARY_ID, compression.negotiate(compression.fingerprints()))
+        self.assertIsNone(compression.negotiate([0]))
+        self.assertIsNone(compression.negotiate(None))
+
+    def test_unknown_dictionary(self):
+        with self.assertRaises(ValueError):
+            compression.decompress(bytes([compression.MAGIC, 200, 0]))
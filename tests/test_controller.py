@@ -0,0 +1,31 @@
+import unittest
+import pygame
+from dpongpy.controller import ControlEvent, PlayerAction, create_event
+from dpongpy.model import Direction
+
+
+class TestPlayerAction(unittest.TestCase):
+    def test_all_moves(self):
+        self.assertEqual(PlayerAction.all_moves(), {
+            PlayerAction.MOVE_UP, PlayerAction.MOVE_DOWN, PlayerAction.MOVE_LEFT, PlayerAction.MOVE_RIGHT
+        })
+        self.assertEqual(len(PlayerAction.all()), len(PlayerAction.__members__))
+
+    def test_to_direction(self):
+        self.assertEqual(PlayerAction.MOVE_UP.to_direction(), Direction.UP)
+        self.assertEqual(PlayerAction.MOVE_LEFT.to_direction(), Direction.LEFT)
+        self.assertEqual(PlayerAction.STOP.to_direction(), Direction.NONE)
+        self.assertIsNone(PlayerAction.QUIT.to_direction())
+
+
+class TestControlEvent(unittest.TestCase):
+    def test_by_value(self):
+        for control_event in ControlEvent.all():
+            self.assertIs(ControlEvent.by_value(control_event.value), control_event)
+        with self.assertRaises(KeyError):
+            ControlEvent.by_value(-1)
+
+    def test_is_control_event(self):
+        self.assertTrue(ControlEvent.is_control_event(create_event(ControlEvent.PADDLE_MOVE)))
+        self.assertFalse(ControlEvent.is_control_event(pygame.event.Event(pygame.KEYDOWN)))
+        self.assertTrue(ControlEvent.is_control_event(ControlEvent.GAME_START))
@@ -0,0 +1,257 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import threading
+import unittest
+from random import Random
+from typing import Optional
+import pygame
+from dpongpy import DistributedSettings
+from dpongpy.controller import ControlEvent, create_event
+from dpongpy.model import Pong, Direction
+from dpongpy.remote.centralised.ipong_coordinator import IRemotePongCoordinator
+from dpongpy.remote.centralised.ipong_terminal import IRemotePongTerminal
+from dpongpy.remote.delta import DeltaSender, DeltaReceiver, FrameHistory, RESTART_KEYFRAMES
+from dpongpy.remote.negotiation import Format, LEGACY_CODEC, advertisement
+from dpongpy.remote.presentation import Quantization, encode, decode
+
+
+def wire_state(pong: Pong):
+    return pong.snapshot()._replace(random=None)
+
+
+class TestFrameHistory(unittest.TestCase):
+    def test_eviction(self):
+        history = FrameHistory(4)
+        pong = Pong((800, 600))
+        for frame in range(1, 7):
+            history.put(frame, pong.snapshot())
+        self.assertNotIn(2, history)
+        self.assertIn(3, history)
+        self.assertIsNone(history.get(1))
+
+
+class TestDeltaStream(unittest.TestCase):
+    def setUp(self):
+        self.pong = Pong((800, 600), paddles=[Direction.LEFT, Direction.RIGHT], random=Random(5))
+        self.sender = DeltaSender(history=8)
+        self.sender.stream_to("a")
+        self.sender.stream_to("b")
+
+    def step(self, moves=()):
+        for side, direction in moves:
+            self.pong.move_paddle(side, direction)
+        self.pong.update(1 / 60)
+        return self.sender.messages(self.pong, ["a", "b"], 1 / 60)
+
+    def test_keyframes_until_acknowledged(self):
+        [(event, peers)] = self.step()
+        self.assertIs(event.status, self.pong)
+        self.assertEqual(["a", "b"], peers)
+        self.sender.acknowledge("a", event.frame)
+        messages = dict((tuple(peers), event) for event, peers in self.step())
+        self.assertEqual(1, messages[("a",)].baseline)
+        self.assertNotIn("status", messages[("a",)].dict)
+        self.assertIs(self.pong, messages[("b",)].status)
+
+    def test_legacy_peers_get_plain_statuses(self):
+        self.sender.forget("b")
+        self.step()
+        self.sender.acknowledge("a", 1)
+        messages = dict((tuple(peers), event) for event, peers in self.step())
+        self.assertEqual(create_event(ControlEvent.TIME_ELAPSED, dt=1 / 60, status=self.pong), messages[("b",)])
+        self.assertEqual(2, messages[("a",)].frame)
+
+    def test_stale_baseline_falls_back_to_keyframe(self):
+        [(event, _)] = self.step()
+        self.sender.acknowledge("a", event.frame)
+        for _ in range(self.sender.history.capacity):
+            self.step()
+        self.assertIsNone(self.sender.baseline_of("a"))
+        [(event, peers)] = self.step()
+        self.assertIn("status", event.dict)
+
+    def test_acknowledgements_never_go_back(self):
+        self.step()
+        self.step()
+        self.sender.acknowledge("a", 2)
+        self.sender.acknowledge("a", 1)
+        self.assertEqual(2, self.sender.baseline_of("a"))
+
+    def test_deltas_are_computed_once_per_baseline(self):
+        self.step()
+        self.step([(Direction.LEFT, Direction.UP)])
+        delta = self.sender.delta(1, self.pong)
+        self.assertIs(delta, self.sender.delta(1, self.pong))
+        baseline = Pong((800, 600), paddles=[])
+        baseline.restore(self.sender.history.get(1))
+        self.assertEqual(baseline.diff(self.pong), delta)
+        self.step()
+        self.assertIsNot(delta, self.sender.delta(1, self.pong))  # deltas of past frames are dropped
+
+    def test_delta_is_smaller(self):
+        [(keyframe, _)] = self.step()
+        self.sender.acknowledge("a", keyframe.frame)
+        self.sender.acknowledge("b", keyframe.frame)
+        [(delta, _)] = self.step()
+        for codec in ("json", "binary"):
+            self.assertLess(len(encode(delta, codec)) * 2, len(encode(keyframe, codec)))
+
+    def test_reconstruction(self):
+        for codec in ("json", "binary"):
+            with self.subTest(codec=codec):
+                self.setUp()
+                self.stream(codec, Random(1))
+
+    def test_snapshot_reconstruction(self):
+        for codec in ("json", "binary"):
+            with self.subTest(codec=codec):
+                self.setUp()
+                self.stream(codec, Random(2), snapshots=True)
+
+    def test_quantized_reconstruction(self):
+        quantization = Quantization(16)
+        for codec in ("json", "binary"):
+            with self.subTest(codec=codec):
+                self.setUp()
+                self.stream(codec, Random(1), quantization=quantization)
+
+    def assertSameStatus(self, expected: Pong, actual: Pong, quantization: Optional[Quantization] = None):
+        if quantization is None:
+            self.assertEqual(wire_state(expected), wire_state(actual))
+            return
+        # errors do not pile up over deltas: each value is as far from the truth as its latest quantization
+        tolerance = max(quantization.max_error(extent, Quantization.SPEED_RANGE) for extent in expected.size)
+        expected_state, actual_state = wire_state(expected), wire_state(actual)
+        self.assertEqual(expected_state._replace(state=None), actual_state._replace(state=None))
+        for original, decoded in zip(expected_state.state, actual_state.state):
+            self.assertAlmostEqual(original, decoded, delta=tolerance)
+
+    def stream(self, codec: str, random: Random, frames: int = 300, quantization: Optional[Quantization] = None,
+               snapshots: bool = False):
+        receivers = {"a": DeltaReceiver(8), "b": DeltaReceiver(8)}
+        sides = [Direction.LEFT, Direction.RIGHT]
+        for index in range(frames):
+            if index == 100:
+                self.pong.add_ball()
+            if index == 150:
+                self.pong.add_paddle(Direction.UP)
+            if index == 200:
+                self.pong.remove_paddle(Direction.LEFT)
+                sides.remove(Direction.LEFT)
+            moves = [(random.choice(sides), random.choice([Direction.UP, Direction.DOWN, Direction.NONE]))]
+            for event, peers in self.step(moves):
+                payload = encode(event, codec, quantization)
+                for peer in peers:
+                    if random.random() < 0.2:
+                        continue  # lost message
+                    received = decode(payload, snapshots)
+                    status = receivers[peer].receive(received.frame, received.dict.get("status"),
+                                                     received.dict.get("baseline"), received.dict.get("delta"))
+                    if status is None:
+                        continue
+                    self.assertSameStatus(self.pong, status, quantization)
+                    if random.random() < 0.2:
+                        continue  # lost acknowledgement
+                    ack = decode(encode(create_event(ControlEvent.STATE_ACK, frame=received.frame), codec))
+                    self.assertTrue(ControlEvent.STATE_ACK.matches(ack))
+                    self.sender.acknowledge(peer, ack.frame)
+        self.assertIsNotNone(self.sender.baseline_of("a"))
+
+    def test_stale_frames_are_ignored(self):
+        receiver = DeltaReceiver()
+        [(first, _)] = self.step()
+        [(second, _)] = self.step()
+        self.assertIsNotNone(receiver.receive(second.frame, second.status))
+        self.assertIsNone(receiver.receive(first.frame, first.status))
+
+    def test_coordinator_restarts(self):
+        receiver = DeltaReceiver()
+        for _ in range(10):
+            [(event, _)] = self.step()
+            receiver.receive(event.frame, event.status)
+        self.sender = DeltaSender(history=8)  # restarted: frames are numbered from 1 again
+        self.sender.stream_to("a")
+        self.sender.stream_to("b")
+        keyframes = [self.step()[0][0] for _ in range(RESTART_KEYFRAMES)]
+        received = [receiver.receive(event.frame, event.status) for event in keyframes]
+        self.assertEqual([None] * (RESTART_KEYFRAMES - 1), received[:-1])
+        self.assertIsNotNone(received[-1])
+        self.assertEqual(RESTART_KEYFRAMES, receiver.frame)
+
+    def test_long_jumps_back_are_restarts(self):
+        receiver = DeltaReceiver(history=4)
+        receiver.frame = 100
+        [(event, _)] = self.step()
+        self.assertIsNotNone(receiver.receive(event.frame, event.status))
+        self.assertEqual(1, receiver.frame)
+
+    def test_unknown_baseline_is_ignored(self):
+        receiver = DeltaReceiver()
+        [(event, _)] = self.step()
+        self.sender.acknowledge("a", event.frame)
+        self.sender.acknowledge("b", event.frame)
+        [(event, _)] = self.step()
+        self.assertIsNone(receiver.receive(event.frame, baseline=event.baseline, delta=event.delta))
+
+
+class TestLeavingPeers(unittest.TestCase):
+    class Coordinator(IRemotePongCoordinator):
+        def initialize(self):
+            self._peers = set()
+            self._lock = threading.RLock()
+
+    def setUp(self):
+        pygame.init()
+        self.coordinator = self.Coordinator(DistributedSettings())
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_peers_are_forgotten_when_leaving(self):
+        join = create_event(ControlEvent.PLAYER_JOIN, paddle_index=Direction.LEFT)
+        self.coordinator.on_message(advertisement(), "a")
+        self.coordinator.on_message(join, "a")
+        self.coordinator.states.messages(self.coordinator.pong, ["a"], 1 / 60)
+        self.coordinator.on_message(create_event(ControlEvent.STATE_ACK, frame=1), "a")
+        self.assertEqual(1, self.coordinator.states.baseline_of("a"))
+        self.assertTrue(self.coordinator.formats.format_of("a").batched)
+        self.coordinator.on_message(create_event(ControlEvent.PLAYER_LEAVE, paddle_index=Direction.LEFT), "a")
+        self.assertIsNone(self.coordinator.states.baseline_of("a"))
+        self.assertEqual(Format(LEGACY_CODEC), self.coordinator.formats.format_of("a"))
+
+    def test_legacy_peers_get_plain_statuses(self):
+        sent = []
+        self.coordinator._send_payload = lambda peer, payload: sent.append((peer, decode(payload)))
+        self.coordinator.on_payload(encode(advertisement()), "a")
+        for peer, side in (("a", Direction.LEFT), ("b", Direction.RIGHT)):
+            self.coordinator.on_payload(encode(create_event(ControlEvent.PLAYER_JOIN, paddle_index=side)), peer)
+        self.coordinator._broadcast_status(self.coordinator.pong, 1 / 60)
+        self.coordinator.flush()
+        received = dict(sent)
+        self.assertEqual({"dt", "status"}, received["b"].dict.keys())  # as sent by coordinators predating deltas
+        self.assertEqual(1, received["a"][0].frame)
+
+
+class TestTerminalAcknowledgements(unittest.TestCase):
+    class Terminal(IRemotePongTerminal):
+        def initialize(self):
+            self.sent = []
+
+        def _send(self, payload):
+            self.sent.append(decode(payload))
+
+    def setUp(self):
+        pygame.init()
+        self.terminal = self.Terminal(DistributedSettings(initial_paddles=(Direction.LEFT,)))
+        self.pong = Pong((800, 600), paddles=[Direction.LEFT, Direction.RIGHT], random=Random(5))
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_only_numbered_frames_are_acknowledged(self):
+        controller = self.terminal.controller
+        controller.on_time_elapsed(self.terminal.pong, 1 / 60, status=self.pong)  # from coordinators streaming no frames
+        self.assertEqual([], self.terminal.sent)
+        controller.on_time_elapsed(self.terminal.pong, 1 / 60, status=self.pong, frame=1)
+        self.assertEqual([create_event(ControlEvent.STATE_ACK, frame=1)], self.terminal.sent)
@@ -0,0 +1,83 @@
+import unittest
+from random import Random
+from dpongpy.model import *
+from dpongpy.model.event_driven import EventDrivenPong, time_of_impact
+
+
+class TestTimeOfImpact(unittest.TestCase):
+    def test_approaching(self):
+        self.assertEqual(time_of_impact((0, 0, 1, 1), (1, 0), (3, 0, 4, 1), (0, 0)), (2, True, False))
+        self.assertEqual(time_of_impact((0, 0, 1, 1), (0, 2), (0, 3, 1, 4), (0, 0)), (1, False, True))
+
+    def test_both_moving(self):
+        self.assertEqual(time_of_impact((0, 0, 1, 1), (1, 0), (3, 0, 4, 1), (-1, 0)), (1, True, False))
+
+    def test_corner(self):
+        self.assertEqual(time_of_impact((0, 0, 1, 1), (1, 1), (2, 2, 3, 3), (0, 0)), (1, True, True))
+
+    def test_missing(self):
+        self.assertIsNone(time_of_impact((0, 0, 1, 1), (1, 0), (3, 2, 4, 3), (0, 0)))
+        self.assertIsNone(time_of_impact((0, 0, 1, 1), (-1, 0), (3, 0, 4, 1), (0, 0)))
+        self.assertIsNone(time_of_impact((0, 0, 1, 1), (0, 0), (3, 0, 4, 1), (0, 0)))
+
+    def test_touching_and_leaving(self):
+        self.assertIsNone(time_of_impact((2, 0, 3, 1), (-1, 0), (3, 0, 4, 1), (0, 0)))
+
+
+class TestEventDrivenPong(unittest.TestCase):
+    def setUp(self) -> None:
+        self.size = Vector2(800, 600)
+        self.pong = EventDrivenPong(size=self.size, random=Random(0))
+
+    def assertInside(self, obj: GameObject):
+        left, top, right, bottom = obj.bounds
+        self.assertGreaterEqual(left, -1e-6)
+        self.assertGreaterEqual(top, -1e-6)
+        self.assertLessEqual(right, self.size.x + 1e-6)
+        self.assertLessEqual(bottom, self.size.y + 1e-6)
+
+    def test_next_impact(self):
+        self.pong.reset_ball((400, 0))
+        impact = self.pong.next_impact
+        paddle = self.pong.paddle(Direction.RIGHT)
+        expected = (paddle.bounds[0] - self.pong.ball.bounds[2]) / 400
+        self.assertEqual(impact.obstacle, paddle)
+        self.assertAlmostEqual(impact.time, expected)
+        self.assertTrue(impact.horizontal)
+        self.assertFalse(impact.vertical)
+
+    def test_no_tunnelling_with_large_steps(self):
+        self.pong.reset_ball((400, 0))
+        self.pong.update(10)
+        self.assertAlmostEqual(self.pong.time, 10)
+        self.assertEqual(self.pong.updates, 1)
+        self.assertLess(self.pong.ball.x, self.pong.paddle(Direction.RIGHT).bounds[0])
+        self.assertGreater(self.pong.ball.x, self.pong.paddle(Direction.LEFT).bounds[2])
+
+    def test_stays_inside_table(self):
+        directions = [Direction.UP, Direction.DOWN, Direction.NONE]
+        for i in range(500):
+            if i % 20 == 0:
+                self.pong.move_paddle(Direction.LEFT, directions[i // 20 % 3])
+            self.pong.update(0.75)
+            self.assertInside(self.pong.ball)
+            for paddle in self.pong.paddles:
+                self.assertInside(paddle)
+
+    def test_move_paddle_replans(self):
+        self.pong.reset_ball((-400, 0))
+        before = self.pong.next_impact
+        self.pong.move_paddle(Direction.LEFT, Direction.UP)
+        after = self.pong.next_impact
+        self.assertIsNot(before, after)
+        self.assertIs(before.obstacle, self.pong.paddle(Direction.LEFT))
+        self.assertIs(after.obstacle, self.pong.table.borders[Direction.LEFT])
+
+    def test_close_to_stepped_simulation(self):
+        stepped = Pong(size=self.size, random=Random(0))
+        stepped.reset_ball((300, 200))
+        self.pong.reset_ball((300, 200))
+        for _ in range(120):
+            stepped.update(1 / 120)
+            self.pong.update(1 / 120)
+        self.assertLess(self.pong.ball.position.distance_to(stepped.ball.position), 5)
@@ -0,0 +1,58 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import unittest
+import pygame
+from dpongpy import PongGame, DistributedSettings
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent, post_event
+
+
+class TestFixedTimestep(unittest.TestCase):
+    def setUp(self) -> None:
+        pygame.init()
+        self.settings = DistributedSettings(physics_fps=100, max_physics_steps=5)
+        self.game = PongGame(self.settings)
+        self.game.pong.reset_ball((100, 0))
+
+    def tearDown(self) -> None:
+        pygame.quit()
+
+    def test_steps_are_fixed(self):
+        interpolation = self.game.simulate(0.025)
+        self.assertEqual(self.game.pong.updates, 2)
+        self.assertAlmostEqual(self.game.pong.time, 0.02)
+        self.assertAlmostEqual(interpolation, 0.5)
+
+    def test_accumulates_short_frames(self):
+        self.game.simulate(0.004)
+        self.assertEqual(self.game.pong.updates, 0)
+        self.game.simulate(0.007)
+        self.assertEqual(self.game.pong.updates, 1)
+
+    def test_inputs_are_handled_without_steps(self):
+        pygame.event.clear()
+        post_event(ControlEvent.PADDLE_MOVE, paddle_index=Direction.LEFT, direction=Direction.UP)
+        self.game.simulate(0.004)
+        self.assertEqual(self.game.pong.updates, 0)
+        self.assertLess(self.game.pong.paddle(Direction.LEFT).speed.y, 0)
+
+    def test_max_steps_per_frame(self):
+        interpolation = self.game.simulate(1.0)
+        self.assertEqual(self.game.pong.updates, 5)
+        self.assertLess(interpolation, 1.0)
+        self.game.simulate(0.0)
+        self.assertEqual(self.game.pong.updates, 5)
+
+    def test_variable_step(self):
+        self.settings.physics_fps = None
+        self.assertEqual(self.game.simulate(0.123), 1.0)
+        self.assertEqual(self.game.pong.updates, 1)
+        self.assertAlmostEqual(self.game.pong.time, 0.123)
+
+    def test_render_interpolates(self):
+        self.game.simulate(0.015)
+        view = self.game.view
+        self.game.view.render(0.5)
+        ball = self.game.pong.ball
+        self.assertEqual(view.position_of(ball), ball.position - ball.speed * 0.005)
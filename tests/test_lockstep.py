@@ -0,0 +1,81 @@
+import unittest
+from random import Random
+from dpongpy import PongGame, SimulationSettings
+from dpongpy.model import Direction, Vector2
+from dpongpy.model.lockstep import LockstepPong, quantize, is_dyadic, RESOLUTION_BITS
+
+
+def on_grid(value: float) -> bool:
+    return value == quantize(value)
+
+
+class TestQuantize(unittest.TestCase):
+    def test_quantize(self):
+        self.assertEqual(quantize(1.3), 333 / 256)
+        self.assertEqual(quantize(-0.001), 0.0)
+        self.assertEqual(quantize(0.5, bits=0), 1.0)
+
+    def test_is_dyadic(self):
+        self.assertTrue(is_dyadic(1 / 64))
+        self.assertTrue(is_dyadic(3.0))
+        self.assertFalse(is_dyadic(1 / 60))
+
+
+class TestLockstepPong(unittest.TestCase):
+    inputs = {
+        10: (Direction.LEFT, Direction.UP),
+        50: (Direction.RIGHT, Direction.DOWN),
+        120: (Direction.LEFT, Direction.NONE),
+        300: (Direction.RIGHT, Direction.UP),
+    }
+
+    def play(self, pong: LockstepPong, steps: int = 2000):
+        for index in range(steps):
+            if index in self.inputs:
+                pong.move_paddle(*self.inputs[index])
+            pong.update(pong.step)
+        return pong
+
+    def test_same_seed_same_state(self):
+        first = self.play(LockstepPong((800, 600), seed=42))
+        second = self.play(LockstepPong((800, 600), seed=42))
+        self.assertEqual(first.snapshot(), second.snapshot())
+        self.assertEqual(first.checksum(), second.checksum())
+
+    def test_different_seed_different_state(self):
+        first = self.play(LockstepPong((800, 600), seed=1), steps=10)
+        second = self.play(LockstepPong((800, 600), seed=2), steps=10)
+        self.assertNotEqual(first.checksum(), second.checksum())
+
+    def test_state_is_quantized(self):
+        pong = self.play(LockstepPong((801, 599), seed=7), steps=500)
+        for obj in pong.balls + pong.paddles:
+            for value in (*obj.position, *obj.speed, *obj.size):
+                self.assertTrue(on_grid(value), f"{obj.name}: {value} is not a multiple of 2 ** -{RESOLUTION_BITS}")
+        self.assertEqual(pong.time, 500 * pong.step)
+
+    def test_serve_speed(self):
+        pong = LockstepPong((800, 600), seed=3)
+        self.assertAlmostEqual(pong.ball.speed.length(), 600 * pong.config.ball_speed_ratio, delta=0.01)
+
+    def test_reseed(self):
+        pong = LockstepPong((800, 600), seed=3)
+        pong.reseed(5)
+        pong.reset_ball()
+        self.assertEqual(pong.ball.speed, LockstepPong((800, 600), seed=5).ball.speed)
+
+    def test_fixed_step(self):
+        pong = LockstepPong((800, 600), step=1 / 128)
+        pong.update()
+        self.assertEqual(pong.time, 1 / 128)
+        with self.assertRaises(ValueError):
+            pong.update(1 / 60)
+        with self.assertRaises(ValueError):
+            LockstepPong((800, 600), step=1 / 60)
+
+    def test_simulation(self):
+        settings = SimulationSettings(physics="lockstep", duration=2.0, seed=11)
+        self.assertIs(PongGame.model_class("lockstep"), LockstepPong)
+        self.assertEqual(PongGame.step_for(settings), 1 / 64)
+        from dpongpy.sim import simulate
+        self.assertEqual(simulate(settings).per_match, simulate(settings).per_match)
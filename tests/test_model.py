@@ -1,5 +1,6 @@
 import unittest
 from dpongpy.model import *
+from random import Random
 import math
 
 
@@ -16,6 +17,14 @@ class TestDirection(unittest.TestCase):
         self.assertFalse(Direction.UP.is_horizontal)
         self.assertFalse(Direction.DOWN.is_horizontal)
 
+    def test_none_is_neither_vertical_nor_horizontal(self):
+        self.assertFalse(Direction.NONE.is_vertical)
+        self.assertFalse(Direction.NONE.is_horizontal)
+
+    def test_values(self):
+        self.assertEqual(Direction.values(), (Direction.NONE, Direction.LEFT, Direction.UP, Direction.RIGHT, Direction.DOWN))
+        self.assertIs(Direction.values(), Direction.values())
+
 
 class TestRectangle(unittest.TestCase):
     @staticmethod
@@ -223,8 +232,109 @@ class TestRectangle(unittest.TestCase):
         with self.subTest(rect='center', doesnt_hit=f'other'):
             hits = center.hits(self.other)
             self.assertEqual(hits, {})
+
+    def test_collide_is_same_as_hits(self):
+        for a in self.all_rectangles():
+            for b in self.all_rectangles():
+                with self.subTest(rect=a, other=b):
+                    try:
+                        expected = list(a.hits(b).items())
+                    except ValueError:
+                        self.assertRaises(ValueError, collide, *a.bounds, *b.bounds)
+                        continue
+                    self.assertEqual(list(collide(*a.bounds, *b.bounds)), expected)
+
+    def test_collide_is_same_as_hits_on_random_rectangles(self):
+        random = Random(0)
+        def random_rectangle():
+            return Rectangle(*((random.uniform(0, 4), random.uniform(0, 4)) for _ in range(2)))
+        for _ in range(1000):
+            a, b = random_rectangle(), random_rectangle()
+            with self.subTest(rect=a, other=b):
+                try:
+                    expected = list(a.hits(b).items())
+                except ValueError:
+                    self.assertRaises(ValueError, collide, *a.bounds, *b.bounds)
+                    continue
+                self.assertEqual(list(collide(*a.bounds, *b.bounds)), expected)
     
 
+class TestGameObject(unittest.TestCase):
+    def setUp(self) -> None:
+        self.obj = GameObject(size=(2, 2), position=(10, 10), speed=(3, -4))
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.obj, '__dict__'))
+        self.assertFalse(hasattr(Paddle((1, 1), Direction.LEFT), '__dict__'))
+
+    def test_held_properties_are_not_updated(self):
+        position = self.obj.position
+        self.obj.update(1)
+        self.assertEqual(position, Vector2(10, 10))
+        self.assertEqual(self.obj.position, Vector2(13, 6))
+
+    def test_properties_are_mutable_in_place(self):
+        self.assertEqual(self.obj.bounds, (9, 9, 11, 11))
+        self.obj.position.x += 1
+        self.obj.speed.y = 0
+        self.obj.size *= 2
+        self.assertEqual(self.obj.position, Vector2(11, 10))
+        self.assertEqual(self.obj.speed, Vector2(3, 0))
+        self.assertEqual(self.obj.bounds, (9, 8, 13, 12))
+        self.assertEqual(self.obj.bounding_box, Rectangle(Vector2(9, 8), Vector2(13, 12)))
+        self.obj.update(1)
+        self.assertEqual(self.obj.bounds, (12, 8, 16, 12))
+        paddle = Paddle((1, 4), Direction.LEFT, position=(0, 0))
+        paddle.position.y = 5
+        self.assertEqual(paddle.bounds, (-0.5, 3, 0.5, 7))
+
+    def test_update_is_in_place(self):
+        position, speed = self.obj._position, self.obj._speed
+        self.obj.update(0.5)
+        self.obj.bounce(Direction.UP, 1)
+        self.obj.position = (0, 0)
+        self.assertIs(self.obj._position, position)
+        self.assertIs(self.obj._speed, speed)
+
+    def test_bounce(self):
+        self.obj.bounce(Direction.UP, 1.5)
+        self.assertEqual(self.obj.position, Vector2(10, 11.5))
+        self.assertEqual(self.obj.speed, Vector2(3, 4))
+        self.obj.bounce(Direction.RIGHT, 2)
+        self.assertEqual(self.obj.position, Vector2(8, 11.5))
+        self.assertEqual(self.obj.speed, Vector2(-3, 4))
+
+    def test_bounding_box_is_cached(self):
+        box = self.obj.bounding_box
+        self.assertIs(self.obj.bounding_box, box)
+        self.assertEqual(box, Rectangle((9, 9), (11, 11)))
+        self.assertEqual(self.obj.bounds, (9, 9, 11, 11))
+
+    def test_bounding_box_is_invalidated(self):
+        box = self.obj.bounding_box
+        self.obj.update(1)
+        self.assertEqual(self.obj.bounding_box, Rectangle((12, 5), (14, 7)))
+        self.obj.size = (4, 4)
+        self.assertEqual(self.obj.bounds, (11, 4, 15, 8))
+        self.obj.bounce(Direction.LEFT, 1)
+        self.assertEqual(self.obj.bounds, (12, 4, 16, 8))
+        self.assertEqual(box, Rectangle((9, 9), (11, 11)))
+
+    def test_rectangle_methods(self):
+        other = GameObject(size=(2, 2), position=(11, 11))
+        self.assertTrue(self.obj.overlaps(other))
+        self.assertFalse(self.obj.is_inside(other))
+        self.assertEqual(self.obj.intersection_with(other), Rectangle((10, 10), (11, 11)))
+        self.assertEqual(self.obj.hits(other), {Direction.DOWN: 1, Direction.RIGHT: 1})
+
+    def test_override(self):
+        other = GameObject(size=(1, 1), position=(5, 5), speed=(1, 1))
+        self.obj.override(other)
+        self.assertEqual(self.obj, other)
+        other.update(1)
+        self.assertNotEqual(self.obj, other)
+
+
 class TestPong(unittest.TestCase):
     def setUp(self) -> None:
         self.size = Vector2(160, 90)
@@ -252,6 +362,11 @@ class TestPong(unittest.TestCase):
     def test_two_paddles(self):
         self.assertEqual(len(self.pong.paddles), 2)
 
+    def test_paddles_keep_the_given_order(self):
+        sides = [Direction.DOWN, Direction.LEFT, Direction.UP, Direction.RIGHT]
+        pong = Pong(self.size, paddles=sides + [Direction.LEFT])
+        self.assertEqual(sides, [paddle.side for paddle in pong.paddles])
+
     def test_paddle_size(self):
         self.assertEqual(self.pong.size, self.size)
 
@@ -348,4 +463,286 @@ class TestPong(unittest.TestCase):
 
     def test_collision_with_right_paddle(self):
         self._test_collisions(Direction.RIGHT)
-    
\ No newline at end of file
+    
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pong = Pong(size=(800, 600), random=Random(1))
+        self.pong.move_paddle(Direction.LEFT, Direction.UP)
+
+    def positions(self):
+        return [self.pong.ball.position] + [paddle.position for paddle in self.pong.paddles]
+
+    def test_restore(self):
+        snapshot = self.pong.snapshot()
+        expected = self.positions()
+        for _ in range(10):
+            self.pong.update(0.1)
+        self.assertNotEqual(self.positions(), expected)
+        self.pong.restore(snapshot)
+        self.assertEqual(self.positions(), expected)
+        self.assertEqual(self.pong.updates, 0)
+        self.assertEqual(self.pong.time, 0)
+        self.assertEqual(self.pong.snapshot(), snapshot)
+
+    def test_restore_random_state(self):
+        snapshot = self.pong.snapshot()
+        self.pong.reset_ball()
+        speed = self.pong.ball.speed
+        self.pong.reset_ball()
+        self.pong.restore(snapshot)
+        self.pong.reset_ball()
+        self.assertEqual(self.pong.ball.speed, speed)
+
+    def test_restore_paddles(self):
+        snapshot = self.pong.snapshot()
+        self.pong.remove_paddle(Direction.LEFT)
+        self.pong.add_paddle(Direction.UP)
+        self.pong.restore(snapshot)
+        self.assertEqual({paddle.side for paddle in self.pong.paddles}, {Direction.LEFT, Direction.RIGHT})
+        self.assertEqual(self.pong.paddle(Direction.LEFT).speed, Vector2(0, -120))
+        self.assertEqual(self.pong.paddle(Direction.LEFT).size, Vector2(8, 60))
+
+    def test_restore_into_empty_pong(self):
+        self.pong.add_ball()
+        self.pong.update(0.1)
+        empty = Pong(size=(800, 600), paddles=[])
+        empty.balls = []
+        empty.restore(self.pong.snapshot())
+        self.assertEqual(empty.balls, self.pong.balls)
+        self.assertEqual(empty.paddles, self.pong.paddles)
+        self.assertEqual(empty.snapshot(), self.pong.snapshot())
+        empty.ball.override(self.pong.ball)
+
+
+class TestSnapshotRing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pong = Pong(size=(800, 600))
+        self.ring = SnapshotRing(4)
+
+    def test_keyed_by_update(self):
+        for _ in range(6):
+            self.ring.record(self.pong)
+            self.pong.update(0.01)
+        self.assertEqual(len(self.ring), 4)
+        self.assertNotIn(1, self.ring)
+        self.assertIn(2, self.ring)
+        self.assertEqual(self.ring[5].updates, 5)
+        self.assertEqual(self.ring.latest.updates, 5)
+        self.assertIsNone(self.ring.get(0))
+        with self.assertRaises(KeyError):
+            self.ring[6]
+
+    def test_at_or_before(self):
+        for updates in (0, 2, 3):
+            self.pong.updates = updates
+            self.ring.record(self.pong)
+        self.assertEqual(self.ring.at_or_before(1).updates, 0)
+        self.assertEqual(self.ring.at_or_before(10).updates, 3)
+        self.assertIsNone(SnapshotRing(2).at_or_before(3))
+
+    def test_for_duration(self):
+        self.assertEqual(SnapshotRing.for_duration(2, 60).capacity, 120)
+
+
+class TestPongDiff(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pong = Pong(size=(800, 600), random=Random(0))
+        self.other = Pong(size=(800, 600), random=Random(0))
+
+    def assertSamePong(self, actual: Pong, expected: Pong):
+        self.assertEqual(actual.balls, expected.balls)
+        self.assertEqual(
+            {paddle.side: paddle for paddle in actual.paddles},
+            {paddle.side: paddle for paddle in expected.paddles}
+        )
+        self.assertEqual((actual.updates, actual.time), (expected.updates, expected.time))
+
+    def test_empty_diff(self):
+        self.assertFalse(self.pong.diff(self.other))
+
+    def test_only_changed_fields(self):
+        self.other.update(0.1)
+        diff = self.pong.diff(self.other)
+        self.assertEqual(set(diff.ball.keys()), {'position'})
+        self.assertEqual(diff.paddles, {})
+        self.assertEqual((diff.updates, diff.time), (1, 0.1))
+        self.assertIsNone(diff.size)
+        self.assertIsNone(diff.config)
+
+    def test_paddle_changes(self):
+        self.other.move_paddle(Direction.LEFT, Direction.DOWN)
+        self.other.remove_paddle(Direction.RIGHT)
+        self.other.add_paddle(Direction.UP)
+        diff = self.pong.diff(self.other)
+        self.assertEqual(diff.paddles, {Direction.LEFT: {'speed': Vector2(0, 120)}})
+        self.assertEqual([paddle.side for paddle in diff.added], [Direction.UP])
+        self.assertEqual(diff.removed, [Direction.RIGHT])
+
+    def test_apply_in_place(self):
+        ball, left = self.pong.ball, self.pong.paddle(Direction.LEFT)
+        self.other.move_paddle(Direction.LEFT, Direction.DOWN)
+        self.other.add_paddle(Direction.UP)
+        for _ in range(5):
+            self.other.update(0.1)
+        self.pong.apply(self.pong.diff(self.other))
+        self.assertSamePong(self.pong, self.other)
+        self.assertIs(self.pong.ball, ball)
+        self.assertIs(self.pong.paddle(Direction.LEFT), left)
+
+    def test_apply_relative_diff(self):
+        self.other.add_paddle(Direction.UP)
+        self.other.update(0.1)
+        diff = self.pong.diff(self.other)
+        self.assertEqual(diff.extent, Vector2(800, 600))
+        self.pong.apply(diff.rescaled(Vector2(1, 1)))
+        self.assertEqual(self.pong.ball.position, self.other.ball.position)
+        self.assertEqual(self.pong.paddle(Direction.UP).position, self.other.paddle(Direction.UP).position)
+        self.assertEqual(self.pong.paddle(Direction.UP).size, self.other.paddle(Direction.UP).size)
+        self.assertIsNot(self.pong.paddle(Direction.UP), self.other.paddle(Direction.UP))
+
+    def test_override(self):
+        self.other.remove_paddle(Direction.RIGHT)
+        self.other.update(0.1)
+        added, removed = self.pong.override(self.other)
+        self.assertEqual(added, {})
+        self.assertEqual(set(removed.keys()), {Direction.RIGHT})
+        self.assertSamePong(self.pong, self.other)
+
+
+class TestMultiBall(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pong = Pong(size=(800, 600), random=Random(0), balls=3)
+
+    def test_single_ball_by_default(self):
+        pong = Pong(size=(800, 600))
+        self.assertEqual(pong.balls, [pong.ball])
+
+    def test_balls(self):
+        self.assertEqual(len(self.pong.balls), 3)
+        self.assertIs(self.pong.ball, self.pong.balls[0])
+        self.assertEqual(len({ball.name for ball in self.pong.balls}), 3)
+
+    def test_add_and_remove_ball(self):
+        ball = self.pong.add_ball(speed=(10, 0), position=(100, 100))
+        self.assertIs(self.pong.balls[-1], ball)
+        self.assertEqual(ball.speed, Vector2(10, 0))
+        self.pong.remove_ball(ball)
+        self.assertNotIn(ball, self.pong.balls)
+
+    def test_border_half_planes_match_borders(self):
+        for direction, position in {Direction.UP: (400, 10), Direction.DOWN: (400, 590),
+                                    Direction.LEFT: (10, 300), Direction.RIGHT: (790, 300)}.items():
+            with self.subTest(direction=direction):
+                ball = Ball(size=(30, 30), position=position, speed=(5, 5))
+                expected = ball.copy()
+                self.pong._handle_border_collisions(ball)
+                self.pong._handle_collisions(expected, self.pong.table.borders.values())
+                self.assertEqual(ball, expected)
+
+    def test_candidate_pairs(self):
+        self.pong.balls = [Ball((30, 30), (400, 300)), Ball((30, 30), (420, 300)), Ball((30, 30), (400, 500))]
+        self.pong.balls.append(Ball((30, 30), self.pong.paddle(Direction.LEFT).position))
+        pairs = {(a.position.x, a.position.y, b.position.x, b.position.y) for a, b in self.pong._candidate_pairs()}
+        left = self.pong.paddle(Direction.LEFT).position
+        self.assertEqual(pairs, {(400, 300, 420, 300), (left.x, left.y, left.x, left.y)})
+
+    def test_balls_bounce_off_each_other(self):
+        self.pong.balls = [Ball((30, 30), (380, 300), (100, 0)), Ball((30, 30), (420, 300), (-50, 0))]
+        for _ in range(10):
+            self.pong.update(0.05)
+        first, second = self.pong.balls
+        self.assertEqual((first.speed, second.speed), (Vector2(-50, 0), Vector2(100, 0)))
+        self.assertLessEqual(first.bounds[2], second.bounds[0])
+
+    def test_snapshot(self):
+        snapshot = self.pong.snapshot()
+        expected = [ball.copy() for ball in self.pong.balls]
+        self.pong.remove_ball(self.pong.balls[-1])
+        self.pong.update(0.1)
+        self.pong.restore(snapshot)
+        self.assertEqual(self.pong.balls, expected)
+
+    def test_diff(self):
+        other = Pong(size=(800, 600), random=Random(0), balls=3)
+        other.add_ball()
+        other.update(0.1)
+        diff = self.pong.diff(other)
+        self.assertEqual(len(diff.added_balls), 1)
+        self.assertEqual(set(diff.balls.keys()), {1, 2})
+        self.pong.apply(diff)
+        self.assertEqual(self.pong.balls, other.balls)
+        other.remove_ball(other.balls[-1])
+        self.pong.apply(self.pong.diff(other))
+        self.assertEqual(self.pong.balls, other.balls)
+
+    def test_diff_without_balls(self):
+        empty = Pong(size=(800, 600), random=Random(0), balls=1)
+        empty.remove_ball(empty.ball)
+        single = Pong(size=(800, 600), random=Random(0), balls=1)
+        single.update(0.1)
+        diff = empty.diff(single)
+        self.assertEqual((diff.ball, len(diff.added_balls)), ({}, 1))
+        self.assertEqual(single.diff(empty).removed_balls, 1)
+        for source, target in [(empty, single), (single, empty)]:
+            with self.subTest(balls=len(target.balls)):
+                pong = Pong(size=(800, 600), random=Random(0), balls=len(source.balls))
+                pong.override(source)
+                pong.override(target)
+                self.assertEqual(pong.balls, target.balls)
+
+    def test_no_ball(self):
+        pong = Pong(size=(800, 600), random=Random(0))
+        pong.remove_ball(pong.ball)
+        with self.assertRaises(IndexError):
+            pong.ball
+        pong.reset_ball()
+        self.assertEqual(pong.balls, [pong.ball])
+
+
+class TestPredictIntercept(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pong = Pong(size=(800, 600))
+
+    def step_until_plane(self, side: Direction, dt: float = 0.0005):
+        plane = self.pong._plane_of(side)
+        axis = 0 if side.is_horizontal else 1
+        edge = 2 + axis if side.value[axis] > 0 else axis
+        time = 0.0
+        while (plane - self.pong.ball.bounds[edge]) * side.value[axis] > 0:
+            self.pong.update(dt)
+            time += dt
+        return time
+
+    def test_fold(self):
+        self.assertEqual(fold(5, 0, 10), (5, 0))
+        self.assertEqual(fold(12, 0, 10), (8, 1))
+        self.assertEqual(fold(-3, 0, 10), (3, 1))
+        self.assertEqual(fold(25, 0, 10), (5, 2))
+
+    def test_towards_paddle(self):
+        self.pong.reset_ball((-300, 500))
+        intercept = self.pong.predict_intercept(Direction.LEFT)
+        self.assertEqual(intercept.bounces, 1)
+        self.assertEqual(intercept.position.x, self.pong._plane_of(Direction.LEFT) + self.pong.ball.width / 2)
+        time = self.step_until_plane(Direction.LEFT)
+        self.assertAlmostEqual(intercept.delay, time, delta=0.001)
+        self.assertAlmostEqual(intercept.position.y, self.pong.ball.y, delta=1)
+
+    def test_away_from_paddle(self):
+        self.pong.remove_paddle(Direction.RIGHT)
+        self.pong.reset_ball((300, 40))
+        intercept = self.pong.predict_intercept(Direction.LEFT)
+        self.assertEqual(intercept.bounces, 1)
+        time = self.step_until_plane(Direction.RIGHT) + self.step_until_plane(Direction.LEFT)
+        self.assertAlmostEqual(intercept.delay, time, delta=0.002)
+
+    def test_vertical_side_without_paddle(self):
+        self.pong.reset_ball((10, -200))
+        intercept = self.pong.predict_intercept(Direction.UP)
+        self.assertEqual(intercept.position.y, self.pong.ball.height / 2)
+        self.assertAlmostEqual(intercept.delay, (300 - self.pong.ball.height / 2) / 200)
+
+    def test_never(self):
+        self.pong.reset_ball((0, 100))
+        self.assertIsNone(self.pong.predict_intercept(Direction.LEFT))
@@ -0,0 +1,97 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import unittest
+from random import Random
+import pygame
+from pygame.event import Event
+from dpongpy import DistributedSettings
+from dpongpy.controller import ControlEvent, create_event
+from dpongpy.model import Pong, Direction
+from dpongpy.remote import binary, compression
+from dpongpy.remote.centralised.ipong_terminal import IRemotePongTerminal
+from dpongpy.remote.negotiation import Format, PeerFormats, advertisement, is_advertisement, negotiate_codec, \
+    ADVERTISEMENT, LEGACY_CODEC, JSON_VERSION
+from dpongpy.remote.presentation import encode, decode
+
+
+class TestNegotiation(unittest.TestCase):
+    def setUp(self):
+        self.formats = PeerFormats(compressed=True)
+
+    def received(self, event):
+        return decode(encode(event, "binary"))
+
+    def test_advertisement(self):
+        advertised = self.received(advertisement("binary"))
+        self.assertTrue(is_advertisement(advertised))
+        self.assertFalse(ControlEvent.is_control_event(advertised))
+        self.assertEqual(binary.VERSION, advertised.codecs["binary"])
+        self.assertEqual("binary", next(iter(advertised.codecs)))
+        self.assertNotIn("compression", advertised.dict)
+        self.assertEqual(compression.fingerprints(), self.received(advertisement(compressed=True)).compression)
+
+    def test_advertisement_is_no_control_event_for_older_peers(self):
+        payload = encode(advertisement(), LEGACY_CODEC)
+        self.assertNotIn(ControlEvent.__name__, payload)  # older peers only fail on control events they do not know
+        self.assertTrue(is_advertisement(decode(payload)))
+
+    def test_codec_choice(self):
+        self.assertEqual("binary", negotiate_codec({"json": JSON_VERSION, "binary": binary.VERSION}))
+        self.assertEqual("json", negotiate_codec({"json": JSON_VERSION, "binary": binary.VERSION}, preferred="json"))
+        self.assertEqual("json", negotiate_codec({"json": JSON_VERSION, "binary": binary.VERSION - 1}))
+        self.assertEqual(LEGACY_CODEC, negotiate_codec(None))
+
+    def test_only_current_versions_are_batched(self):
+        self.formats.negotiate("a", Event(ADVERTISEMENT, codecs={"json": JSON_VERSION - 1}))
+        self.assertEqual(Format(LEGACY_CODEC), self.formats.format_of("a"))
+
+    def test_peers_advertising_nothing_are_legacy(self):
+        format = self.formats.negotiate("a", self.received(advertisement(compressed=True)))
+        self.assertEqual(Format("binary", compression.DEFAULT_DICTIONARY_ID, batched=True), format)
+        self.assertEqual(format, self.formats.format_of("a"))
+        self.assertEqual(Format(LEGACY_CODEC), self.formats.format_of("b"))
+        self.assertEqual(Format(LEGACY_CODEC), PeerFormats(preferred="binary").format_of("b"))
+
+    def test_compression_needs_both_ends(self):
+        formats = PeerFormats()
+        formats.negotiate("a", self.received(advertisement(compressed=True)))
+        self.assertEqual(Format("binary", batched=True), formats.format_of("a"))
+
+    def test_encoded_once_per_format(self):
+        self.formats.negotiate("a", advertisement())
+        self.formats.negotiate("b", advertisement())
+        self.formats.negotiate("d", advertisement(compressed=True))
+        pong = Pong((800, 600), paddles=[Direction.LEFT, Direction.RIGHT], random=Random(1))
+        event = create_event(ControlEvent.TIME_ELAPSED, dt=0.1, status=pong)
+        payloads = dict(self.formats.payloads(event, ["a", "b", "c", "d"]))
+        self.assertIs(payloads["a"], payloads["b"])
+        self.assertTrue(binary.is_binary(payloads["a"]))
+        self.assertIsInstance(payloads["c"], str)
+        self.assertTrue(compression.is_compressed(payloads["d"]))
+        for payload in payloads.values():
+            self.assertEqual(pong.balls, decode(payload).status.balls)
+
+
+class TestTerminalAdvertisement(unittest.TestCase):
+    class Terminal(IRemotePongTerminal):
+        def initialize(self):
+            self.sent = []
+
+        def _send(self, payload):
+            self.sent.append(payload)
+
+    def setUp(self):
+        pygame.init()
+        self.terminal = self.Terminal(DistributedSettings(initial_paddles=(Direction.LEFT,), compression=True))
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_joins_are_preceded_by_advertisements(self):
+        join = create_event(ControlEvent.PLAYER_JOIN, paddle_index=Direction.LEFT)
+        self.terminal.send_event(join)
+        advertised, joined = map(decode, self.terminal.sent)
+        self.assertTrue(is_advertisement(advertised))
+        self.assertEqual(compression.fingerprints(), advertised.compression)
+        self.assertEqual(join, joined)  # as older coordinators expect it
@@ -0,0 +1,173 @@
+import unittest
+from random import Random
+from dpongpy.controller import ControlEvent, create_event
+from dpongpy.model import Pong, Direction, Ball, Config, Snapshot, Vector2
+from dpongpy.remote.presentation import Serializer, Deserializer, Quantization, serialize, deserialize, encode, decode
+
+
+class Spin(Vector2):
+    pass
+
+
+class CustomSerializer(Serializer):
+    def _serialize_ball(self, ball: Ball):
+        return self._to_dict(ball, "position", "name")
+
+    def _serialize_spin(self, spin: Spin):
+        return {"$type": "Spin", "angle": spin.x}
+
+
+class CustomDeserializer(Deserializer):
+    def _deserialize_spin(self, obj):
+        return Spin(obj["angle"], 0)
+
+
+class TestPresentation(unittest.TestCase):
+    def setUp(self):
+        self.pong = Pong((800, 600), paddles=[Direction.LEFT, Direction.RIGHT], random=Random(3))
+        self.pong.update(0.5)
+
+    def test_round_trip(self):
+        event = create_event(ControlEvent.TIME_ELAPSED, dt=1 / 60, status=self.pong)
+        decoded = deserialize(serialize(event))
+        self.assertEqual(event.type, decoded.type)
+        self.assertEqual(self.pong.balls, decoded.status.balls)
+        self.assertEqual(self.pong.paddles, decoded.status.paddles)
+        self.assertEqual(self.pong.config, decoded.status.config)
+
+    def test_first_ball_keeps_its_key(self):
+        import json
+        status = json.loads(serialize(self.pong))
+        self.assertEqual({"paddles", "ball", "config", "size", "time", "updates", "$type"}, set(status))
+        self.assertEqual(self.pong.ball, deserialize(json.dumps(status["ball"])))  # as single-ball peers read it
+        for balls in (0, 3):
+            with self.subTest(balls=balls):
+                pong = Pong((800, 600), random=Random(3), balls=max(balls, 1))
+                if not balls:
+                    pong.remove_ball(pong.ball)
+                for codec in ("json", "binary"):
+                    self.assertEqual(pong.balls, decode(encode(pong, codec)).balls)
+                for quantization in (None, Quantization(16)):
+                    self.assertEqual(balls, decode(encode(pong, quantization=quantization), snapshots=True).balls)
+
+    def test_physics_modes_share_the_wire_type(self):
+        from dpongpy.model.lockstep import LockstepPong
+        pong = LockstepPong((800, 600), paddles=[Direction.LEFT, Direction.RIGHT], random=Random(3))
+        for _ in range(32):
+            pong.update()
+        decoded = deserialize(serialize(pong))
+        self.assertIs(Pong, type(decoded))
+        self.assertEqual(pong.balls, decoded.balls)
+
+    def test_plans_are_cached_per_type(self):
+        serializer = Serializer()
+        first = serializer.serialize(self.pong)
+        plans = dict(serializer._plans)
+        self.assertIn(Pong, plans)
+        self.assertIn(Vector2, plans)
+        self.assertEqual(first, serializer.serialize(self.pong))
+        self.assertEqual(plans, serializer._plans)
+
+    def test_custom_methods(self):
+        serializer, deserializer = CustomSerializer(), CustomDeserializer()
+        encoded = serializer._serialize({"ball": self.pong.ball, "spin": Spin(3, 4), "side": Direction.UP})
+        self.assertEqual({"position", "name", "$type"}, set(encoded["ball"].keys()))
+        self.assertEqual({"$type": "Spin", "angle": 3}, encoded["spin"])
+        decoded = deserializer.deserialize(serializer.serialize({"spin": Spin(3, 4), "side": Direction.UP}))
+        self.assertEqual({"spin": Spin(3, 0), "side": Direction.UP}, decoded)
+
+    def test_unsupported(self):
+        with self.assertRaises(NotImplementedError):
+            serialize(object())
+        with self.assertRaises(NotImplementedError):
+            deserialize('{"$type": "Unknown"}')
+
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.pong = Pong((800, 600), paddles=[Direction.LEFT, Direction.UP, Direction.RIGHT], random=Random(3), balls=2)
+        self.pong.move_paddle(Direction.UP, Direction.RIGHT)
+        self.pong.update(0.5)
+
+    def test_statuses_decode_as_snapshots(self):
+        event = create_event(ControlEvent.TIME_ELAPSED, dt=1 / 60, status=self.pong)
+        for codec in ("json", "binary"):
+            with self.subTest(codec=codec):
+                snapshot = decode(encode(event, codec), snapshots=True).status
+                self.assertIsInstance(snapshot, Snapshot)
+                self.assertEqual(self.pong.snapshot()._replace(random=None), snapshot._replace(size=None, config=None))
+                self.assertEqual((self.pong.size, self.pong.config), (snapshot.size, snapshot.config))
+
+    def test_restore_in_place(self):
+        for codec in ("json", "binary"):
+            with self.subTest(codec=codec):
+                target = Pong((1024, 768), Config(ball_ratio=0.1), paddles=[Direction.LEFT], random=Random(4))
+                random = target.random.getstate()
+                target.restore(decode(encode(self.pong, codec), snapshots=True))
+                self.assertEqual((self.pong.size, self.pong.config), (target.size, target.config))
+                self.assertEqual(self.pong.balls, target.balls)
+                self.assertEqual(self.pong.paddles, target.paddles)
+                self.assertEqual(random, target.random.getstate())
+
+    def test_quantized_snapshots(self):
+        quantization = Quantization(16)
+        for codec in ("json", "binary"):
+            with self.subTest(codec=codec):
+                expected = decode(encode(self.pong, codec, quantization)).snapshot()._replace(random=None)
+                actual = decode(encode(self.pong, codec, quantization), snapshots=True)
+                self.assertEqual(expected, actual._replace(size=None, config=None))
+
+
+class TestQuantization(unittest.TestCase):
+    def setUp(self):
+        self.pong = Pong((1920, 1080), paddles=[Direction.LEFT, Direction.RIGHT], random=Random(3), balls=2)
+        self.pong.move_paddle(Direction.LEFT, Direction.UP)
+        self.pong.update(0.3)
+
+    def assertClose(self, expected: Pong, actual: Pong, quantization: Quantization):
+        for axis, extent in enumerate(expected.size):
+            tolerance = quantization.max_error(extent) * (1 + 1e-9)
+            speed_tolerance = quantization.max_error(extent, Quantization.SPEED_RANGE) * (1 + 1e-9)
+            paddles = [actual.paddle(paddle.side) for paddle in expected.paddles]
+            for original, decoded in zip([*expected.balls, *expected.paddles], [*actual.balls, *paddles]):
+                self.assertEqual(original.size, decoded.size)
+                self.assertLessEqual(abs(original.position[axis] - decoded.position[axis]), tolerance)
+                self.assertLessEqual(abs(original.speed[axis] - decoded.speed[axis]), speed_tolerance)
+
+    def test_round_trip(self):
+        for bits in (8, 12, 16, 24):
+            quantization = Quantization(bits)
+            for codec in ("json", "binary"):
+                with self.subTest(bits=bits, codec=codec):
+                    decoded = decode(encode(self.pong, codec, quantization))
+                    self.assertEqual((self.pong.time, self.pong.updates), (decoded.time, decoded.updates))
+                    self.assertClose(self.pong, decoded, quantization)
+
+    def test_diff_round_trip(self):
+        other = Pong((1920, 1080), paddles=[Direction.LEFT, Direction.UP], random=Random(4), balls=3)
+        diff = self.pong.diff(other)
+        quantization = Quantization(16)
+        for codec in ("json", "binary"):
+            with self.subTest(codec=codec):
+                decoded = decode(encode(create_event(ControlEvent.TIME_ELAPSED, dt=0.1, delta=diff),
+                                        codec, quantization)).delta
+                self.assertEqual(Vector2(1, 1), decoded.extent)  # i.e. positions and speeds as fractions of the table
+                target = Pong((1920, 1080), paddles=[Direction.LEFT, Direction.RIGHT], random=Random(3), balls=2)
+                target.restore(self.pong.snapshot())
+                target.apply(decoded)
+                self.assertClose(other, target, quantization)
+
+    def test_pixel_exact_bound(self):
+        quantization = Quantization.for_error(1920)
+        self.assertLessEqual(quantization.max_error(1920), 0.5 ** 4)
+        self.assertGreater(Quantization(quantization.bits - 1).max_error(1920), 0.5 ** 4)
+        self.assertLess(Quantization(16).max_error(1920), 0.05)
+
+    def test_clamping(self):
+        quantization = Quantization(8)
+        size = Vector2(800, 600)
+        self.assertEqual([0, 255], quantization.quantize(Vector2(-10000, 10000), size, Quantization.POSITION_RANGE))
+
+    def test_smaller(self):
+        for codec in ("json", "binary"):
+            self.assertLess(len(encode(self.pong, codec, Quantization(16))), len(encode(self.pong, codec)))
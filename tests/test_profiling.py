@@ -0,0 +1,55 @@
+import io
+import json
+import unittest
+from dpongpy import profiling
+from dpongpy.model import Pong
+
+
+class TestPhaseStats(unittest.TestCase):
+    def test_record(self):
+        stats = profiling.PhaseStats()
+        for seconds in (1e-6, 3e-6, 100e-6):
+            stats.record(seconds)
+        self.assertEqual(stats.calls, 3)
+        self.assertAlmostEqual(stats.mean, 104e-6 / 3)
+        self.assertEqual((stats.min, stats.max), (1e-6, 100e-6))
+        self.assertEqual(sum(stats.histogram), 3)
+        self.assertEqual(stats.percentile(0.5), 4e-6)
+        self.assertEqual(stats.percentile(1.0), 100e-6)
+
+
+class TestPhaseProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.profiler = profiling.PhaseProfiler()
+        self.pong = Pong(size=(800, 600))
+        self.pong.profiler = self.profiler
+
+    def test_no_profiler_by_default(self):
+        self.assertIsNone(Pong(size=(800, 600)).profiler)
+
+    def test_phases(self):
+        for _ in range(10):
+            self.pong.update(0.01)
+        for phase in profiling.PHASES:
+            with self.subTest(phase=phase):
+                self.assertEqual(self.profiler.phases[phase].calls, 10)
+        phases = sum(self.profiler.phases[phase].total for phase in profiling.PHASES if phase != profiling.UPDATE)
+        self.assertLessEqual(phases, self.profiler.phases[profiling.UPDATE].total + 1e-9)
+
+    def test_report_and_dump(self):
+        self.pong.update(0.01)
+        report = self.profiler.report()
+        for phase in profiling.PHASES:
+            self.assertIn(phase, report)
+        file = io.StringIO()
+        self.profiler.dump(file)
+        self.assertEqual(json.loads(file.getvalue())[profiling.UPDATE]["calls"], 1)
+
+    def test_install(self):
+        try:
+            profiler = profiling.install(profiling.PhaseProfiler())
+            Pong(size=(800, 600)).update(0.01)
+            self.assertEqual(profiler.phases[profiling.UPDATE].calls, 1)
+        finally:
+            profiling.uninstall()
+        self.assertIsNone(Pong.profiler)
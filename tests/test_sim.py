@@ -0,0 +1,75 @@
+import unittest
+import pygame
+from dpongpy import SimulationSettings
+from dpongpy.model import *
+from dpongpy.sim import simulate, HeadlessMatch, TrackingBot, PredictiveBot, ScriptedBot, IdleBot
+
+
+class TestBots(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pong = Pong(size=(800, 600))
+
+    def test_tracking_bot(self):
+        bot = TrackingBot()
+        paddle = self.pong.paddle(Direction.LEFT)
+        self.pong.ball.position = (400, 100)
+        self.assertEqual(bot.act(self.pong, paddle), Direction.UP)
+        self.pong.ball.position = (400, 500)
+        self.assertEqual(bot.act(self.pong, paddle), Direction.DOWN)
+        self.pong.ball.position = (400, 300)
+        self.assertEqual(bot.act(self.pong, paddle), Direction.NONE)
+
+    def test_predictive_bot(self):
+        bot = PredictiveBot()
+        paddle = self.pong.paddle(Direction.LEFT)
+        self.pong.ball.position = (400, 300)
+        self.pong.ball.speed = (-400, -100)
+        self.assertEqual(bot.act(self.pong, paddle), Direction.UP)
+        self.pong.ball.speed = (-400, 100)
+        self.assertEqual(bot.act(self.pong, paddle), Direction.DOWN)
+
+    def test_scripted_bot(self):
+        bot = ScriptedBot([(1, Direction.DOWN), (0, Direction.UP)])
+        paddle = self.pong.paddle(Direction.LEFT)
+        self.assertEqual(bot.act(self.pong, paddle), Direction.UP)
+        self.pong.time = 1.5
+        self.assertEqual(bot.act(self.pong, paddle), Direction.DOWN)
+
+
+class TestHeadlessMatch(unittest.TestCase):
+    def test_run(self):
+        pong = Pong(size=(800, 600))
+        match = HeadlessMatch(pong, {Direction.LEFT: ScriptedBot([(0, Direction.DOWN)]), Direction.RIGHT: IdleBot()})
+        steps = match.run(duration=1, delta_time=0.01)
+        self.assertEqual(steps, 100)
+        self.assertEqual(pong.updates, 100)
+        self.assertAlmostEqual(pong.time, 1)
+        self.assertGreater(pong.paddle(Direction.LEFT).y, 300)
+        self.assertEqual(pong.paddle(Direction.RIGHT).y, 300)
+
+    def test_moves(self):
+        pong = Pong(size=(800, 600))
+        match = HeadlessMatch(pong, {Direction.LEFT: ScriptedBot([(0, Direction.DOWN)]), Direction.RIGHT: IdleBot()})
+        self.assertEqual(match.moves, {Direction.LEFT: None, Direction.RIGHT: None})
+        match.step(0.01)
+        self.assertEqual(match.moves, {Direction.LEFT: Direction.DOWN, Direction.RIGHT: Direction.NONE})
+        match.moves[Direction.LEFT] = Direction.UP
+        self.assertEqual(match.moves[Direction.LEFT], Direction.DOWN)
+
+
+class TestSimulate(unittest.TestCase):
+    def test_report(self):
+        report = simulate(SimulationSettings(matches=3, duration=2, fps=50, seed=0))
+        self.assertEqual(report.matches, 3)
+        self.assertEqual(report.updates, 300)
+        self.assertEqual(report.simulated_time, 6)
+        self.assertGreater(report.speedup, 1)
+        self.assertEqual(len(report.per_match), 3)
+
+    def test_seed_makes_runs_reproducible(self):
+        settings = SimulationSettings(matches=2, duration=2, seed=42, bot="random")
+        self.assertEqual(simulate(settings).per_match, simulate(settings).per_match)
+
+    def test_no_display(self):
+        simulate(SimulationSettings(duration=1, physics="event"))
+        self.assertFalse(pygame.display.get_init())
@@ -0,0 +1,72 @@
+import io
+import unittest
+from dpongpy.trace import Tracer, RingBuffer, load, format_record
+from dpongpy.model import *
+from dpongpy import trace
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_keeps_most_recent_items(self):
+        buffer = RingBuffer(3)
+        for i in range(5):
+            buffer.append(i)
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(list(buffer), [2, 3, 4])
+
+    def test_partially_filled(self):
+        buffer = RingBuffer(3)
+        buffer.append('a')
+        self.assertEqual(list(buffer), ['a'])
+        buffer.clear()
+        self.assertEqual(list(buffer), [])
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tracer = Tracer(capacity=4)
+        self.category = self.tracer.category("test")
+        self.other = self.tracer.category("other")
+
+    def test_categories_are_disabled_by_default(self):
+        self.assertFalse(self.category.enabled)
+        self.tracer.enable("test")
+        self.assertTrue(self.category.enabled)
+        self.assertFalse(self.other.enabled)
+        self.tracer.disable()
+        self.assertFalse(self.category.enabled)
+
+    def test_enable_unknown_category(self):
+        with self.assertRaises(KeyError):
+            self.tracer.enable("missing")
+
+    def test_dump_and_load(self):
+        for i in range(6):
+            self.tracer.record(self.category, "record %d: %s %r %s", (i, 1.5, b'\x00', 'text'))
+        self.tracer.record(self.other, "vector %s", (Vector2(1, 2),))
+        stream = io.BytesIO()
+        self.assertEqual(self.tracer.dump(stream), 4)
+        stream.seek(0)
+        records = list(load(stream))
+        self.assertEqual([category for _, category, _, _ in records], ["test"] * 3 + ["other"])
+        self.assertEqual(records[0][3], (3, 1.5, b'\x00', 'text'))
+        self.assertTrue(format_record(*records[0]).endswith("[test] record 3: 1.5 b'\\x00' text"))
+        self.assertEqual(records[-1][3], ('<Vector2(1, 2)>',))
+
+
+class TestModelTracing(unittest.TestCase):
+    def tearDown(self) -> None:
+        trace.disable()
+        trace.TRACER.buffer.clear()
+
+    def test_disabled_records_nothing(self):
+        trace.TRACER.buffer.clear()
+        Pong(size=(160, 90)).update(1)
+        self.assertEqual(len(trace.TRACER.buffer), 0)
+
+    def test_enabled_records_updates(self):
+        trace.TRACER.buffer.clear()
+        trace.enable("model")
+        pong = Pong(size=(160, 90))
+        pong.update(1)
+        messages = [template % args for _, _, template, args in trace.TRACER.records()]
+        self.assertIn("Update 1 (time: 1)", messages)